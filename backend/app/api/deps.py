@@ -2,44 +2,87 @@
 API dependencies for authentication and database access.
 """
 
-from fastapi import Depends, HTTPException, status
+import time
+from typing import Optional, Tuple, Type
+
+import jwt
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import Client
+from pydantic import BaseModel
+from supabase import AsyncClient
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_supabase
+from app.core.security import hash_token, verify_supabase_token
+from app.schemas.base import Status, Priority
+from app.schemas.ticket import TicketFilters
 from app.schemas.user import User
 
 
 security = HTTPBearer()
 
+# Verified users keyed by token hash; each entry expires with its token
+user_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ) -> User:
     """Get the current authenticated user."""
-    token = credentials.credentials
+    return await authenticate_token(credentials.credentials, supabase)
+
+
+async def authenticate_token(token: str, supabase: AsyncClient) -> User:
+    """Resolve a Supabase access token to its user, raising 401 if invalid."""
+    token_key = hash_token(token)
 
-    # Use Supabase to verify the token instead of our own JWT verification
-    try:
-        response = supabase.auth.get_user(token)
+    user = user_cache.get(token_key)
+    if user is not None:
+        return user
 
-        if response.user is None:
+    payload = await verify_supabase_token(token)
+    if payload is not None:
+        metadata = payload.get("user_metadata") or {}
+        try:
+            user = User(
+                id=payload["sub"],
+                email=payload.get("email"),
+                name=metadata.get("name", payload.get("email")),
+            )
+        except Exception:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
+                detail="Could not validate credentials",
             )
+        expires_at = payload["exp"]
+    else:
+        # No local key material: let Supabase verify the token
+        try:
+            response = await supabase.auth.get_user(token)
 
-        return User(
-            id=response.user.id,
-            email=response.user.email,
-            name=response.user.user_metadata.get("name", response.user.email),
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
+            if response.user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                )
+
+            user = User(
+                id=response.user.id,
+                email=response.user.email,
+                name=response.user.user_metadata.get("name", response.user.email),
+            )
+            # GoTrue has vouched for the token, so its exp claim can be trusted
+            expires_at = jwt.decode(token, options={"verify_signature": False}).get("exp", 0)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+            )
+
+    user_cache.set(token_key, user, ttl=expires_at - time.time())
+    return user
 
 
 async def get_current_active_user(
@@ -47,3 +90,70 @@ async def get_current_active_user(
 ) -> User:
     """Get the current active user."""
     return current_user
+
+
+async def get_ticket_filters(
+    project_ids: Optional[str] = Query(None, description="Comma-separated project IDs"),
+    statuses: Optional[str] = Query(None, description="Comma-separated statuses"),
+    priorities: Optional[str] = Query(None, description="Comma-separated priorities"),
+    assigned_to_ids: Optional[str] = Query(None, description="Comma-separated user IDs"),
+    created_by_ids: Optional[str] = Query(None, description="Comma-separated user IDs"),
+    search: Optional[str] = Query(None, description="Search in title and description"),
+) -> TicketFilters:
+    """Parse the ticket filter query parameters shared by ticket endpoints."""
+    filters = TicketFilters(search=search)
+    
+    if project_ids:
+        filters.project_ids = [pid.strip() for pid in project_ids.split(",")]
+    
+    if statuses:
+        try:
+            filters.statuses = [Status(s.strip()) for s in statuses.split(",")]
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid status value"
+            )
+    
+    if priorities:
+        try:
+            filters.priorities = [Priority(int(p.strip())) for p in priorities.split(",")]
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid priority value"
+            )
+    
+    if assigned_to_ids:
+        filters.assigned_to_ids = [uid.strip() for uid in assigned_to_ids.split(",")]
+
+    if created_by_ids:
+        filters.created_by_ids = [uid.strip() for uid in created_by_ids.split(",")]
+    
+    return filters
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated ``fields`` parameter into ``model`` field names.
+    
+    Returns None when no fieldset was requested, otherwise the requested
+    fields in the model's declaration order.
+    """
+    if fields is None:
+        return None
+    
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields requested"
+        )
+    
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))}"
+        )
+    
+    return tuple(name for name in model.model_fields if name in requested)
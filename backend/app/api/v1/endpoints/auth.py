@@ -3,7 +3,7 @@ Authentication endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from supabase import Client
+from supabase import AsyncClient
 
 from app.core.database import get_supabase
 from app.schemas.user import UserCreate, UserLogin, Token, User
@@ -16,7 +16,7 @@ router = APIRouter()
 @router.post("/register", response_model=Token)
 async def register(
     user_data: UserCreate,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Register a new user."""
     auth_service = AuthService(supabase)
@@ -26,7 +26,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     user_data: UserLogin,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Login user."""
     auth_service = AuthService(supabase)
@@ -35,7 +35,7 @@ async def login(
 
 @router.post("/logout")
 async def logout(
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Logout user."""
     auth_service = AuthService(supabase)
@@ -45,7 +45,7 @@ async def logout(
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     refresh_token: str,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Refresh access token."""
     auth_service = AuthService(supabase)
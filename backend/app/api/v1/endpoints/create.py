@@ -2,8 +2,14 @@
 Smart creation endpoints using LLM.
 """
 
+import json
+import logging
+from typing import Any, AsyncIterator, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from supabase import Client
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from supabase import AsyncClient
 
 from app.core.database import get_supabase
 from app.api.deps import get_current_active_user
@@ -12,27 +18,63 @@ from app.schemas.create import SmartCreateRequest, SmartCreateResponse
 from app.services.llm import LLMService
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/", response_model=SmartCreateResponse)
 async def smart_create(
     request: SmartCreateRequest,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Create tickets and projects from natural language text using LLM."""
     try:
         llm_service = LLMService(supabase, current_user.id, current_user.name)
-        result = await llm_service.process_text(request.text, request.project_id)
+        result = await llm_service.process_text(request.text, request.project_id, request.dry_run)
         
-        return SmartCreateResponse(
-            created_projects=result["created_projects"],
-            created_tickets=result["created_tickets"],
-            message=result["message"]
-        )
+        return SmartCreateResponse(**result)
         
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Smart creation failed: {str(e)}"
         )
+
+
+def format_sse(event: str, payload: Any) -> bytes:
+    """Encode one Server-Sent Event."""
+    if isinstance(payload, BaseModel):
+        data = payload.model_dump_json()
+    else:
+        data = json.dumps(payload)
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+
+async def sse_events(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode service events as SSE, turning a failure into an error event."""
+    try:
+        async for event, payload in events:
+            yield format_sse(event, payload)
+    except Exception as e:
+        logger.exception("Streaming smart creation failed")
+        yield format_sse("error", {"detail": f"Smart creation failed: {str(e)}"})
+
+
+@router.post("/stream")
+async def smart_create_stream(
+    request: SmartCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Create tickets and projects from text, streaming progress as Server-Sent Events.
+    
+    Events: start, progress, project (Project), ticket (Ticket), done, error.
+    A dry run sends planned_project (ProjectCreate) and planned_ticket
+    (TicketCreate) events instead of creating anything.
+    """
+    llm_service = LLMService(supabase, current_user.id, current_user.name)
+    return StreamingResponse(
+        sse_events(llm_service.stream_text(request.text, request.project_id, request.dry_run)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
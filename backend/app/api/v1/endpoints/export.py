@@ -2,67 +2,163 @@
 Export endpoints for data export functionality.
 """
 
-import io
-import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
-from supabase import Client
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Tuple
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from supabase import AsyncClient
+
+from app.core.config import settings
 from app.core.database import get_supabase
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_ticket_filters
+from app.schemas.base import ExportFormat
+from app.schemas.export import ExportJob, ExportJobCreate, ExportJobStatus
+from app.schemas.ticket import TicketFilters
 from app.schemas.user import User
 from app.services.database import get_database_service
+from app.services.export import EXPORT_COLUMNS, LEGACY_CSV_HEADERS, MEDIA_TYPES, stream_tickets
+from app.services.export_jobs import export_jobs
 
 router = APIRouter()
-
+logger = logging.getLogger(__name__)
 
 @router.get("/tickets/csv")
 async def export_tickets_csv(
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Export all tickets as CSV."""
-    try:
-        db_service = get_database_service(supabase)
-        tickets = await db_service.tickets.get_all_for_export()
-        
-        # Convert tickets to DataFrame
-        ticket_data = []
-        for ticket in tickets:
-            ticket_data.append({
-                "ID": ticket.id,
-                "Title": ticket.title,
-                "Description": ticket.description,
-                "Project": ticket.project_title,
-                "Project ID": ticket.project_id,
-                "Status": ticket.status.value,
-                "Priority": ticket.priority.value,
-                "Priority Name": ticket.priority.name,
-                "Assigned To": ticket.assigned_to or "",
-                "Created By ID": ticket.created_by_id,
-                "Created By Name": ticket.created_by_name,
-                "Created At": ticket.created_at.isoformat(),
-                "Updated At": ticket.updated_at.isoformat(),
-            })
-        
-        df = pd.DataFrame(ticket_data)
-        
-        # Create CSV in memory
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-        
-        # Create streaming response
-        response = StreamingResponse(
-            io.BytesIO(output.getvalue().encode()),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=bradboard_tickets.csv"}
+    """Export all tickets as CSV, with the original column headers."""
+    db_service = get_database_service(supabase)
+    return StreamingResponse(
+        stream_tickets(db_service, ExportFormat.CSV, None, tuple(LEGACY_CSV_HEADERS), LEGACY_CSV_HEADERS),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=bradboard_tickets.csv"}
+    )
+
+
+def parse_export_columns(columns: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    """Validate requested export columns; all columns if none were given."""
+    if columns is None:
+        return EXPORT_COLUMNS
+    selected = tuple(dict.fromkeys(name.strip() for name in columns if name.strip()))
+    unknown = [name for name in selected if name not in EXPORT_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown columns: {', '.join(unknown)}" if unknown else "No columns selected"
+        )
+    return selected
+
+
+@router.get("/tickets")
+async def export_tickets(
+    format: ExportFormat = Query(ExportFormat.CSV, description="parquet, arrow (IPC stream), ndjson or csv"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to export; all if omitted"),
+    filters: TicketFilters = Depends(get_ticket_filters),
+    current_user: User = Depends(get_current_active_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Export tickets matching the ticket filters in a file format.
+    
+    The file is written and sent one database batch at a time, so its
+    size is not limited by the worker's memory. Parquet and Arrow files
+    carry typed columns (timestamps, integer priorities) that load
+    without parsing.
+    """
+    selected = parse_export_columns(columns.split(",") if columns else None)
+    db_service = get_database_service(supabase)
+    return StreamingResponse(
+        stream_tickets(db_service, format, filters, selected),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=bradboard_tickets.{format.value}"}
+    )
+
+
+@router.post("/jobs", response_model=ExportJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    job_request: ExportJobCreate,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Start exporting tickets to a file in the background.
+    
+    Poll GET /export/jobs/{id} until the job is done, then download it
+    from /export/jobs/{id}/download. While tickets and projects are
+    unchanged, asking for the same export again returns the existing job
+    and its file.
+    """
+    columns = parse_export_columns(job_request.columns)
+    db_service = get_database_service(supabase)
+    versions = await db_service.table_versions("tickets", "projects")
+    
+    now = datetime.now(timezone.utc)
+    job = ExportJob(
+        id=export_jobs.job_id(job_request.format, columns, job_request.filters, versions),
+        status=ExportJobStatus.RUNNING,
+        format=job_request.format,
+        columns=list(columns),
+        filters=job_request.filters,
+        created_at=now,
+        updated_at=now
+    )
+    job = export_jobs.start(job, db_service)
+    if job.status == ExportJobStatus.DONE:
+        response.status_code = status.HTTP_200_OK
+    response.headers["Location"] = f"{settings.API_V1_STR}/export/jobs/{job.id}"
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJob)
+async def get_export_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get an export job's status and progress."""
+    job = export_jobs.load(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download a finished export.
+    
+    Supports Range and If-Range, so an interrupted download can resume
+    where it stopped.
+    """
+    job = export_jobs.load(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    if job.status != ExportJobStatus.DONE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job is {job.status.value}"
         )
-        
-        return response
-        
-    except Exception as e:
+    
+    path = export_jobs.data_path(job)
+    if not os.path.exists(path):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Export failed: {str(e)}"
+            status_code=status.HTTP_410_GONE,
+            detail="Export file has expired; start the export again"
         )
+    
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[job.format],
+        filename=f"bradboard_tickets.{job.format.value}",
+        headers={"ETag": f'"{job.id}"'}
+    )
@@ -2,24 +2,32 @@
 Project endpoints.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from supabase import Client
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from supabase import AsyncClient
 
 from app.core.database import get_supabase
-from app.api.deps import get_current_active_user
+from app.core.etag import (
+    etag_matches, if_match_versions, make_etag, not_modified, query_key, set_etag, version_etag
+)
+from app.core.pagination import InvalidCursorError
+from app.api.deps import get_current_active_user, parse_fields
 from app.schemas.user import User
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate, ProjectList
+from app.schemas.project import Project, ProjectCreate, ProjectUpdate, ProjectList, ProjectWithTicketCount
 from app.services.database import get_database_service
 
 router = APIRouter()
 
+# Fields served from the ticket_counts summary table rather than projects
+COUNT_FIELDS = {"ticket_count", "ticket_counts"}
+
 
 @router.post("/", response_model=Project)
 async def create_project(
     project: ProjectCreate,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Create a new project."""
     db_service = get_database_service(supabase)
@@ -28,30 +36,97 @@ async def create_project(
 
 @router.get("/", response_model=ProjectList)
 async def get_projects(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor; overrides page"),
+    fields: Optional[str] = Query(None, description="Comma-separated project fields to return, e.g. id,title"),
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Get all projects with pagination."""
+    """Get all projects with pagination, with each project's ticket counts.
+    
+    Returns 304 when If-None-Match matches; the ETag changes whenever
+    projects (or, while counts are returned, tickets) are written. With
+    ``fields``, only those columns are fetched and each project holds just
+    those fields; counts are only looked up if asked for.
+    """
+    selected = parse_fields(fields, ProjectWithTicketCount)
+    with_counts = selected is None or bool(COUNT_FIELDS.intersection(selected))
     db_service = get_database_service(supabase)
     
-    projects = await db_service.projects.get_all(page, size)
+    versions = await db_service.table_versions("projects", *(("tickets",) if with_counts else ()))
+    etag = make_etag("projects", sorted(versions.items()), query_key(request))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    columns = None
+    if selected is not None:
+        # Counts come from the summary table; the ID is needed to match them
+        columns = tuple(name for name in selected if name not in COUNT_FIELDS)
+        if with_counts:
+            columns = ("id",) + columns
+    
+    try:
+        projects = await db_service.projects.get_all(page, size, cursor, columns)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     total = await db_service.projects.count()
+    next_cursor = db_service.projects.next_cursor(projects, size)
+    counts = await db_service.stats.get_project_counts([p.id for p in projects]) if with_counts else {}
+    
+    if selected is not None:
+        # Bypass the full response model, which would require every field
+        include = set(selected)
+        items = []
+        for project in projects:
+            item = project.model_dump(mode="json", include=include)
+            if project.id in counts:
+                project_counts = counts[project.id]
+                item.update({
+                    "ticket_count": project_counts.total,
+                    "ticket_counts": project_counts.model_dump(mode="json"),
+                })
+                item = {name: item[name] for name in selected}
+            items.append(item)
+        sparse = ORJSONResponse({
+            "projects": items,
+            "total": total,
+            "page": page,
+            "size": size,
+            "next_cursor": next_cursor,
+        })
+        set_etag(sparse, etag)
+        return sparse
     
+    set_etag(response, etag)
     return ProjectList(
-        projects=projects,
+        projects=[
+            ProjectWithTicketCount(
+                **project.model_dump(),
+                ticket_count=counts[project.id].total,
+                ticket_counts=counts[project.id]
+            )
+            for project in projects
+        ],
         total=total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project(
     project_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get a specific project."""
     db_service = get_database_service(supabase)
@@ -63,6 +138,11 @@ async def get_project(
             detail="Project not found"
         )
     
+    etag = version_etag(project.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
     return project
 
 
@@ -70,52 +150,61 @@ async def get_project(
 async def update_project(
     project_id: str,
     project_update: ProjectUpdate,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Update a project."""
+    """Update a project.
+    
+    With an If-Match ETag from GET, returns 412 if the project has changed
+    since.
+    """
     db_service = get_database_service(supabase)
+    versions = if_match_versions(request)
     
-    # Check if project exists
-    existing_project = await db_service.projects.get_by_id(project_id)
-    if not existing_project:
+    updated_project = await db_service.projects.update(project_id, project_update, versions)
+    if not updated_project:
+        # Only a failed precondition needs a second look to tell 412 from 404
+        if versions is not None and await db_service.projects.get_by_id(project_id):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Project was modified since it was read"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    updated_project = await db_service.projects.update(project_id, project_update)
-    if not updated_project:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to update project"
-        )
-    
+    set_etag(response, version_etag(updated_project.updated_at))
     return updated_project
 
 
 @router.delete("/{project_id}")
 async def delete_project(
     project_id: str,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Delete a project."""
+    """Delete a project and its tickets.
+    
+    With an If-Match ETag from GET, returns 412 if the project has changed
+    since.
+    """
     db_service = get_database_service(supabase)
+    versions = if_match_versions(request)
     
-    # Check if project exists
-    existing_project = await db_service.projects.get_by_id(project_id)
-    if not existing_project:
+    success = await db_service.projects.delete(project_id, versions)
+    if not success:
+        if versions is not None and await db_service.projects.get_by_id(project_id):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Project was modified since it was read"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    success = await db_service.projects.delete(project_id)
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to delete project"
-        )
-    
     return {"message": "Project deleted successfully"}
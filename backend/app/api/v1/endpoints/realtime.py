@@ -0,0 +1,109 @@
+"""
+Real-time change endpoints.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import jwt
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from supabase import AsyncClient
+
+from app.api.deps import authenticate_token
+from app.core.config import settings
+from app.core.database import get_supabase
+from app.services.realtime import Subscriber, change_hub
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def forward_changes(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Send queued change events to the client, one at a time."""
+    while True:
+        event = await subscriber.queue.get()
+        await websocket.send_text(orjson.dumps(event).decode())
+
+
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    """Return once the client closes; anything else it sends is ignored."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+async def receive_token(websocket: WebSocket) -> str:
+    """Read the access token from the client's first message, ``{"token": "..."}``."""
+    message = orjson.loads(await websocket.receive_text())
+    token = message.get("token") if isinstance(message, dict) else None
+    if not isinstance(token, str):
+        raise ValueError("The first message must carry the access token")
+    return token
+
+
+def token_lifetime(token: str) -> Optional[float]:
+    """Seconds until an already verified token expires, or None if it never does."""
+    expires_at = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    return None if expires_at is None else max(0.0, expires_at - time.time())
+
+
+@router.websocket("/ws")
+async def changes_websocket(
+    websocket: WebSocket,
+    project_ids: Optional[str] = Query(None, description="Comma-separated project IDs to watch; all projects if omitted"),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Push ticket and project change events as JSON messages.
+
+    The client's first message must be ``{"token": "<access token>"}``,
+    sent within REALTIME_AUTH_TIMEOUT_SECONDS; the token is not taken from
+    the URL, where proxies and access logs would record it. Once it is
+    verified the server sends ``{"type": "subscribed"}``, and every change
+    from then on is pushed.
+
+    Each message has ``type`` (insert, update or delete), ``table``, ``id``,
+    ``project_id`` and, except for deletes, the changed ``record``. A
+    ``{"type": "resync"}`` message means events were dropped because the
+    client fell behind; it should catch up through GET /tickets/changes.
+    The socket is closed with 1008 if authentication fails or when the
+    token expires, so the client reconnects with a fresh one, and with 1011
+    if sending fails.
+    """
+    await websocket.accept()
+    try:
+        token = await asyncio.wait_for(receive_token(websocket), settings.REALTIME_AUTH_TIMEOUT_SECONDS)
+        await authenticate_token(token, supabase)
+    except WebSocketDisconnect:
+        return
+    except (asyncio.TimeoutError, ValueError, HTTPException):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    watched = [pid.strip() for pid in project_ids.split(",") if pid.strip()] if project_ids else None
+    subscriber = change_hub.subscribe(watched)
+    tasks = []
+    try:
+        await websocket.send_text(orjson.dumps({"type": "subscribed"}).decode())
+        receiver = asyncio.create_task(wait_for_disconnect(websocket))
+        sender = asyncio.create_task(forward_changes(websocket, subscriber))
+        tasks = [receiver, sender]
+        done, _ = await asyncio.wait(tasks, timeout=token_lifetime(token), return_when=asyncio.FIRST_COMPLETED)
+        if receiver in done:
+            return
+        if not done:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+        else:
+            logger.warning("Closing change stream after a failed send", exc_info=sender.exception())
+            try:
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            except Exception:
+                # The connection is already gone
+                pass
+    finally:
+        for task in tasks:
+            task.cancel()
+            # Retrieve the outcome, so no exception is reported as never retrieved
+            task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        change_hub.unsubscribe(subscriber)
@@ -0,0 +1,44 @@
+"""
+Ticket statistics endpoints.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from supabase import AsyncClient
+
+from app.core.database import get_supabase
+from app.core.etag import etag_matches, make_etag, not_modified, query_key, set_etag
+from app.api.deps import get_current_active_user
+from app.schemas.user import User
+from app.schemas.stats import TicketStats
+from app.services.database import get_database_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=TicketStats)
+async def get_stats(
+    request: Request,
+    response: Response,
+    project_ids: Optional[str] = Query(None, description="Comma-separated project IDs; all projects if omitted"),
+    current_user: User = Depends(get_current_active_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Get ticket counts by status and priority, overall, per project and per assignee.
+    
+    Served from counters that are kept current on every ticket write, so
+    the cost grows with the number of projects, not tickets. Returns 304
+    when If-None-Match matches; the ETag changes whenever tickets are
+    written.
+    """
+    db_service = get_database_service(supabase)
+    
+    versions = await db_service.table_versions("tickets")
+    etag = make_etag("stats", sorted(versions.items()), query_key(request))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    selected = [pid.strip() for pid in project_ids.split(",")] if project_ids else None
+    stats = await db_service.stats.get_stats(selected)
+    set_etag(response, etag)
+    return stats
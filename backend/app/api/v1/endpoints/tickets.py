@@ -2,28 +2,39 @@
 Ticket endpoints.
 """
 
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from supabase import Client
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from supabase import AsyncClient
 
+from app.core.config import settings
 from app.core.database import get_supabase
-from app.api.deps import get_current_active_user
+from app.core.etag import (
+    etag_matches, if_match_versions, make_etag, not_modified, query_key, set_etag, version_etag
+)
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.api.deps import get_current_active_user, get_ticket_filters, parse_fields
 from app.schemas.user import User
 from app.schemas.ticket import (
     Ticket, TicketCreate, TicketUpdate, TicketList, 
-    TicketFilters, TicketWithProject
+    TicketFilters, TicketWithProject, TicketSearchList,
+    TicketBatchRequest, TicketBatchResponse, TicketChanges
 )
-from app.schemas.base import Status, Priority
+from app.schemas.base import CountStrategy
+from app.services.batch import TicketBatchService
 from app.services.database import get_database_service
 
 router = APIRouter()
 
+WATERMARK_KEYS = ("updated_at", "id", "deleted_at", "ticket_id")
+
 
 @router.post("/", response_model=Ticket)
 async def create_ticket(
     ticket: TicketCreate,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Create a new ticket."""
     db_service = get_database_service(supabase)
@@ -39,72 +50,169 @@ async def create_ticket(
     return await db_service.tickets.create(ticket, current_user.id, current_user.name)
 
 
+@router.post("/batch", response_model=TicketBatchResponse)
+async def batch_tickets(
+    batch: TicketBatchRequest,
+    current_user: User = Depends(get_current_active_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Create, update and delete many tickets at once with per-item results."""
+    if len(batch.create) + len(batch.update) + len(batch.delete) > settings.TICKET_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch exceeds {settings.TICKET_BATCH_MAX_ITEMS} items"
+        )
+    
+    db_service = get_database_service(supabase)
+    batch_service = TicketBatchService(db_service, current_user.id, current_user.name)
+    return await batch_service.apply(batch)
+
+
 @router.get("/", response_model=TicketList)
 async def get_tickets(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
-    project_ids: Optional[str] = Query(None, description="Comma-separated project IDs"),
-    statuses: Optional[str] = Query(None, description="Comma-separated statuses"),
-    priorities: Optional[str] = Query(None, description="Comma-separated priorities"),
-    assigned_to_ids: Optional[str] = Query(None, description="Comma-separated user IDs"),
-    created_by_ids: Optional[str] = Query(None, description="Comma-separated user IDs"),
-    search: Optional[str] = Query(None, description="Search in title and description"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor; overrides page"),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="How to count total: exact, planned, estimated or none"),
+    fields: Optional[str] = Query(None, description="Comma-separated ticket fields to return, e.g. id,title,status,priority,assigned_to_name,project_title"),
+    filters: TicketFilters = Depends(get_ticket_filters),
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Get all tickets with filtering and pagination."""
+    """Get all tickets with filtering and pagination.
+    
+    Returns 304 when If-None-Match matches; the ETag changes whenever tickets
+    or projects (for project titles) are written. With ``fields``, only those
+    columns are fetched and each ticket holds just those fields.
+    """
+    selected = parse_fields(fields, TicketWithProject)
     db_service = get_database_service(supabase)
     
-    # Parse filters
-    filters = TicketFilters(
+    versions = await db_service.table_versions("tickets", "projects")
+    etag = make_etag("tickets", sorted(versions.items()), query_key(request))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    filters.page = page
+    filters.size = size
+    filters.cursor = cursor
+    
+    try:
+        tickets, total = await db_service.tickets.get_page(filters, count, selected)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    next_cursor = db_service.tickets.next_cursor(tickets, size)
+    
+    if selected is not None:
+        # Bypass the full response model, which would require every field
+        include = set(selected)
+        sparse = ORJSONResponse({
+            "tickets": [ticket.model_dump(mode="json", include=include) for ticket in tickets],
+            "total": total,
+            "page": page,
+            "size": size,
+            "next_cursor": next_cursor,
+        })
+        set_etag(sparse, etag)
+        return sparse
+    
+    set_etag(response, etag)
+    return TicketList(
+        tickets=tickets,
+        total=total,
         page=page,
         size=size,
-        search=search
+        next_cursor=next_cursor
     )
+
+
+@router.get("/search", response_model=TicketSearchList)
+async def search_tickets(
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    filters: TicketFilters = Depends(get_ticket_filters),
+    current_user: User = Depends(get_current_active_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Full-text search tickets ranked by relevance, with highlighted snippets."""
+    if not filters.search or not filters.search.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query is required"
+        )
+    
+    db_service = get_database_service(supabase)
+    
+    filters.page = page
+    filters.size = size
     
-    if project_ids:
-        filters.project_ids = [pid.strip() for pid in project_ids.split(",")]
+    results = await db_service.tickets.search(filters)
     
-    if statuses:
+    return TicketSearchList(
+        results=results,
+        query=filters.search,
+        page=page,
+        size=size
+    )
+
+
+@router.get("/changes", response_model=TicketChanges)
+async def get_ticket_changes(
+    since: Optional[str] = Query(None, description="Watermark from a previous response; omit for a full sync"),
+    size: int = Query(500, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Tickets changed and deleted since a watermark, for incremental sync.
+    
+    Apply ``tickets`` as upserts and ``deleted`` as removals, then call again
+    with the returned watermark, straight away while ``has_more`` is true.
+    Watermarks older than the tombstone retention window get 410 Gone; the
+    client should then resync from scratch by omitting ``since``.
+    """
+    now = datetime.now(timezone.utc)
+    until = (now - timedelta(seconds=settings.TICKET_CHANGES_SETTLE_SECONDS)).isoformat()
+    db_service = get_database_service(supabase)
+    
+    if since is None:
+        watermark = db_service.tickets.initial_watermark(until)
+    else:
         try:
-            filters.statuses = [Status(s.strip()) for s in statuses.split(",")]
-        except ValueError:
+            watermark = decode_cursor(since, WATERMARK_KEYS)
+        except InvalidCursorError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid status value"
+                detail="Invalid watermark"
             )
-    
-    if priorities:
-        try:
-            filters.priorities = [Priority(int(p.strip())) for p in priorities.split(",")]
-        except ValueError:
+        retention = timedelta(days=settings.TICKET_CHANGES_RETENTION_DAYS)
+        if datetime.fromisoformat(watermark["deleted_at"]) < now - retention:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid priority value"
+                status_code=status.HTTP_410_GONE,
+                detail="Watermark has expired; resync without since"
             )
     
-    if assigned_to_ids:
-        filters.assigned_to_ids = [uid.strip() for uid in assigned_to_ids.split(",")]
-
-    if created_by_ids:
-        filters.created_by_ids = [uid.strip() for uid in created_by_ids.split(",")]
-    
-    tickets = await db_service.tickets.get_all_with_filters(filters)
-    total = await db_service.tickets.count_with_filters(filters)
+    tickets, deleted, watermark, has_more = await db_service.tickets.get_changes(watermark, until, size)
     
-    return TicketList(
+    return TicketChanges(
         tickets=tickets,
-        total=total,
-        page=page,
-        size=size
+        deleted=deleted,
+        watermark=encode_cursor(watermark),
+        has_more=has_more
     )
 
 
 @router.get("/{ticket_id}", response_model=Ticket)
 async def get_ticket(
     ticket_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get a specific ticket."""
     db_service = get_database_service(supabase)
@@ -116,6 +224,11 @@ async def get_ticket(
             detail="Ticket not found"
         )
     
+    etag = version_etag(ticket.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    set_etag(response, etag)
     return ticket
 
 
@@ -123,19 +236,18 @@ async def get_ticket(
 async def update_ticket(
     ticket_id: str,
     ticket_update: TicketUpdate,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Update a ticket."""
-    db_service = get_database_service(supabase)
+    """Update a ticket.
     
-    # Check if ticket exists
-    existing_ticket = await db_service.tickets.get_by_id(ticket_id)
-    if not existing_ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket not found"
-        )
+    Only the fields sent are changed; null clears the assignee. With an
+    If-Match ETag from GET, returns 412 if the ticket has changed since.
+    """
+    db_service = get_database_service(supabase)
+    versions = if_match_versions(request)
     
     # If project_id is being updated, verify the new project exists
     if ticket_update.project_id:
@@ -146,38 +258,48 @@ async def update_ticket(
                 detail="Project not found"
             )
     
-    updated_ticket = await db_service.tickets.update(ticket_id, ticket_update)
+    updated_ticket = await db_service.tickets.update(ticket_id, ticket_update, versions)
     if not updated_ticket:
+        # Only a failed precondition needs a second look to tell 412 from 404
+        if versions is not None and await db_service.tickets.get_by_id(ticket_id):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Ticket was modified since it was read"
+            )
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to update ticket"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket not found"
         )
     
+    set_etag(response, version_etag(updated_ticket.updated_at))
     return updated_ticket
 
 
 @router.delete("/{ticket_id}")
 async def delete_ticket(
     ticket_id: str,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Delete a ticket."""
+    """Delete a ticket.
+    
+    With an If-Match ETag from GET, returns 412 if the ticket has changed
+    since.
+    """
     db_service = get_database_service(supabase)
+    versions = if_match_versions(request)
     
-    # Check if ticket exists
-    existing_ticket = await db_service.tickets.get_by_id(ticket_id)
-    if not existing_ticket:
+    success = await db_service.tickets.delete(ticket_id, versions)
+    if not success:
+        if versions is not None and await db_service.tickets.get_by_id(ticket_id):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Ticket was modified since it was read"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found"
         )
     
-    success = await db_service.tickets.delete(ticket_id)
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to delete ticket"
-        )
-    
     return {"message": "Ticket deleted successfully"}
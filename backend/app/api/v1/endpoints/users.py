@@ -2,11 +2,12 @@
 Users endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from typing import List
-from supabase import Client
+from supabase import AsyncClient
 
 from app.core.database import get_supabase
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag, version_etag
 from app.services.database import get_database_service
 from app.schemas.user import User
 from app.api.deps import get_current_user
@@ -16,13 +17,25 @@ router = APIRouter()
 
 @router.get("/", response_model=List[User])
 async def get_all_users(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
-    """Get all users from the public users table."""
+    """Get all users from the public users table.
+    
+    Returns 304 when If-None-Match matches; the ETag changes whenever users
+    are written.
+    """
     try:
         db_service = get_database_service(supabase)
+        versions = await db_service.table_versions("users")
+        etag = make_etag("users", sorted(versions.items()))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         users = await db_service.users.get_all()
+        set_etag(response, etag)
         return users
     except Exception as e:
         raise HTTPException(
@@ -34,8 +47,10 @@ async def get_all_users(
 @router.get("/{user_id}", response_model=User)
 async def get_user_by_id(
     user_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get a specific user by ID."""
     try:
@@ -46,6 +61,14 @@ async def get_user_by_id(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
+        
+        # Row versions use the same tag format as tickets and projects, so
+        # If-Match works the same way for every resource
+        etag = version_etag(user.updated_at) if user.updated_at else make_etag(user.id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        set_etag(response, etag)
         return user
     except HTTPException:
         raise
@@ -61,7 +84,7 @@ async def update_user(
     user_id: str,
     name: str,
     current_user: User = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Update user name. Users can only update their own record."""
     # Check if user is updating their own record
@@ -4,7 +4,7 @@ Main API router for v1 endpoints.
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, projects, tickets, create, export, users
+from app.api.v1.endpoints import auth, projects, tickets, create, export, users, realtime, stats
 
 api_router = APIRouter()
 
@@ -14,4 +14,6 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(tickets.router, prefix="/tickets", tags=["tickets"])
 api_router.include_router(create.router, prefix="/create", tags=["smart-creation"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
 api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(realtime.router, tags=["realtime"])
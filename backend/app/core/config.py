@@ -3,7 +3,8 @@ Configuration settings for BradBoard API.
 """
 
 import os
-from typing import List
+import tempfile
+from typing import Dict, List
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
@@ -36,6 +37,19 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_ANON_KEY: str = os.getenv("SUPABASE_ANON_KEY", "")
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    # "supabase", or "memory" for the in-process stand-in (tests, local runs
+    # and benchmarks), optionally loaded from a JSON file of rows per table
+    SUPABASE_BACKEND: str = os.getenv("SUPABASE_BACKEND", "supabase")
+    SUPABASE_MEMORY_FIXTURES: str = os.getenv("SUPABASE_MEMORY_FIXTURES", "")
+    
+    # Supabase access token verification. Tokens are verified locally with
+    # the project's JWT secret (HS256) or its JWKS signing keys; when neither
+    # is available the backend falls back to asking GoTrue.
+    SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
+    SUPABASE_JWKS_URL: str = os.getenv("SUPABASE_JWKS_URL", "")
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    JWKS_REFRESH_INTERVAL_SECONDS: int = 600
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
     
     # JWT settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -46,6 +60,54 @@ class Settings(BaseSettings):
     # OpenAI settings for LLM ticket creation
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_MAX_CONNECTIONS: int = 20
+    SMART_CREATE_CACHE_SIZE: int = 256
+    SMART_CREATE_CACHE_TTL_SECONDS: int = 600
+    # Most relevant projects sent to the LLM as context for smart creation
+    SMART_CREATE_CONTEXT_PROJECTS: int = 10
+    
+    # Project cache settings
+    PROJECT_CACHE_SIZE: int = 1024
+    PROJECT_CACHE_TTL_SECONDS: int = 60
+    # Full reload of the project relevance index, to pick up other workers' writes
+    PROJECT_INDEX_REFRESH_SECONDS: int = 300
+    
+    # Maximum creates + updates + deletes in one POST /tickets/batch
+    TICKET_BATCH_MAX_ITEMS: int = 500
+    
+    # Ticket delta sync settings. Changes newer than the settle window are
+    # held back so writes still committing are not skipped by a watermark.
+    TICKET_CHANGES_SETTLE_SECONDS: int = 2
+    TICKET_CHANGES_RETENTION_DAYS: int = 30
+    
+    # Real-time settings: REALTIME_FEED is "supabase" (Supabase Realtime,
+    # seen by every worker) or "local" (in-process stand-in for tests)
+    REALTIME_FEED: str = os.getenv("REALTIME_FEED", "supabase")
+    REALTIME_QUEUE_SIZE: int = 256
+    # Time a new WebSocket has to send its token before it is closed
+    REALTIME_AUTH_TIMEOUT_SECONDS: float = 10
+    
+    # Export settings
+    EXPORT_BATCH_SIZE: int = 1000
+    EXPORT_ROW_GROUP_SIZE: int = 50000
+    
+    # Background export jobs: files are spooled to EXPORT_JOB_DIR, which
+    # every worker on the host shares, and deleted after the TTL. A running
+    # job whose status has not advanced for EXPORT_JOB_STALE_SECONDS is
+    # assumed dead and can be restarted.
+    EXPORT_JOB_DIR: str = os.getenv("EXPORT_JOB_DIR", os.path.join(tempfile.gettempdir(), "bradboard-exports"))
+    EXPORT_JOB_TTL_SECONDS: int = 24 * 60 * 60
+    EXPORT_JOB_STALE_SECONDS: int = 120
+    
+    # Response compression settings: smaller bodies are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    
+    # Request tracing: requests making more database and auth round trips
+    # than their route's budget are logged; ROUND_TRIP_BUDGETS overrides
+    # the default per route template
+    ROUND_TRIP_BUDGET: int = 5
+    ROUND_TRIP_BUDGETS: Dict[str, int] = {}
     
     # Environment
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
@@ -2,47 +2,84 @@
 Database connection and utilities for Supabase.
 """
 
-from supabase import create_client, Client
+import asyncio
+
+from supabase import acreate_client, AsyncClient
 from app.core.config import settings
+from app.core.memory import MemoryClient, MemoryDatabase
+from app.core.metrics import instrument_http_client
+from app.core.tracing import traced
 
 
 class SupabaseClient:
-    """Supabase client wrapper."""
-    
+    """Async Supabase client wrapper.
+
+    Clients are created lazily on first use and shared by every request on
+    the worker, so PostgREST and GoTrue calls reuse one pooled HTTP
+    connection set and never block the event loop.
+
+    With SUPABASE_BACKEND=memory both clients are one in-memory stand-in.
+    """
+
     def __init__(self):
-        self._client: Client = None
-        self._service_client: Client = None
-    
-    @property
-    def client(self) -> Client:
+        self._client: AsyncClient = None
+        self._service_client: AsyncClient = None
+        self._memory_client: MemoryClient = None
+        self._lock = asyncio.Lock()
+
+    def get_memory_client(self) -> MemoryClient:
+        """Get the in-memory stand-in, loading its fixtures on first use."""
+        if self._memory_client is None:
+            self._memory_client = MemoryClient(MemoryDatabase.load(settings.SUPABASE_MEMORY_FIXTURES))
+        return self._memory_client
+
+    async def get_client(self) -> AsyncClient:
         """Get the regular Supabase client (with anon key)."""
+        if settings.SUPABASE_BACKEND == "memory":
+            return self.get_memory_client()
         if self._client is None:
-            self._client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_ANON_KEY
-            )
-        return self._client
-    
-    @property
-    def service_client(self) -> Client:
+            async with self._lock:
+                if self._client is None:
+                    self._client = await acreate_client(
+                        settings.SUPABASE_URL,
+                        settings.SUPABASE_ANON_KEY
+                    )
+        return self.instrument(self._client)
+
+    async def get_service_client(self) -> AsyncClient:
         """Get the service role Supabase client (with service key)."""
+        if settings.SUPABASE_BACKEND == "memory":
+            return self.get_memory_client()
         if self._service_client is None:
-            self._service_client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_SERVICE_ROLE_KEY
-            )
-        return self._service_client
+            async with self._lock:
+                if self._service_client is None:
+                    self._service_client = await acreate_client(
+                        settings.SUPABASE_URL,
+                        settings.SUPABASE_SERVICE_ROLE_KEY
+                    )
+        return self.instrument(self._service_client)
+
+    @staticmethod
+    def instrument(client: AsyncClient) -> AsyncClient:
+        """Time the client's PostgREST and GoTrue calls for /metrics.
+
+        Checked on every use because supabase-py replaces its PostgREST
+        client when the auth session changes.
+        """
+        instrument_http_client(client.postgrest.session)
+        instrument_http_client(client.auth._http_client)
+        return client
 
 
 # Global instance
 supabase_client = SupabaseClient()
 
 
-def get_supabase() -> Client:
-    """Get Supabase client dependency."""
-    return supabase_client.client
+async def get_supabase() -> AsyncClient:
+    """Get Supabase client dependency, traced against the current request."""
+    return traced(await supabase_client.get_client())
 
 
-def get_supabase_service() -> Client:
-    """Get Supabase service client dependency."""
-    return supabase_client.service_client
+async def get_supabase_service() -> AsyncClient:
+    """Get Supabase service client dependency, traced against the current request."""
+    return traced(await supabase_client.get_service_client())
@@ -0,0 +1,77 @@
+"""
+ETag helpers for conditional requests.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the string forms of ``parts``."""
+    digest = hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def version_etag(updated_at: datetime) -> str:
+    """Strong ETag for one version of a row, identified by its updated_at.
+
+    The tag is updated_at in microseconds since the epoch, so preconditions
+    on writes can be checked by the database in the write itself.
+    """
+    return f'"{(updated_at - EPOCH) // timedelta(microseconds=1)}"'
+
+
+def if_match_versions(request: Request) -> Optional[List[datetime]]:
+    """The updated_at values the request's If-Match header accepts.
+
+    Returns None when there is no precondition (no header, or ``*``).
+    Tags that are not row versions match nothing. Weak tags are compared
+    as strong ones, since compression only weakens the tag, not the row.
+    """
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip().removeprefix("W/").strip('"')
+        if tag.isdigit():
+            versions.append(EPOCH + timedelta(microseconds=int(tag)))
+    return versions
+
+
+def query_key(request: Request) -> str:
+    """The request's query parameters in a canonical order."""
+    return "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches ``etag``.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach ``etag`` and ask clients to revalidate before reusing the body."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matched ETag."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
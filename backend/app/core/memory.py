@@ -0,0 +1,754 @@
+"""
+In-memory stand-in for the Supabase client.
+
+Implements the part of supabase-py's query builder the models use
+(table/select/insert/upsert/update/delete, eq/neq/gt/gte/lt/lte/in_/is_,
+or_ with nested and(), text_search, order, limit, range, exact counts,
+embedded ``projects(...)`` and the search_tickets RPC) over in-memory
+tables with hash indexes. Builders move through the same stages as
+postgrest-py's, so a chain that is valid here is valid against Supabase. The database triggers the models rely on are
+emulated too: updated_at, table_versions, ticket_counts, ticket_deletions
+and cascading project deletes.
+
+Selected with SUPABASE_BACKEND=memory, so the whole API runs without a
+Supabase project for tests, local development and load generation.
+SUPABASE_MEMORY_FIXTURES names a JSON file of initial rows per table.
+Tokens must be verifiable locally (SUPABASE_JWT_SECRET), as there is no
+GoTrue to ask.
+"""
+
+import itertools
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from postgrest import APIResponse
+from postgrest.exceptions import APIError
+
+
+# Primary key column per table
+PRIMARY_KEYS = {
+    "projects": "id",
+    "tickets": "id",
+    "users": "id",
+    "table_versions": "table_name",
+    "ticket_deletions": "ticket_id",
+}
+
+# Columns with a hash index besides the primary key
+SECONDARY_INDEXES = {
+    "tickets": ("project_id", "status", "priority", "assigned_to_id", "created_by_id"),
+    "users": ("email",),
+    "ticket_counts": ("project_id",),
+}
+
+# Tables with created_at/updated_at columns kept by the database
+TIMESTAMPED_TABLES = {"projects", "tickets", "users"}
+
+# Tables whose writes bump their table_versions counter
+VERSIONED_TABLES = ("projects", "tickets", "users")
+
+# Embeddable parents: embed name -> (foreign key column, parent table)
+EMBEDS = {"projects": ("project_id", "projects")}
+
+INTEGER_COLUMNS = {"priority", "count", "version"}
+
+TICKET_COUNT_KEY = ("project_id", "status", "priority", "assigned_to_id")
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+
+def coerce(column: str, value: Any) -> Any:
+    """Convert a filter or written value to the type ``column`` is stored as."""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        value = value.strip('"')
+        if value == "null":
+            return None
+    if column in INTEGER_COLUMNS:
+        return int(value)
+    if column.endswith("_at"):
+        return datetime.fromisoformat(value)
+    return str(value)
+
+
+def to_json(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def search_terms(query: str) -> Tuple[List[str], List[str]]:
+    """Words a web search requires and excludes, roughly as websearch_to_tsquery reads them."""
+    required, excluded = [], []
+    for word in query.lower().replace('"', " ").split():
+        if word in ("or", "and"):
+            continue
+        if word.startswith("-"):
+            excluded.append(word[1:])
+        else:
+            required.append(word)
+    return required, excluded
+
+
+def search_text(row: Row) -> str:
+    return f"{row.get('title') or ''} {row.get('description') or ''}".lower()
+
+
+def text_matches(row: Row, terms: Tuple[List[str], List[str]]) -> bool:
+    required, excluded = terms
+    text = search_text(row)
+    return all(word in text for word in required) and not any(word in text for word in excluded)
+
+
+COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+class Filter:
+    """One column condition, kept in a form an index can answer."""
+
+    def __init__(self, column: str, operator: str, criteria: Any):
+        self.column = column
+        self.negate = operator.startswith("not.")
+        operator = operator[len("not."):] if self.negate else operator
+        # Text search operators may name a configuration, as in wfts(english)
+        self.operator = operator.split("(")[0]
+        self.value: Any = None
+        self.values: Set[Any] = set()
+        if self.operator == "in":
+            if isinstance(criteria, str):
+                criteria = split_top_level(criteria.strip("()"))
+            self.values = {coerce(column, value) for value in criteria}
+        elif self.operator == "is":
+            self.value = {"null": None, "true": True, "false": False}[str(criteria).lower()]
+        elif self.operator in ("fts", "plfts", "phfts", "wfts"):
+            self.value = search_terms(criteria)
+        else:
+            self.value = coerce(column, criteria)
+
+    @property
+    def index_values(self) -> Optional[Set[Any]]:
+        """Values an index lookup can find every match under, if any."""
+        if self.negate:
+            return None
+        if self.operator == "eq":
+            return {self.value}
+        if self.operator == "in":
+            return self.values
+        return None
+
+    def __call__(self, row: Row) -> bool:
+        return self.matches(row) != self.negate
+
+    def matches(self, row: Row) -> bool:
+        value = row.get(self.column)
+        if self.operator == "in":
+            return value in self.values
+        if self.operator == "is":
+            return value is self.value
+        if self.operator in ("fts", "plfts", "phfts", "wfts"):
+            return text_matches(row, self.value)
+        return value is not None and self.value is not None and COMPARISONS[self.operator](value, self.value)
+
+
+def logic(kind: str, terms: str) -> Predicate:
+    """Predicate for a PostgREST ``or``/``and`` filter string."""
+    predicates: List[Predicate] = []
+    for term in split_top_level(terms):
+        if term.startswith(("and(", "or(")):
+            inner, _, rest = term.partition("(")
+            predicates.append(logic(inner, rest[:-1]))
+        else:
+            column, _, expression = term.partition(".")
+            negation = "not." if expression.startswith("not.") else ""
+            operator, _, criteria = expression[len(negation):].partition(".")
+            predicates.append(Filter(column, negation + operator, criteria))
+    combine = any if kind == "or" else all
+    return lambda row: combine(predicate(row) for predicate in predicates)
+
+
+def sort_rows(rows: List[Row], order: Sequence[Tuple[str, bool]]) -> List[Row]:
+    """Sort like ORDER BY, with Postgres' default NULLS LAST for ascending keys."""
+    for column, descending in reversed(order):
+        rows = sorted(rows, key=lambda row: (row.get(column) is None, row.get(column)), reverse=descending)
+    return rows
+
+
+class MemoryTable:
+    """Rows of one table, with a hash index per indexed column.
+
+    Every write appends its inverse to ``undo_log``, shared by all tables of
+    a database, so a failed statement can be rolled back.
+    """
+
+    def __init__(self, name: str, undo_log: List[Callable[[], None]]):
+        self.name = name
+        self.undo_log = undo_log
+        self.key = PRIMARY_KEYS.get(name)
+        indexed = ((self.key,) if self.key else ()) + SECONDARY_INDEXES.get(name, ())
+        self.rows: Dict[int, Row] = {}
+        self.indexes: Dict[str, Dict[Any, Set[int]]] = {column: {} for column in indexed}
+        self.orderings: Dict[Tuple, List[Row]] = {}
+        self._row_ids = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, key: Any) -> Optional[Row]:
+        """The row with primary key ``key``, if any."""
+        for row_id in self.indexes[self.key].get(key, ()):
+            return self.rows[row_id]
+        return None
+
+    def _index(self, row_id: int, row: Row) -> None:
+        for column, index in self.indexes.items():
+            index.setdefault(row.get(column), set()).add(row_id)
+
+    def _unindex(self, row_id: int, row: Row) -> None:
+        for column, index in self.indexes.items():
+            row_ids = index[row.get(column)]
+            row_ids.discard(row_id)
+            if not row_ids:
+                del index[row.get(column)]
+
+    def insert(self, row: Row) -> Row:
+        if self.key is not None and self.get(row.get(self.key)) is not None:
+            raise APIError({
+                "code": "23505",
+                "message": f'duplicate key value violates unique constraint "{self.name}_pkey"',
+            })
+        row["_row_id"] = next(self._row_ids)
+        self._add(row)
+        self.undo_log.append(lambda: self._remove(row))
+        return row
+
+    def update(self, row: Row, changes: Row) -> None:
+        previous = {column: row[column] for column in changes if column in row}
+        added = [column for column in changes if column not in row]
+
+        def undo() -> None:
+            self._remove(row)
+            for column in added:
+                del row[column]
+            row.update(previous)
+            self._add(row)
+
+        self._remove(row)
+        row.update(changes)
+        self._add(row)
+        self.undo_log.append(undo)
+
+    def delete(self, row: Row) -> None:
+        self._remove(row)
+        self.undo_log.append(lambda: self._add(row))
+
+    def _add(self, row: Row) -> None:
+        self.rows[row["_row_id"]] = row
+        self._index(row["_row_id"], row)
+        self.orderings.clear()
+
+    def _remove(self, row: Row) -> None:
+        self._unindex(row["_row_id"], row)
+        del self.rows[row["_row_id"]]
+        self.orderings.clear()
+
+    def find(self, filters: Sequence[Filter], predicates: Sequence[Predicate] = ()) -> List[Row]:
+        """Rows matching every filter and predicate, narrowed by the most selective index."""
+        candidates: Optional[Set[int]] = None
+        for condition in filters:
+            values = condition.index_values if condition.column in self.indexes else None
+            if values is None:
+                continue
+            index = self.indexes[condition.column]
+            found = set().union(*(index.get(value, ()) for value in values))
+            candidates = found if candidates is None else candidates & found
+        rows = self.rows.values() if candidates is None else (self.rows[row_id] for row_id in candidates)
+        return [
+            row for row in rows
+            if all(condition(row) for condition in filters) and all(predicate(row) for predicate in predicates)
+        ]
+
+    def ordered(self, order: Tuple[Tuple[str, bool], ...]) -> List[Row]:
+        """Every row in ``order``, kept until the table is next written."""
+        if order not in self.orderings:
+            self.orderings[order] = sort_rows(list(self.rows.values()), order)
+        return self.orderings[order]
+
+
+class MemoryDatabase:
+    """Tables plus the behaviour of the database's triggers.
+
+    Each insert, update or delete is one statement, as in Postgres: if any
+    row fails a constraint, every change it made, including trigger
+    effects, is undone and no listener hears of it.
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, MemoryTable] = {}
+        self.undo_log: List[Callable[[], None]] = []
+        self._depth = 0
+        self._notifications: List[Tuple[str, str, Optional[Row], Optional[Row]]] = []
+        # Called with (table, change type, record, old record) after every
+        # write to a table, as Supabase Realtime would be
+        self.listeners: List[Callable[[str, str, Optional[Row], Optional[Row]], None]] = []
+        self.ticket_counts: Dict[Tuple, Row] = {}
+        self._last_now = datetime.min.replace(tzinfo=timezone.utc)
+        for table in VERSIONED_TABLES:
+            self.table("table_versions").insert({"table_name": table, "version": 0, "updated_at": self.now()})
+
+    def table(self, name: str) -> MemoryTable:
+        if name not in self.tables:
+            self.tables[name] = MemoryTable(name, self.undo_log)
+        return self.tables[name]
+
+    @contextmanager
+    def statement(self) -> Iterator[None]:
+        """Apply the writes made inside as a whole, or roll all of them back."""
+        if self._depth == 0:
+            self.undo_log.clear()
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._depth == 1:
+                for undo in reversed(self.undo_log):
+                    undo()
+                self.undo_log.clear()
+                counts = self.table("ticket_counts").rows.values()
+                self.ticket_counts = {tuple(row[column] for column in TICKET_COUNT_KEY): row for row in counts}
+                self._notifications.clear()
+            raise
+        finally:
+            self._depth -= 1
+        if self._depth == 0:
+            self.undo_log.clear()
+            notifications, self._notifications = self._notifications, []
+            for notification in notifications:
+                for listener in self.listeners:
+                    listener(*notification)
+
+    def now(self) -> datetime:
+        """The current time, strictly later than any earlier call.
+
+        Row versions are their updated_at, so two writes to a row must never
+        share a timestamp.
+        """
+        current = max(datetime.now(timezone.utc), self._last_now + timedelta(microseconds=1))
+        self._last_now = current
+        return current
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "MemoryDatabase":
+        """A database holding the rows in the JSON file at ``path``, if given."""
+        database = cls()
+        if path:
+            with open(path, "rb") as f:
+                fixtures = orjson.loads(f.read())
+            # Parents first, so foreign keys resolve
+            for table in sorted(fixtures, key=lambda name: name != "projects"):
+                if table not in ("table_versions", "ticket_counts"):
+                    database.insert(table, fixtures[table])
+        return database
+
+    def insert(self, table: str, rows: Iterable[Row], on_conflict: Optional[str] = None) -> List[Row]:
+        """Insert ``rows``, or merge them into rows with the same ``on_conflict`` key."""
+        written = []
+        with self.statement():
+            for values in rows:
+                values = {column: coerce(column, value) for column, value in values.items()}
+                existing = None
+                if on_conflict is not None:
+                    existing = next(iter(self.table(table).find([Filter(on_conflict, "eq", values.get(on_conflict))])), None)
+                if existing is not None:
+                    written.append(self.update_row(table, existing, values))
+                else:
+                    written.append(self.insert_row(table, values))
+            if written:
+                self.bump_version(table)
+        return written
+
+    def insert_row(self, table: str, values: Row) -> Row:
+        row = dict(values)
+        if self.table(table).key == "id":
+            row.setdefault("id", str(uuid.uuid4()))
+        if table in TIMESTAMPED_TABLES:
+            now = self.now()
+            row.setdefault("created_at", now)
+            row.setdefault("updated_at", now)
+        if table == "tickets":
+            self.check_project(row)
+            row.setdefault("status", "open")
+            row.setdefault("priority", 2)
+        self.table(table).insert(row)
+        if table == "tickets":
+            self.count_ticket(row, 1)
+        self.notify(table, "insert", row, None)
+        return row
+
+    def update_row(self, table: str, row: Row, values: Row) -> Row:
+        old = dict(row)
+        changes = {column: coerce(column, value) for column, value in values.items()}
+        if table in TIMESTAMPED_TABLES:
+            changes["updated_at"] = self.now()
+        if table == "tickets":
+            self.check_project({**row, **changes})
+            self.count_ticket(row, -1)
+        self.table(table).update(row, changes)
+        if table == "tickets":
+            self.count_ticket(row, 1)
+        self.notify(table, "update", row, old)
+        return row
+
+    def update(self, table: str, filters: Sequence[Filter], predicates: Sequence[Predicate], values: Row) -> List[Row]:
+        with self.statement():
+            rows = [self.update_row(table, row, values) for row in self.table(table).find(filters, predicates)]
+            if rows:
+                self.bump_version(table)
+        return rows
+
+    def delete(self, table: str, filters: Sequence[Filter], predicates: Sequence[Predicate]) -> List[Row]:
+        with self.statement():
+            rows = self.table(table).find(filters, predicates)
+            for row in rows:
+                self.delete_row(table, row)
+            if rows:
+                self.bump_version(table)
+        return rows
+
+    def delete_row(self, table: str, row: Row) -> None:
+        if table == "projects":
+            # ON DELETE CASCADE
+            self.delete("tickets", [Filter("project_id", "eq", row["id"])], [])
+        self.table(table).delete(row)
+        if table == "tickets":
+            self.count_ticket(row, -1)
+            tombstones = self.table("ticket_deletions")
+            existing = tombstones.get(row["id"])
+            if existing is not None:
+                tombstones.delete(existing)
+            tombstone = tombstones.insert({"ticket_id": row["id"], "project_id": row["project_id"], "deleted_at": self.now()})
+            self.notify("ticket_deletions", "update" if existing else "insert", tombstone, existing)
+        self.notify(table, "delete", None, row)
+
+    def bump_version(self, table: str) -> None:
+        if table in VERSIONED_TABLES:
+            versions = self.table("table_versions")
+            row = versions.get(table)
+            versions.update(row, {"version": row["version"] + 1, "updated_at": self.now()})
+
+    def check_project(self, ticket: Row) -> None:
+        if self.table("projects").get(ticket.get("project_id")) is None:
+            raise APIError({
+                "code": "23503",
+                "message": 'insert or update on table "tickets" violates foreign key constraint "tickets_project_id_fkey"',
+            })
+
+    def count_ticket(self, ticket: Row, delta: int) -> None:
+        """Move a ticket in or out of its ticket_counts row, dropping rows that reach zero."""
+        counts = self.table("ticket_counts")
+        key = tuple(ticket.get(column) for column in TICKET_COUNT_KEY)
+        row = self.ticket_counts.get(key)
+        if row is None:
+            self.ticket_counts[key] = counts.insert({**dict(zip(TICKET_COUNT_KEY, key)), "count": delta})
+        elif row["count"] + delta == 0:
+            counts.delete(self.ticket_counts.pop(key))
+        else:
+            counts.update(row, {"count": row["count"] + delta})
+
+    def notify(self, table: str, change_type: str, record: Optional[Row], old_record: Optional[Row]) -> None:
+        # Delivered once the statement succeeds
+        self._notifications.append(
+            (table, change_type, record and public_row(record), old_record and public_row(old_record))
+        )
+
+    def search_tickets(
+        self,
+        search_query: str,
+        filter_project_ids: Optional[List[str]] = None,
+        filter_statuses: Optional[List[str]] = None,
+        filter_priorities: Optional[List[int]] = None,
+        filter_assigned_to_ids: Optional[List[str]] = None,
+        filter_created_by_ids: Optional[List[str]] = None,
+        result_limit: int = 20,
+        result_offset: int = 0
+    ) -> List[Row]:
+        """The search_tickets function: ranked matches with <mark> highlights."""
+        filters = [Filter("search_vector", "wfts(english)", search_query)]
+        for column, values in (
+            ("project_id", filter_project_ids),
+            ("status", filter_statuses),
+            ("priority", filter_priorities),
+            ("assigned_to_id", filter_assigned_to_ids),
+            ("created_by_id", filter_created_by_ids),
+        ):
+            if values is not None:
+                filters.append(Filter(column, "in", values))
+
+        required, _ = search_terms(search_query)
+
+        def rank(row: Row) -> float:
+            # Title words weigh more, as the search vector's A weight does
+            title, description = (row.get("title") or "").lower(), (row.get("description") or "").lower()
+            return float(sum(title.count(word) + 0.4 * description.count(word) for word in required))
+
+        rows = self.table("tickets").find(filters)
+        rows = sort_rows(rows, [("created_at", True), ("id", False)])
+        rows = sorted(rows, key=rank, reverse=True)[result_offset:result_offset + result_limit]
+        return [
+            dict(
+                public_row(row),
+                project_title=(self.table("projects").get(row["project_id"]) or {}).get("title"),
+                rank=rank(row),
+                title_highlight=highlight(row["title"], required),
+                description_highlight=highlight(" ".join(row["description"].split()[:20]), required),
+            )
+            for row in rows
+        ]
+
+
+def highlight(text: str, words: Sequence[str]) -> str:
+    """Wrap words of ``text`` that contain a search term in <mark> tags."""
+    return " ".join(
+        f"<mark>{word}</mark>" if any(term in word.lower() for term in words) else word
+        for word in text.split()
+    )
+
+
+def public_row(row: Row) -> Row:
+    """A copy of ``row`` as PostgREST would return it."""
+    return {column: to_json(value) for column, value in row.items() if column != "_row_id"}
+
+
+class QuerySpec:
+    """What a query built by the Memory*Builder classes asks for."""
+
+    def __init__(self, database: MemoryDatabase, table: str):
+        self.database = database
+        self.table_name = table
+        self.operation = "select"
+        self.columns = "*"
+        self.count: Optional[str] = None
+        self.head = False
+        self.values: Any = None
+        self.on_conflict: Optional[str] = None
+        self.filters: List[Filter] = []
+        self.predicates: List[Predicate] = []
+        self.ordering: List[Tuple[str, bool]] = []
+        self.offset_rows = 0
+        self.limit_rows: Optional[int] = None
+
+
+class MemoryRequestBuilder:
+    """A table's query entry point, like postgrest-py's AsyncRequestBuilder.
+
+    Each builder below offers exactly the methods its postgrest-py
+    counterpart does at that stage, so a chain the real client rejects,
+    such as ordering after ``text_search`` or filtering an insert, fails
+    here too instead of only in production.
+    """
+
+    def __init__(self, database: MemoryDatabase, table: str):
+        self.spec = QuerySpec(database, table)
+
+    def select(self, *columns: str, count: Optional[str] = None, head: bool = False) -> "MemorySelectBuilder":
+        self.spec.columns = ",".join(columns) or "*"
+        self.spec.count, self.spec.head = count, head
+        return MemorySelectBuilder(self.spec)
+
+    def insert(self, values: Any, count: Optional[str] = None, returning: str = "representation",
+               upsert: bool = False, default_to_null: bool = True) -> "MemoryQueryBuilder":
+        self.spec.operation, self.spec.values, self.spec.count = "insert", values, count
+        if upsert:
+            self.spec.on_conflict = self.spec.database.table(self.spec.table_name).key
+        return MemoryQueryBuilder(self.spec)
+
+    def upsert(self, values: Any, on_conflict: str = "", **kwargs) -> "MemoryQueryBuilder":
+        self.spec.operation, self.spec.values = "insert", values
+        self.spec.on_conflict = on_conflict or self.spec.database.table(self.spec.table_name).key
+        return MemoryQueryBuilder(self.spec)
+
+    def update(self, values: Row, count: Optional[str] = None,
+               returning: str = "representation") -> "MemoryFilterBuilder":
+        self.spec.operation, self.spec.values, self.spec.count = "update", values, count
+        return MemoryFilterBuilder(self.spec)
+
+    def delete(self, count: Optional[str] = None, returning: str = "representation") -> "MemoryFilterBuilder":
+        self.spec.operation, self.spec.count = "delete", count
+        return MemoryFilterBuilder(self.spec)
+
+
+class MemoryQueryBuilder:
+    """A finished query that can only be executed, like AsyncQueryRequestBuilder."""
+
+    def __init__(self, spec: QuerySpec):
+        self.spec = spec
+
+    async def execute(self) -> APIResponse:
+        spec = self.spec
+        database = spec.database
+        if spec.operation == "insert":
+            rows = spec.values if isinstance(spec.values, list) else [spec.values]
+            return APIResponse(data=[public_row(row) for row in database.insert(spec.table_name, rows, spec.on_conflict)])
+        if spec.operation == "update":
+            rows = database.update(spec.table_name, spec.filters, spec.predicates, spec.values)
+            return APIResponse(data=[public_row(row) for row in rows])
+        if spec.operation == "delete":
+            rows = database.delete(spec.table_name, spec.filters, spec.predicates)
+            return APIResponse(data=[public_row(row) for row in rows])
+        return self.select_rows()
+
+    def select_rows(self) -> APIResponse:
+        spec = self.spec
+        table = spec.database.table(spec.table_name)
+        matched = table.find(spec.filters, spec.predicates)
+        if spec.ordering:
+            order = tuple(spec.ordering)
+            if len(matched) * 8 < len(table):
+                matched = sort_rows(matched, order)
+            else:
+                # Most of the table matches: filter its cached ordering instead
+                # of sorting
+                keep = {id(row) for row in matched}
+                matched = [row for row in table.ordered(order) if id(row) in keep]
+
+        end = None if spec.limit_rows is None else spec.offset_rows + spec.limit_rows
+        page = [] if spec.head else matched[spec.offset_rows:end]
+        return APIResponse(data=self.project(page), count=len(matched) if spec.count else None)
+
+    def project(self, rows: List[Row]) -> List[Row]:
+        """Apply the select list to ``rows``, including embedded parents."""
+        columns, embeds = [], []
+        for item in split_top_level(self.spec.columns.replace(" ", "")):
+            if "(" in item:
+                name, _, inner = item.partition("(")
+                embeds.append((name, inner[:-1].split(",")))
+            else:
+                columns.append(item)
+
+        result = []
+        for row in rows:
+            public = public_row(row)
+            selected = public if "*" in columns else {column: public.get(column) for column in columns}
+            for name, inner in embeds:
+                foreign_key, parent_table = EMBEDS[name]
+                parent = self.spec.database.table(parent_table).get(row.get(foreign_key))
+                parent = parent and public_row(parent)
+                selected[name] = parent and (parent if "*" in inner else {column: parent.get(column) for column in inner})
+            result.append(selected)
+        return result
+
+
+class MemoryFilterBuilder(MemoryQueryBuilder):
+    """A query that can still be filtered, like AsyncFilterRequestBuilder."""
+
+    def filter(self, column: str, operator: str, criteria: Any) -> "MemoryFilterBuilder":
+        self.spec.filters.append(Filter(column, operator, criteria))
+        return self
+
+    def eq(self, column: str, value: Any) -> "MemoryFilterBuilder":
+        return self.filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "MemoryFilterBuilder":
+        return self.filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "MemoryFilterBuilder":
+        return self.filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "MemoryFilterBuilder":
+        return self.filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "MemoryFilterBuilder":
+        return self.filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "MemoryFilterBuilder":
+        return self.filter(column, "lte", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "MemoryFilterBuilder":
+        return self.filter(column, "in", list(values))
+
+    def is_(self, column: str, value: Any) -> "MemoryFilterBuilder":
+        return self.filter(column, "is", "null" if value is None else value)
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "MemoryFilterBuilder":
+        self.spec.predicates.append(logic("or", filters))
+        return self
+
+
+class MemorySelectBuilder(MemoryFilterBuilder):
+    """A select that can be filtered, ordered and paged, like AsyncSelectRequestBuilder."""
+
+    def text_search(self, column: str, query: str, options: Optional[Dict[str, Any]] = None) -> MemoryFilterBuilder:
+        # postgrest-py returns a plain filter builder here: no order or range
+        self.filter(column, "wfts", query)
+        return MemoryFilterBuilder(self.spec)
+
+    def order(self, column: str, *, desc: bool = False, **kwargs) -> "MemorySelectBuilder":
+        self.spec.ordering.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs) -> "MemorySelectBuilder":
+        self.spec.limit_rows = size
+        return self
+
+    def offset(self, size: int) -> "MemorySelectBuilder":
+        self.spec.offset_rows = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> "MemorySelectBuilder":
+        self.spec.offset_rows, self.spec.limit_rows = start, end - start + 1
+        return self
+
+
+class MemoryRPC:
+    def __init__(self, function: Callable[..., List[Row]], params: Dict[str, Any]):
+        self.function = function
+        self.params = params
+
+    async def execute(self) -> APIResponse:
+        return APIResponse(data=self.function(**self.params))
+
+
+class MemoryClient:
+    """Supabase client stand-in over a MemoryDatabase."""
+
+    def __init__(self, database: MemoryDatabase):
+        self.database = database
+
+    def table(self, name: str) -> MemoryRequestBuilder:
+        return MemoryRequestBuilder(self.database, name)
+
+    from_ = table
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> MemoryRPC:
+        if function != "search_tickets":
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{function}"})
+        return MemoryRPC(self.database.search_tickets, params or {})
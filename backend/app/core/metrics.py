@@ -0,0 +1,160 @@
+"""
+Prometheus metrics for requests, upstream calls and LLM usage.
+
+With PROMETHEUS_MULTIPROC_DIR set, every uvicorn worker writes its samples
+to files in that directory and /metrics aggregates all of them, so one
+scrape covers every worker. The directory must be emptied before the
+workers start (the production image does this), not by the workers.
+"""
+
+import os
+import time
+from typing import Optional
+
+import httpx
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Wide enough for streamed exports and LLM calls at the top end
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REQUEST_LATENCY = Histogram(
+    "bradboard_http_request_duration_seconds",
+    "Time to serve a request, until the last body byte is sent.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "bradboard_http_requests_in_flight",
+    "Requests currently being served.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_LATENCY = Histogram(
+    "bradboard_upstream_request_duration_seconds",
+    "Time from sending an upstream request to receiving its response headers.",
+    ["target", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "bradboard_cache_lookups_total",
+    "Lookups in named in-process caches, by result.",
+    ["cache", "result"],
+)
+LLM_TOKENS = Counter(
+    "bradboard_llm_tokens_total",
+    "Tokens used by LLM calls.",
+    ["model", "type"],
+)
+
+# Label for requests that match no route, so scanners cannot create series
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(app: ASGIApp, scope: Scope) -> str:
+    """The path template of the route ``scope`` will be served by."""
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Records latency and in-flight requests per route template."""
+
+    def __init__(self, app: ASGIApp, router: ASGIApp):
+        self.app = app
+        # Routes are matched against the application, which the middleware
+        # stack wraps
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(self.router, scope)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(time.perf_counter() - started)
+
+
+def upstream_target(url: httpx.URL) -> str:
+    """Metric label for an upstream URL: the Supabase table or service, or OpenAI."""
+    if url.host.endswith("openai.com"):
+        return "openai"
+    parts = [part for part in url.path.split("/") if part]
+    if len(parts) >= 3 and parts[:2] == ["rest", "v1"]:
+        return f"supabase:{'rpc' if parts[2] == 'rpc' else parts[2]}"
+    if parts and parts[0] in ("auth", "storage", "functions", "realtime"):
+        return f"supabase:{parts[0]}"
+    return url.host
+
+
+async def _start_timer(request: httpx.Request) -> None:
+    request.extensions["bradboard_started"] = time.perf_counter()
+
+
+async def _observe_response(response: httpx.Response) -> None:
+    request = response.request
+    started = request.extensions.get("bradboard_started")
+    if started is not None:
+        UPSTREAM_LATENCY.labels(upstream_target(request.url), request.method, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+
+
+def instrument_http_client(client: httpx.AsyncClient) -> httpx.AsyncClient:
+    """Record upstream latency for every request ``client`` sends; idempotent."""
+    hooks = client.event_hooks
+    if _start_timer in hooks.get("request", []):
+        return client
+    hooks["request"] = [*hooks.get("request", []), _start_timer]
+    hooks["response"] = [*hooks.get("response", []), _observe_response]
+    client.event_hooks = hooks
+    return client
+
+
+def record_llm_usage(model: str, usage: Optional[object]) -> None:
+    """Add an OpenAI response's token usage to the counters."""
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def metrics_response() -> Response:
+    """Current metrics in the Prometheus text format, across all workers."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared metrics directory."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,55 @@
+"""
+Opaque cursors for keyset pagination.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _timestamp(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return datetime.fromisoformat(value).isoformat()
+
+
+# Sort keys a cursor may carry, with the normaliser applied on both ends.
+# Cursor values end up inside PostgREST filter strings, so anything that
+# does not parse as the expected type is rejected.
+CURSOR_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "id": lambda value: str(uuid.UUID(str(value))),
+    "created_at": _timestamp,
+    "updated_at": _timestamp,
+    "deleted_at": _timestamp,
+    "priority": int,
+    "ticket_id": lambda value: str(uuid.UUID(str(value))),
+}
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode the sort keys of the last row of a page as an opaque cursor."""
+    payload = {key: CURSOR_FIELDS[key](value) for key, value in values.items()}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Iterable[str]) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor carrying exactly ``keys``.
+
+    Raises InvalidCursorError if the cursor is malformed, was tampered with, or
+    belongs to a listing with a different sort order.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or set(payload) != set(keys):
+            raise InvalidCursorError("Invalid cursor")
+        return {key: CURSOR_FIELDS[key](value) for key, value in payload.items()}
+    except (KeyError, TypeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
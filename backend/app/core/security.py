@@ -2,12 +2,21 @@
 Security utilities for authentication and authorization.
 """
 
+import asyncio
+import hashlib
+import logging
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+import httpx
 import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.metrics import instrument_http_client
+
+
+logger = logging.getLogger(__name__)
 
 
 # Password hashing
@@ -66,3 +75,150 @@ def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+
+
+# Asymmetric algorithms Supabase may sign access tokens with.
+JWKS_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+
+# Minimum seconds between on-demand JWKS fetches for an unknown key ID.
+JWKS_MIN_REFETCH_SECONDS = 30
+
+
+class JWKSCache:
+    """Signing keys from the Supabase JWKS endpoint.
+
+    Keys are fetched once and then refreshed in the background, so token
+    verification never waits on the network except when a token names a key
+    ID that has not been seen yet (e.g. right after a key rotation).
+    """
+
+    def __init__(self, url: str, refresh_interval: float):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at: float = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        """Fetch the current key set."""
+        async with instrument_http_client(httpx.AsyncClient(timeout=10)) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        self._fetched_at = time.monotonic()
+        try:
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        except jwt.PyJWKSetError:
+            # Projects that only use the shared HS256 secret publish no keys
+            self._keys = {}
+            return
+        self._keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+
+    async def get_key(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        """Get the signing key for a key ID, fetching the set if needed."""
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._fetched_at > JWKS_MIN_REFETCH_SECONDS:
+            async with self._lock:
+                if kid not in self._keys and time.monotonic() - self._fetched_at > JWKS_MIN_REFETCH_SECONDS:
+                    await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("JWKS refresh from %s failed: %s", self.url, e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """Start refreshing keys in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresh task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def get_jwks_url() -> str:
+    """JWKS endpoint for the configured Supabase project."""
+    if settings.SUPABASE_JWKS_URL:
+        return settings.SUPABASE_JWKS_URL
+    if settings.SUPABASE_URL:
+        return f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+    return ""
+
+
+jwks_cache = JWKSCache(get_jwks_url(), settings.JWKS_REFRESH_INTERVAL_SECONDS)
+
+
+def hash_token(token: str) -> str:
+    """Stable cache key for a bearer token that does not retain the token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def verify_supabase_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a Supabase access token locally and return its claims.
+
+    Returns None when no key material is available to verify the token
+    locally, in which case the caller should fall back to GoTrue.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.PyJWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        if not settings.SUPABASE_JWT_SECRET:
+            return None
+        key = settings.SUPABASE_JWT_SECRET
+    elif algorithm in JWKS_ALGORITHMS:
+        if not jwks_cache.url:
+            return None
+        try:
+            jwk = await jwks_cache.get_key(header.get("kid"))
+        except Exception:
+            logger.warning("JWKS fetch from %s failed", jwks_cache.url, exc_info=True)
+            return None
+        if jwk is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+            )
+        key = jwk.key
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+
+    try:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=settings.SUPABASE_JWT_AUDIENCE,
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+        )
+    except jwt.PyJWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
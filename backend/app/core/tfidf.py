@@ -0,0 +1,111 @@
+"""
+Small in-memory TF-IDF index for ranking short documents against a query.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i in is it its of on or our so
+that the their this to was we were will with you your need needs add create new
+please should make also
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords or single characters."""
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+class TfidfIndex:
+    """TF-IDF cosine-similarity index over documents keyed by ID.
+
+    Documents are added, replaced and removed incrementally; term counts and
+    document frequencies are kept up to date on every change. Scoring uses
+    postings, each term's normalized weight in the documents containing it,
+    rebuilt lazily on the first search after a change. Memory grows with
+    the number of term occurrences rather than documents times vocabulary,
+    and a search only visits the documents sharing a term with the query.
+    """
+
+    def __init__(self):
+        self._docs: Dict[str, Counter] = {}
+        self._df: Counter = Counter()
+        self._postings: Optional[Dict[str, Dict[str, float]]] = None
+        self._order: Dict[str, int] = {}
+        self._idf: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Add a document, replacing any previous version."""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self._docs[doc_id] = terms
+        self._df.update(terms.keys())
+        self._postings = None
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document if present."""
+        terms = self._docs.pop(doc_id, None)
+        if terms is None:
+            return
+        self._df.subtract(terms.keys())
+        for term in terms:
+            if self._df[term] <= 0:
+                del self._df[term]
+        self._postings = None
+
+    def clear(self) -> None:
+        """Remove every document."""
+        self.__init__()
+
+    def _build(self) -> None:
+        n_docs = len(self._docs)
+        self._idf = {term: math.log((1 + n_docs) / (1 + df)) + 1 for term, df in self._df.items()}
+        # Ties rank in insertion order
+        self._order = {doc_id: i for i, doc_id in enumerate(self._docs)}
+        postings: Dict[str, Dict[str, float]] = {term: {} for term in self._df}
+        for doc_id, terms in self._docs.items():
+            weights = {term: (1 + math.log(count)) * self._idf[term] for term, count in terms.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1
+            for term, weight in weights.items():
+                postings[term][doc_id] = weight / norm
+        self._postings = postings
+
+    def search(self, text: str, limit: int) -> List[str]:
+        """IDs of the ``limit`` documents most similar to ``text``, best first.
+
+        Documents sharing no terms with the query are never returned.
+        """
+        if not self._docs or limit <= 0:
+            return []
+        if self._postings is None:
+            self._build()
+
+        # The query's norm scales every score alike, so it is left out
+        scores: Dict[str, float] = {}
+        for term, count in Counter(tokenize(text)).items():
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            weight = (1 + math.log(count)) * self._idf[term]
+            for doc_id, doc_weight in docs.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * doc_weight
+
+        order = self._order
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], order[item[0]]))
+        return [doc_id for doc_id, _ in best]
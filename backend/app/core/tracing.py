@@ -0,0 +1,181 @@
+"""
+Per-request tracing of database and auth round trips.
+
+Every Supabase call made while serving a request, through
+DatabaseService or the client from get_supabase, is counted and timed
+against that request. Responses carry the totals in a Server-Timing
+header, and requests that make more round trips than their route's
+budget are logged, so N+1 query patterns show up in development and fail
+tests that assert a route's round trips.
+"""
+
+import inspect
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTrace:
+    """Round trips made while serving one request, by kind."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counts: Dict[str, int] = {}
+        self.durations: Dict[str, float] = {}
+        self.calls: List[str] = []
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, kind: str, label: str, duration: float) -> None:
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.durations[kind] = self.durations.get(kind, 0.0) + duration
+        self.calls.append(label)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: time and round trips per kind, and the total."""
+        entries = [
+            f'{kind};dur={self.durations[kind] * 1000:.1f};desc="{count} round trips"'
+            for kind, count in self.counts.items()
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+# The trace of the request being served, if any
+request_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+async def _timed(kind: str, label: str, call: Any) -> Any:
+    trace = request_trace.get()
+    if trace is None:
+        return await call
+    started = time.perf_counter()
+    try:
+        return await call
+    finally:
+        trace.record(kind, label, time.perf_counter() - started)
+
+
+class TracedQuery:
+    """PostgREST query builder whose ``execute`` is recorded as a round trip."""
+
+    def __init__(self, builder: Any, label: str):
+        self._builder = builder
+        self._label = label
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def chained(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            # Builder methods return the builder, or a new one, to chain on
+            return TracedQuery(result, self._label) if hasattr(result, "execute") else result
+        return chained
+
+    async def execute(self) -> Any:
+        return await _timed("db", self._label, self._builder.execute())
+
+
+class TracedAuth:
+    """GoTrue client whose calls are recorded as round trips."""
+
+    def __init__(self, auth: Any):
+        self._auth = auth
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._auth, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        async def timed(*args, **kwargs):
+            return await _timed("auth", f"auth.{name}", attribute(*args, **kwargs))
+        return timed
+
+
+class TracedSupabase:
+    """Supabase client wrapper that records every query and auth call."""
+
+    def __init__(self, client: Any):
+        self._client = client
+        self.auth = TracedAuth(client.auth) if hasattr(client, "auth") else None
+
+    def table(self, name: str) -> TracedQuery:
+        return TracedQuery(self._client.table(name), f"db.{name}")
+
+    from_ = table
+
+    def rpc(self, fn: str, *args, **kwargs) -> TracedQuery:
+        return TracedQuery(self._client.rpc(fn, *args, **kwargs), f"db.rpc.{fn}")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def traced(client: Any) -> Any:
+    """Wrap a Supabase client so its calls are traced; wrapping twice is a no-op."""
+    return client if isinstance(client, TracedSupabase) else TracedSupabase(client)
+
+
+def round_trip_budget(route: str) -> int:
+    return settings.ROUND_TRIP_BUDGETS.get(route, settings.ROUND_TRIP_BUDGET)
+
+
+def round_trips(response: Any) -> int:
+    """Total round trips a response reports in its Server-Timing header."""
+    total = 0
+    for entry in response.headers.get("server-timing", "").split(","):
+        for param in entry.split(";"):
+            if param.strip().startswith('desc="') and param.strip().endswith(' round trips"'):
+                total += int(param.strip()[len('desc="'):-len(' round trips"')])
+    return total
+
+
+class TracingMiddleware:
+    """Traces each request's round trips and reports them.
+
+    The Server-Timing header covers calls made before the response
+    starts; the budget check also covers calls made while streaming.
+    """
+
+    def __init__(self, app: ASGIApp, router: ASGIApp):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = request_trace.set(trace)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and trace.counts:
+                MutableHeaders(scope=message).append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_trace.reset(token)
+            route = route_template(self.router, scope)
+            budget = round_trip_budget(route)
+            if trace.round_trips > budget:
+                logger.warning(
+                    "%s %s made %d round trips, over its budget of %d: %s",
+                    scope["method"], route, trace.round_trips, budget, ", ".join(trace.calls),
+                )
@@ -5,9 +5,16 @@ Main entry point for the project management API.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, mark_worker_dead, metrics_response
+from app.core.tracing import TracingMiddleware
+from app.core.security import jwks_cache
+from app.services.llm import close_openai_client
+from app.services.realtime import change_feed
 from app.api.v1.router import api_router
 
 
@@ -16,9 +23,16 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     print("Starting BradBoard API...")
+    if jwks_cache.url:
+        jwks_cache.start()
+    await change_feed.start()
     yield
     # Shutdown
     print("Shutting down BradBoard API...")
+    await change_feed.stop()
+    await jwks_cache.stop()
+    await close_openai_client()
+    mark_worker_dead()
 
 
 def create_application() -> FastAPI:
@@ -29,6 +43,8 @@ def create_application() -> FastAPI:
         description="BradBoard - Project management as simple as can be",
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         lifespan=lifespan,
+        # orjson encodes large lists several times faster than stdlib json
+        default_response_class=ORJSONResponse,
     )
 
     # Set up CORS
@@ -40,6 +56,15 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress responses with zstd, brotli or gzip, as the client accepts
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+    # Count database and auth round trips per request for Server-Timing
+    app.add_middleware(TracingMiddleware, router=app)
+
+    # Outermost, so latency includes compression and the whole streamed body
+    app.add_middleware(MetricsMiddleware, router=app)
+
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -61,6 +86,12 @@ async def health_check():
     return {"status": "healthy", "service": "bradboard-api"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics, aggregated across every worker."""
+    return metrics_response()
+
+
 @app.get("/test-cors")
 async def test_cors():
     """Test CORS endpoint."""
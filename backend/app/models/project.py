@@ -2,15 +2,49 @@
 Database models for projects.
 """
 
-from typing import Dict, Any, List, Optional
-from supabase import Client
+import asyncio
+import heapq
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Set
+from supabase import AsyncClient
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.tfidf import TfidfIndex
+from app.schemas.base import sparse_model
 from app.schemas.project import ProjectCreate, ProjectUpdate, Project
 
 
+# Columns every page needs to build its next cursor
+PROJECT_KEY_COLUMNS = ("created_at", "id")
+
+
 class ProjectModel:
-    """Database operations for projects."""
+    """Database operations for projects.
+    
+    Reads go through worker-wide read-through caches: one for single
+    projects and one for list pages and the count. Every project is visible
+    to every authenticated user, so the caches are shared across requests.
+    Writes through this model invalidate them immediately; writes made on
+    other workers become visible once the TTL expires.
+    
+    A TF-IDF index over every project's title and description ranks projects
+    by relevance to free text. It is loaded on first use, kept current by
+    writes through this model and fully reloaded periodically.
+    """
+    
+    cache = TTLCache(
+        maxsize=settings.PROJECT_CACHE_SIZE, ttl=settings.PROJECT_CACHE_TTL_SECONDS, name="projects_by_id"
+    )
+    list_cache = TTLCache(maxsize=128, ttl=settings.PROJECT_CACHE_TTL_SECONDS, name="project_lists")
+    index = TfidfIndex()
+    indexed: Dict[str, Project] = {}
+    index_loaded_at: Optional[float] = None
+    index_lock = asyncio.Lock()
+    version: Optional[int] = None
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
         self.table = "projects"
     
@@ -23,58 +57,298 @@ class ProjectModel:
             "created_by_name": user_name,
         }
         
-        response = self.supabase.table(self.table).insert(project_data).execute()
+        response = await self.supabase.table(self.table).insert(project_data).execute()
         
         if response.data:
-            return Project(**response.data[0])
+            created = Project(**response.data[0])
+            self.list_cache.clear()
+            self.cache.set(created.id, created)
+            self._index([created])
+            return created
         raise Exception("Failed to create project")
     
+    async def create_many(self, projects: List[ProjectCreate], user_id: str, user_name: str) -> List[Project]:
+        """Create several projects with a single bulk insert, in input order."""
+        if not projects:
+            return []
+        
+        rows = [
+            {
+                "title": project.title,
+                "description": project.description,
+                "created_by_id": user_id,
+                "created_by_name": user_name,
+            }
+            for project in projects
+        ]
+        response = await self.supabase.table(self.table).insert(rows).execute()
+        
+        if len(response.data) != len(rows):
+            raise Exception("Failed to create projects")
+        created = [Project(**item) for item in response.data]
+        self.list_cache.clear()
+        for project in created:
+            self.cache.set(project.id, project)
+        self._index(created)
+        return created
+    
     async def get_by_id(self, project_id: str) -> Optional[Project]:
         """Get a project by ID."""
-        response = self.supabase.table(self.table).select("*").eq("id", project_id).execute()
+        project = self.cache.get(project_id)
+        if project is not None:
+            return project
+        
+        response = await self.supabase.table(self.table).select("*").eq("id", project_id).execute()
         
         if response.data:
-            return Project(**response.data[0])
+            project = Project(**response.data[0])
+            self.cache.set(project_id, project)
+            return project
         return None
     
-    async def get_all(self, page: int = 1, size: int = 50) -> List[Project]:
-        """Get all projects with pagination."""
-        offset = (page - 1) * size
+    async def get_existing_ids(self, project_ids: List[str]) -> Set[str]:
+        """Return which of ``project_ids`` exist, with one query for cache misses."""
+        wanted = set(project_ids)
+        existing = {project_id for project_id in wanted if self.cache.get(project_id) is not None}
+        missing = wanted - existing
         
-        response = (
+        if missing:
+            response = await (
+                self.supabase.table(self.table)
+                .select("*")
+                .in_("id", list(missing))
+                .execute()
+            )
+            for item in response.data:
+                project = Project(**item)
+                self.cache.set(project.id, project)
+                existing.add(project.id)
+        
+        return existing
+    
+    async def get_all(
+        self,
+        page: int = 1,
+        size: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Project]:
+        """Get all projects with offset or keyset pagination.
+        
+        With ``fields``, only those Project fields (plus the sort keys the
+        next cursor needs) are selected, as lightweight models.
+        """
+        # Keyed by the table version seen before the read, so a page cached
+        # under a version never holds data older than that version
+        fields = tuple(fields) if fields is not None else None
+        cache_key = ("page", page, size, cursor, fields, ProjectModel.version)
+        projects = self.list_cache.get(cache_key)
+        if projects is not None:
+            return projects
+        
+        if fields is None:
+            columns, model = "*", Project
+        else:
+            selected = tuple(dict.fromkeys([*fields, *PROJECT_KEY_COLUMNS]))
+            columns, model = ", ".join(selected), sparse_model(Project, selected)
+        
+        query = (
             self.supabase.table(self.table)
-            .select("*")
+            .select(columns)
             .order("created_at", desc=True)
-            .range(offset, offset + size - 1)
-            .execute()
+            .order("id", desc=True)
         )
         
-        return [Project(**item) for item in response.data]
+        if cursor:
+            after = decode_cursor(cursor, ("created_at", "id"))
+            created_at, project_id = after["created_at"], after["id"]
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{project_id})'
+            ).limit(size)
+        else:
+            offset = (page - 1) * size
+            query = query.range(offset, offset + size - 1)
+        
+        response = await query.execute()
+        
+        projects = [model(**item) for item in response.data]
+        self.list_cache.set(cache_key, projects)
+        if fields is None:
+            for project in projects:
+                self.cache.set(project.id, project)
+        return projects
     
-    async def update(self, project_id: str, project: ProjectUpdate) -> Optional[Project]:
-        """Update a project."""
-        update_data = {k: v for k, v in project.dict().items() if v is not None}
+    @staticmethod
+    def next_cursor(projects: List[Project], size: int) -> Optional[str]:
+        """Cursor for the page after ``projects``, or None if it was the last."""
+        if len(projects) < size:
+            return None
+        last = projects[-1]
+        return encode_cursor({"created_at": last.created_at, "id": last.id})
+    
+    async def update(
+        self,
+        project_id: str,
+        project: ProjectUpdate,
+        versions: Optional[List[datetime]] = None
+    ) -> Optional[Project]:
+        """Update a project with a single UPDATE ... RETURNING.
+        
+        Only fields the client sent are changed. With ``versions``, the
+        project is only updated if its updated_at is one of them. Returns
+        None if no project matched.
+        """
+        update_data = {k: v for k, v in project.model_dump(exclude_unset=True).items() if v is not None}
         
         if not update_data:
-            return await self.get_by_id(project_id)
+            current = await self.get_by_id(project_id)
+            if current is None or (versions is not None and current.updated_at not in versions):
+                return None
+            return current
         
-        response = (
-            self.supabase.table(self.table)
-            .update(update_data)
-            .eq("id", project_id)
-            .execute()
-        )
+        query = self.supabase.table(self.table).update(update_data).eq("id", project_id)
+        if versions is not None:
+            query = query.in_("updated_at", [version.isoformat() for version in versions])
+        response = await query.execute()
         
+        self.invalidate(project_id)
         if response.data:
-            return Project(**response.data[0])
+            updated = Project(**response.data[0])
+            self.cache.set(project_id, updated)
+            self._index([updated])
+            return updated
         return None
     
-    async def delete(self, project_id: str) -> bool:
-        """Delete a project."""
-        response = self.supabase.table(self.table).delete().eq("id", project_id).execute()
+    async def delete(self, project_id: str, versions: Optional[List[datetime]] = None) -> bool:
+        """Delete a project, only if its updated_at is one of ``versions`` if given."""
+        query = self.supabase.table(self.table).delete().eq("id", project_id)
+        if versions is not None:
+            query = query.in_("updated_at", [version.isoformat() for version in versions])
+        response = await query.execute()
+        self.invalidate(project_id)
+        self._unindex([project_id])
         return len(response.data) > 0
     
+    async def delete_many(self, project_ids: List[str]) -> List[str]:
+        """Delete several projects in one round trip and return the IDs deleted."""
+        if not project_ids:
+            return []
+        
+        response = await self.supabase.table(self.table).delete().in_("id", project_ids).execute()
+        for project_id in project_ids:
+            self.cache.invalidate(project_id)
+        self.list_cache.clear()
+        self._unindex(project_ids)
+        return [item["id"] for item in response.data]
+    
     async def count(self) -> int:
         """Get total count of projects."""
-        response = self.supabase.table(self.table).select("id", count="exact").execute()
-        return response.count or 0
+        cache_key = ("count", ProjectModel.version)
+        total = self.list_cache.get(cache_key)
+        if total is not None:
+            return total
+        
+        response = await self.supabase.table(self.table).select("id", count="exact", head=True).execute()
+        total = response.count or 0
+        self.list_cache.set(cache_key, total)
+        return total
+    
+    async def get_relevant(self, text: str, limit: int, project_id: Optional[str] = None) -> List[Project]:
+        """The ``limit`` projects most relevant to ``text``, best first.
+        
+        ``project_id``, if it exists, is always included and comes first.
+        When fewer than ``limit`` projects match, the most recent projects
+        fill the remaining places, so some context is always given.
+        """
+        if self._index_is_stale():
+            async with ProjectModel.index_lock:
+                # Another request may have reloaded it while this one waited
+                if self._index_is_stale():
+                    await self._load_index()
+        
+        found = self.index.search(text, limit)
+        if len(found) < limit:
+            matched = set(found)
+            recent = heapq.nlargest(
+                limit - len(found),
+                (project for project in self.indexed.values() if project.id not in matched),
+                key=lambda project: project.created_at
+            )
+            found += [project.id for project in recent]
+        projects = [self.indexed[project_id] for project_id in found]
+        if project_id:
+            pinned = self.indexed.get(project_id) or await self.get_by_id(project_id)
+            if pinned is not None:
+                projects = [pinned] + [p for p in projects if p.id != pinned.id][:limit - 1]
+        return projects
+    
+    @staticmethod
+    def _index_is_stale() -> bool:
+        loaded_at = ProjectModel.index_loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at > settings.PROJECT_INDEX_REFRESH_SECONDS
+    
+    async def _load_index(self) -> None:
+        """Rebuild the relevance index from every project, using keyset pages."""
+        batch_size = settings.EXPORT_BATCH_SIZE
+        projects: List[Project] = []
+        cursor = None
+        while True:
+            batch = await self.get_all(size=batch_size, cursor=cursor)
+            projects.extend(batch)
+            cursor = self.next_cursor(batch, batch_size)
+            if cursor is None:
+                break
+        
+        ProjectModel.index.clear()
+        ProjectModel.indexed = {}
+        ProjectModel.index_loaded_at = time.monotonic()
+        self._index(projects)
+    
+    @classmethod
+    def _index(cls, projects: List[Project]) -> None:
+        if cls.index_loaded_at is None:
+            return
+        for project in projects:
+            cls.indexed[project.id] = project
+            # Titles count twice: they are short and name the project
+            cls.index.add(project.id, f"{project.title} {project.title} {project.description}")
+    
+    @classmethod
+    def _unindex(cls, project_ids: List[str]) -> None:
+        for project_id in project_ids:
+            cls.indexed.pop(project_id, None)
+            cls.index.remove(project_id)
+    
+    @classmethod
+    def invalidate(cls, project_id: Optional[str] = None) -> None:
+        """Drop cached data for one project (or all projects) and every list.
+        
+        Dropping everything also unloads the relevance index.
+        """
+        if project_id is None:
+            cls.cache.clear()
+            cls.index.clear()
+            cls.indexed = {}
+            cls.index_loaded_at = None
+            cls.version = None
+        else:
+            cls.cache.invalidate(project_id)
+        cls.list_cache.clear()
+    
+    @classmethod
+    def observe_version(cls, version: int) -> None:
+        """Drop the caches if the projects table has changed since they were filled."""
+        if cls.version != version:
+            cls.cache.clear()
+            cls.list_cache.clear()
+            cls.version = version
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """Hit/miss statistics for the project caches in this worker.
+        
+        /metrics reports the same lookups across workers as
+        bradboard_cache_lookups_total.
+        """
+        return {"by_id": cls.cache.stats(), "lists": cls.list_cache.stats()}
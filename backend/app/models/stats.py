@@ -0,0 +1,84 @@
+"""
+Database models for ticket statistics.
+"""
+
+from typing import Dict, Any, List, Optional
+from supabase import AsyncClient
+from app.core.config import settings
+from app.schemas.base import Priority, Status
+from app.schemas.stats import AssigneeTicketCounts, ProjectTicketCounts, TicketCounts, TicketStats
+
+
+COUNT_COLUMNS = "project_id, status, priority, assigned_to_id, count"
+
+
+class TicketCountModel:
+    """Reads of the ticket_counts summary table.
+
+    Triggers on tickets keep one row per (project, status, priority,
+    assignee) holding how many tickets have those values, so these reads
+    cost a few rows per project however many tickets there are.
+    """
+
+    def __init__(self, supabase: AsyncClient):
+        self.supabase = supabase
+        self.table = "ticket_counts"
+
+    async def get_rows(self, project_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Every counter row, optionally only for ``project_ids``."""
+        batch_size = settings.EXPORT_BATCH_SIZE
+        rows: List[Dict[str, Any]] = []
+        # Paged so PostgREST's row limit never truncates the totals
+        while True:
+            query = (
+                self.supabase.table(self.table)
+                .select(COUNT_COLUMNS)
+                .order("project_id")
+                .order("status")
+                .order("priority")
+                .order("assigned_to_id")
+            )
+            if project_ids is not None:
+                query = query.in_("project_id", project_ids)
+            response = await query.range(len(rows), len(rows) + batch_size - 1).execute()
+            rows.extend(response.data)
+            if len(response.data) < batch_size:
+                return rows
+
+    @staticmethod
+    def tally(counts: TicketCounts, row: Dict[str, Any]) -> None:
+        """Add one counter row to ``counts``."""
+        status, priority = Status(row["status"]), Priority(row["priority"])
+        counts.total += row["count"]
+        counts.by_status[status] = counts.by_status.get(status, 0) + row["count"]
+        counts.by_priority[priority] = counts.by_priority.get(priority, 0) + row["count"]
+
+    async def get_project_counts(self, project_ids: List[str]) -> Dict[str, TicketCounts]:
+        """Ticket counts for each of ``project_ids``, zero for projects without tickets."""
+        if not project_ids:
+            return {}
+
+        counts = {project_id: TicketCounts() for project_id in project_ids}
+        for row in await self.get_rows(project_ids):
+            self.tally(counts[row["project_id"]], row)
+        return counts
+
+    async def get_stats(self, project_ids: Optional[List[str]] = None) -> TicketStats:
+        """Ticket counts overall, per project and per assignee."""
+        stats = TicketStats(projects=[], assignees=[])
+        projects: Dict[str, ProjectTicketCounts] = {}
+        assignees: Dict[Optional[str], AssigneeTicketCounts] = {}
+
+        for row in await self.get_rows(project_ids):
+            project_id, assigned_to_id = row["project_id"], row["assigned_to_id"]
+            if project_id not in projects:
+                projects[project_id] = ProjectTicketCounts(project_id=project_id)
+            if assigned_to_id not in assignees:
+                assignees[assigned_to_id] = AssigneeTicketCounts(assigned_to_id=assigned_to_id)
+            self.tally(stats, row)
+            self.tally(projects[project_id], row)
+            self.tally(assignees[assigned_to_id], row)
+
+        stats.projects = list(projects.values())
+        stats.assignees = sorted(assignees.values(), key=lambda counts: -counts.total)
+        return stats
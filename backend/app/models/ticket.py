@@ -2,21 +2,50 @@
 Database models for tickets.
 """
 
-from typing import Dict, Any, List, Optional
-from supabase import Client
-from app.schemas.ticket import TicketCreate, TicketUpdate, Ticket, TicketWithProject, TicketFilters
+import asyncio
+import json
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, List, Optional, Sequence, Tuple
+from supabase import AsyncClient
+from app.core.pagination import decode_cursor, encode_cursor
+from app.schemas.base import CountStrategy, sparse_model
+from app.schemas.ticket import (
+    TicketCreate, TicketUpdate, Ticket, TicketWithProject, TicketFilters, TicketSearchResult,
+    TicketTombstone
+)
+
+
+# Ticket columns returned to clients. Listed explicitly so the generated
+# search_vector column is never shipped over the wire.
+TICKET_COLUMNS = (
+    "id, project_id, title, description, created_by_id, created_by_name, "
+    "status, priority, assigned_to_id, assigned_to_name, created_at, updated_at"
+)
+
+# Columns an update may explicitly set to null
+NULLABLE_COLUMNS = {"assigned_to_id", "assigned_to_name"}
+
+# Columns every page needs to build its next cursor
+TICKET_KEY_COLUMNS = ("priority", "created_at", "id")
+
+# Sorts after every real ID, so a watermark at (time, MAX_UUID) covers
+# everything up to and including that time
+MAX_UUID = "ffffffff-ffff-ffff-ffff-ffffffffffff"
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+EPOCH = "1970-01-01T00:00:00+00:00"
 
 
 class TicketModel:
     """Database operations for tickets."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
         self.table = "tickets"
     
-    async def create(self, ticket: TicketCreate, user_id: str, user_name: str) -> Ticket:
-        """Create a new ticket."""
-        ticket_data = {
+    @staticmethod
+    def _insert_data(ticket: TicketCreate, user_id: str, user_name: str) -> Dict[str, Any]:
+        """Row to insert for a new ticket."""
+        return {
             "title": ticket.title,
             "description": ticket.description,
             "project_id": ticket.project_id,
@@ -27,29 +56,39 @@ class TicketModel:
             "created_by_id": user_id,
             "created_by_name": user_name,
         }
+    
+    async def create(self, ticket: TicketCreate, user_id: str, user_name: str) -> Ticket:
+        """Create a new ticket."""
+        ticket_data = self._insert_data(ticket, user_id, user_name)
         
-        response = self.supabase.table(self.table).insert(ticket_data).execute()
+        response = await self.supabase.table(self.table).insert(ticket_data).execute()
         
         if response.data:
             return Ticket(**response.data[0])
         raise Exception("Failed to create ticket")
     
+    async def create_many(self, tickets: List[TicketCreate], user_id: str, user_name: str) -> List[Ticket]:
+        """Create several tickets with a single bulk insert, in input order."""
+        if not tickets:
+            return []
+        
+        rows = [self._insert_data(ticket, user_id, user_name) for ticket in tickets]
+        response = await self.supabase.table(self.table).insert(rows).execute()
+        
+        if len(response.data) != len(rows):
+            raise Exception("Failed to create tickets")
+        return [Ticket(**item) for item in response.data]
+    
     async def get_by_id(self, ticket_id: str) -> Optional[Ticket]:
         """Get a ticket by ID."""
-        response = self.supabase.table(self.table).select("*").eq("id", ticket_id).execute()
+        response = await self.supabase.table(self.table).select(TICKET_COLUMNS).eq("id", ticket_id).execute()
         
         if response.data:
             return Ticket(**response.data[0])
         return None
     
-    async def get_all_with_filters(self, filters: TicketFilters) -> List[TicketWithProject]:
-        """Get all tickets with filters and project information."""
-        query = (
-            self.supabase.table(self.table)
-            .select("*, projects(title)")
-        )
-        
-        # Apply filters
+    def _apply_filters(self, query, filters: TicketFilters):
+        """Apply the filter part of ``filters`` to a ticket query."""
         if filters.project_ids:
             query = query.in_("project_id", filters.project_ids)
         
@@ -66,98 +105,347 @@ class TicketModel:
             query = query.in_("created_by_id", filters.created_by_ids)
         
         if filters.search:
-            # Search in title and description
-            query = query.or_(f"title.ilike.%{filters.search}%,description.ilike.%{filters.search}%")
+            # Full-text match against the GIN-indexed title/description vector
+            # via filter(): text_search() returns a terminal builder that
+            # cannot be ordered or paged
+            query = query.filter("search_vector", "wfts(english)", filters.search)
         
-        # Apply pagination and ordering
-        offset = (filters.page - 1) * filters.size
+        return query
+    
+    async def get_page(
+        self,
+        filters: TicketFilters,
+        count: CountStrategy = CountStrategy.EXACT,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[TicketWithProject], Optional[int]]:
+        """Get a page of tickets with project information and the filtered total.
+        
+        The total comes back in the same round trip via PostgREST's
+        Content-Range header; it is None when ``count`` is NONE.
+        
+        With ``fields``, only those TicketWithProject fields (plus the sort
+        keys the next cursor needs) are selected, and the tickets are
+        lightweight models with just those fields.
+        """
+        if fields is None:
+            columns, model, with_project = f"{TICKET_COLUMNS}, projects(title)", TicketWithProject, True
+        else:
+            selected = tuple(dict.fromkeys([*fields, *TICKET_KEY_COLUMNS]))
+            model = sparse_model(TicketWithProject, selected)
+            with_project = "project_title" in selected
+            columns = ", ".join(name for name in selected if name != "project_title")
+            if with_project:
+                columns += ", projects(title)"
+        
+        count_method = None if count == CountStrategy.NONE else count.value
+        query = (
+            self.supabase.table(self.table)
+            .select(columns, count=count_method)
+        )
+        query = self._apply_filters(query, filters)
+        
+        # Apply ordering, with id as a tiebreaker so keyset pages are stable
         query = (
             query
             .order("priority", desc=False)
             .order("created_at", desc=True)
-            .range(offset, offset + filters.size - 1)
+            .order("id", desc=False)
         )
         
-        response = query.execute()
+        # Apply pagination: keyset when a cursor is given, offset otherwise
+        if filters.cursor:
+            after = decode_cursor(filters.cursor, ("priority", "created_at", "id"))
+            query = self._after(query, after).limit(filters.size)
+        else:
+            offset = (filters.page - 1) * filters.size
+            query = query.range(offset, offset + filters.size - 1)
+        
+        response = await query.execute()
         
         tickets = []
         for item in response.data:
             ticket_data = {k: v for k, v in item.items() if k != "projects"}
-            ticket_data["project_title"] = item["projects"]["title"] if item["projects"] else "Unknown"
-            tickets.append(TicketWithProject(**ticket_data))
+            if with_project:
+                ticket_data["project_title"] = item["projects"]["title"] if item["projects"] else "Unknown"
+            tickets.append(model(**ticket_data))
         
+        return tickets, response.count if count_method else None
+    
+    async def get_all_with_filters(self, filters: TicketFilters) -> List[TicketWithProject]:
+        """Get all tickets with filters and project information."""
+        tickets, _ = await self.get_page(filters, CountStrategy.NONE)
         return tickets
     
-    async def update(self, ticket_id: str, ticket: TicketUpdate) -> Optional[Ticket]:
-        """Update a ticket."""
-        update_data = {}
+    async def search(self, filters: TicketFilters) -> List[TicketSearchResult]:
+        """Full-text search tickets, best matches first, with highlighted snippets."""
+        params = {
+            "search_query": filters.search,
+            "filter_project_ids": filters.project_ids,
+            "filter_statuses": [s.value for s in filters.statuses] if filters.statuses else None,
+            "filter_priorities": [p.value for p in filters.priorities] if filters.priorities else None,
+            "filter_assigned_to_ids": filters.assigned_to_ids,
+            "filter_created_by_ids": filters.created_by_ids,
+            "result_limit": filters.size,
+            "result_offset": (filters.page - 1) * filters.size,
+        }
+        
+        response = await self.supabase.rpc("search_tickets", params).execute()
+        
+        results = []
+        for item in response.data:
+            item["project_title"] = item["project_title"] or "Unknown"
+            results.append(TicketSearchResult(**item))
+        return results
+    
+    @staticmethod
+    def _update_data(ticket: TicketUpdate) -> Dict[str, Any]:
+        """Column changes for a ticket update.
+        
+        Only fields the client sent are changed. An explicit null clears a
+        nullable column, such as unassigning the ticket; nulls for required
+        columns are ignored.
+        """
+        return {
+            field: value
+            for field, value in ticket.model_dump(mode="json", exclude_unset=True).items()
+            if value is not None or field in NULLABLE_COLUMNS
+        }
+    
+    async def update(
+        self,
+        ticket_id: str,
+        ticket: TicketUpdate,
+        versions: Optional[List[datetime]] = None
+    ) -> Optional[Ticket]:
+        """Update a ticket with a single UPDATE ... RETURNING.
         
-        for field, value in ticket.dict().items():
-            if value is not None:
-                if field in ["status", "priority"]:
-                    update_data[field] = value.value
-                else:
-                    update_data[field] = value
+        With ``versions``, the ticket is only updated if its updated_at is
+        one of them. Returns None if no ticket matched.
+        """
+        update_data = self._update_data(ticket)
         
         if not update_data:
-            return await self.get_by_id(ticket_id)
+            current = await self.get_by_id(ticket_id)
+            if current is None or (versions is not None and current.updated_at not in versions):
+                return None
+            return current
         
-        response = (
-            self.supabase.table(self.table)
-            .update(update_data)
-            .eq("id", ticket_id)
-            .execute()
-        )
+        query = self.supabase.table(self.table).update(update_data).eq("id", ticket_id)
+        if versions is not None:
+            query = query.in_("updated_at", [version.isoformat() for version in versions])
+        response = await query.execute()
         
         if response.data:
             return Ticket(**response.data[0])
         return None
     
-    async def delete(self, ticket_id: str) -> bool:
-        """Delete a ticket."""
-        response = self.supabase.table(self.table).delete().eq("id", ticket_id).execute()
-        return len(response.data) > 0
-    
-    async def count_with_filters(self, filters: TicketFilters) -> int:
-        """Get total count of tickets with filters."""
-        query = self.supabase.table(self.table).select("id", count="exact")
-        
-        # Apply same filters as get_all_with_filters
-        if filters.project_ids:
-            query = query.in_("project_id", filters.project_ids)
+    async def update_many(
+        self,
+        updates: Dict[str, TicketUpdate]
+    ) -> Tuple[Dict[str, Ticket], Dict[str, Exception]]:
+        """Apply several ticket updates with one UPDATE ... RETURNING per change set.
         
-        if filters.statuses:
-            query = query.in_("status", [s.value for s in filters.statuses])
-        
-        if filters.priorities:
-            query = query.in_("priority", [p.value for p in filters.priorities])
+        Tickets getting identical changes, such as a bulk status change, share
+        one ``update().in_("id", ...)`` query, so each row is changed in place
+        and a ticket deleted meanwhile stays deleted. Updates that change
+        nothing are answered with one read. Returns the updated tickets by ID
+        and the error for each ID whose query failed; IDs that do not exist
+        are absent from both.
+        """
+        groups: Dict[str, Tuple[Dict[str, Any], List[str]]] = {}
+        unchanged = []
+        for ticket_id, ticket in updates.items():
+            changes = self._update_data(ticket)
+            if not changes:
+                unchanged.append(ticket_id)
+                continue
+            key = json.dumps(changes, sort_keys=True)
+            groups.setdefault(key, (changes, []))[1].append(ticket_id)
         
-        if filters.assigned_to:
-            query = query.in_("assigned_to", filters.assigned_to)
+        queries = [
+            self.supabase.table(self.table).update(changes).in_("id", ticket_ids).execute()
+            for changes, ticket_ids in groups.values()
+        ]
+        id_groups = [ticket_ids for _, ticket_ids in groups.values()]
+        if unchanged:
+            queries.append(
+                self.supabase.table(self.table).select(TICKET_COLUMNS).in_("id", unchanged).execute()
+            )
+            id_groups.append(unchanged)
         
-        if filters.created_by:
-            query = query.in_("created_by_id", filters.created_by)
+        updated: Dict[str, Ticket] = {}
+        errors: Dict[str, Exception] = {}
+        responses = await asyncio.gather(*queries, return_exceptions=True)
+        for ticket_ids, response in zip(id_groups, responses):
+            if isinstance(response, BaseException):
+                if not isinstance(response, Exception):
+                    raise response
+                errors.update(dict.fromkeys(ticket_ids, response))
+                continue
+            updated.update((item["id"], Ticket(**item)) for item in response.data)
+        return updated, errors
+    
+    async def delete(self, ticket_id: str, versions: Optional[List[datetime]] = None) -> bool:
+        """Delete a ticket, only if its updated_at is one of ``versions`` if given."""
+        query = self.supabase.table(self.table).delete().eq("id", ticket_id)
+        if versions is not None:
+            query = query.in_("updated_at", [version.isoformat() for version in versions])
+        response = await query.execute()
+        return len(response.data) > 0
+    
+    async def delete_many(self, ticket_ids: List[str]) -> List[str]:
+        """Delete several tickets in one round trip and return the IDs deleted."""
+        if not ticket_ids:
+            return []
         
-        if filters.search:
-            query = query.or_(f"title.ilike.%{filters.search}%,description.ilike.%{filters.search}%")
+        response = await self.supabase.table(self.table).delete().in_("id", ticket_ids).execute()
+        return [item["id"] for item in response.data]
+    
+    async def count_with_filters(self, filters: TicketFilters) -> int:
+        """Get total count of tickets with filters."""
+        query = self.supabase.table(self.table).select("id", count="exact", head=True)
+        query = self._apply_filters(query, filters)
         
-        response = query.execute()
+        response = await query.execute()
         return response.count or 0
     
-    async def get_all_for_export(self) -> List[TicketWithProject]:
-        """Get all tickets for CSV export."""
-        response = (
+    @staticmethod
+    def next_cursor(tickets: List[Ticket], size: int) -> Optional[str]:
+        """Cursor for the page after ``tickets``, or None if it was the last."""
+        if len(tickets) < size:
+            return None
+        last = tickets[-1]
+        return encode_cursor({
+            "priority": last.priority.value,
+            "created_at": last.created_at,
+            "id": last.id,
+        })
+    
+    def _after(self, query, row: Dict[str, Any]):
+        """Restrict a query to rows after ``row`` in (priority, created_at DESC, id) order."""
+        priority, created_at, ticket_id = row["priority"], row["created_at"], row["id"]
+        return query.or_(
+            f"priority.gt.{priority},"
+            f'and(priority.eq.{priority},created_at.lt."{created_at}"),'
+            f'and(priority.eq.{priority},created_at.eq."{created_at}",id.gt.{ticket_id})'
+        )
+    
+    @staticmethod
+    def _later(time_column: str, id_column: str, at: str, row_id: str) -> str:
+        """PostgREST or-filter for rows after (``at``, ``row_id``) in (time, id) order."""
+        return (
+            f'{time_column}.gt."{at}",'
+            f'and({time_column}.eq."{at}",{id_column}.gt.{row_id})'
+        )
+    
+    @staticmethod
+    def initial_watermark(until: str) -> Dict[str, Any]:
+        """Watermark for a full sync: every ticket, and no earlier tombstones."""
+        return {"updated_at": EPOCH, "id": NIL_UUID, "deleted_at": until, "ticket_id": MAX_UUID}
+    
+    async def get_changes(
+        self,
+        since: Dict[str, Any],
+        until: str,
+        size: int
+    ) -> Tuple[List[TicketWithProject], List[TicketTombstone], Dict[str, Any], bool]:
+        """Tickets updated and deleted after the ``since`` watermark, up to ``until``.
+        
+        ``since`` holds the last (updated_at, id) and (deleted_at, ticket_id)
+        keys already seen. Returns up to ``size`` changed tickets and
+        tombstones, oldest first, the watermark to resume from, and whether
+        either list was cut short. Both lookups are index range scans and run
+        concurrently.
+        """
+        changed_query = (
             self.supabase.table(self.table)
-            .select("*, projects(title)")
-            .order("priority", desc=False)
-            .order("created_at", desc=True)
-            .execute()
+            .select(f"{TICKET_COLUMNS}, projects(title)")
+            .or_(self._later("updated_at", "id", since["updated_at"], since["id"]))
+            .lte("updated_at", until)
+            .order("updated_at", desc=False)
+            .order("id", desc=False)
+            .limit(size)
+        )
+        deleted_query = (
+            self.supabase.table("ticket_deletions")
+            .select("ticket_id, project_id, deleted_at")
+            .or_(self._later("deleted_at", "ticket_id", since["deleted_at"], since["ticket_id"]))
+            .lte("deleted_at", until)
+            .order("deleted_at", desc=False)
+            .order("ticket_id", desc=False)
+            .limit(size)
         )
+        changed, deleted = await asyncio.gather(changed_query.execute(), deleted_query.execute())
         
         tickets = []
-        for item in response.data:
+        for item in changed.data:
             ticket_data = {k: v for k, v in item.items() if k != "projects"}
             ticket_data["project_title"] = item["projects"]["title"] if item["projects"] else "Unknown"
             tickets.append(TicketWithProject(**ticket_data))
+        tombstones = [
+            TicketTombstone(id=item["ticket_id"], project_id=item["project_id"], deleted_at=item["deleted_at"])
+            for item in deleted.data
+        ]
         
-        return tickets
+        # A full list resumes after its last row; a short one has seen
+        # everything up to ``until``
+        watermark = dict(since)
+        if len(changed.data) == size:
+            watermark.update(updated_at=changed.data[-1]["updated_at"], id=changed.data[-1]["id"])
+        elif datetime.fromisoformat(since["updated_at"]) < datetime.fromisoformat(until):
+            watermark.update(updated_at=until, id=MAX_UUID)
+        if len(deleted.data) == size:
+            watermark.update(deleted_at=deleted.data[-1]["deleted_at"], ticket_id=deleted.data[-1]["ticket_id"])
+        elif datetime.fromisoformat(since["deleted_at"]) < datetime.fromisoformat(until):
+            watermark.update(deleted_at=until, ticket_id=MAX_UUID)
+        
+        has_more = len(changed.data) == size or len(deleted.data) == size
+        return tickets, tombstones, watermark, has_more
+    
+    async def iter_for_export(
+        self,
+        batch_size: int = 1000,
+        filters: Optional[TicketFilters] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield batches of raw ticket rows with project titles for export.
+        
+        Uses keyset pagination so each batch is an index range scan and only
+        one batch is held in memory at a time. With ``filters``, only
+        matching tickets are exported; with ``columns``, only those columns
+        (plus the sort keys) are selected, and the project title only if
+        ``project_title`` is among them. Derived columns such as
+        ``priority_name`` are left for the caller to compute.
+        """
+        if columns is None:
+            select = f"{TICKET_COLUMNS}, projects(title)"
+        else:
+            selected = [
+                name for name in dict.fromkeys([*columns, *TICKET_KEY_COLUMNS])
+                if name not in ("project_title", "priority_name")
+            ]
+            select = ", ".join(selected) + (", projects(title)" if "project_title" in columns else "")
+        
+        last_row = None
+        while True:
+            query = self.supabase.table(self.table).select(select)
+            if filters is not None:
+                query = self._apply_filters(query, filters)
+            if last_row is not None:
+                query = self._after(query, last_row)
+            
+            response = await (
+                query
+                .order("priority", desc=False)
+                .order("created_at", desc=True)
+                .order("id", desc=False)
+                .limit(batch_size)
+                .execute()
+            )
+            
+            if not response.data:
+                return
+            yield response.data
+            if len(response.data) < batch_size:
+                return
+            last_row = response.data[-1]
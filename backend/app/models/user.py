@@ -3,21 +3,21 @@ User model for database operations.
 """
 
 from typing import List, Optional
-from supabase import Client
+from supabase import AsyncClient
 from app.schemas.user import User, UserCreate
 
 
 class UserModel:
     """User model for database operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
         self.table_name = "users"
     
     async def get_all(self) -> List[User]:
         """Get all users."""
         try:
-            response = self.supabase.table(self.table_name).select("*").order("name").execute()
+            response = await self.supabase.table(self.table_name).select("*").order("name").execute()
             return [User(**user) for user in response.data]
         except Exception as e:
             raise Exception(f"Failed to get users: {str(e)}")
@@ -25,7 +25,7 @@ class UserModel:
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("id", user_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("id", user_id).execute()
             if response.data:
                 return User(**response.data[0])
             return None
@@ -35,7 +35,7 @@ class UserModel:
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("email", email).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("email", email).execute()
             if response.data:
                 return User(**response.data[0])
             return None
@@ -45,7 +45,7 @@ class UserModel:
     async def update(self, user_id: str, name: str) -> User:
         """Update user name."""
         try:
-            response = self.supabase.table(self.table_name).update({
+            response = await self.supabase.table(self.table_name).update({
                 "name": name
             }).eq("id", user_id).execute()
             
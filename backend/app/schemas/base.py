@@ -4,7 +4,9 @@ Base schemas and enums for BradBoard.
 
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import Tuple, Type
+from pydantic import BaseModel, create_model
 
 
 class Priority(int, Enum):
@@ -21,7 +23,32 @@ class Status(str, Enum):
     DONE = "done"
 
 
+class CountStrategy(str, Enum):
+    """How list endpoints compute their total row count."""
+    EXACT = "exact"
+    PLANNED = "planned"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class ExportFormat(str, Enum):
+    """Ticket export file formats."""
+    PARQUET = "parquet"
+    ARROW = "arrow"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class TimestampMixin(BaseModel):
     """Mixin for timestamp fields."""
     created_at: datetime
     updated_at: datetime
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """A model with only ``fields`` of ``model``, for sparse fieldset responses."""
+    return create_model(
+        f"{model.__name__}Fields",
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+    )
@@ -4,18 +4,22 @@ Schemas for smart ticket/project creation using LLM.
 
 from pydantic import BaseModel
 from typing import Optional, List
-from app.schemas.project import Project
-from app.schemas.ticket import Ticket
+from app.schemas.project import Project, ProjectCreate
+from app.schemas.ticket import Ticket, TicketCreate
 
 
 class SmartCreateRequest(BaseModel):
     """Schema for smart creation request."""
     text: str
     project_id: Optional[str] = None
+    dry_run: bool = False
 
 
 class SmartCreateResponse(BaseModel):
     """Schema for smart creation response."""
     created_projects: List[Project] = []
     created_tickets: List[Ticket] = []
+    planned_projects: List[ProjectCreate] = []
+    planned_tickets: List[TicketCreate] = []
+    cached: bool = False
     message: str
@@ -0,0 +1,40 @@
+"""
+Export job schemas.
+"""
+
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.base import ExportFormat
+from app.schemas.ticket import TicketFilters
+
+
+class ExportJobStatus(str, Enum):
+    """Lifecycle of a background export job."""
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ExportJobCreate(BaseModel):
+    """Schema for starting an export job."""
+    format: ExportFormat = ExportFormat.CSV
+    columns: Optional[List[str]] = None
+    filters: TicketFilters = TicketFilters()
+
+
+class ExportJob(BaseModel):
+    """Schema for export job status responses."""
+    id: str
+    status: ExportJobStatus
+    format: ExportFormat
+    columns: List[str]
+    filters: TicketFilters
+    rows_written: int = 0
+    total_rows: Optional[int] = None
+    bytes_written: int = 0
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
@@ -5,6 +5,7 @@ Project schemas for API requests and responses.
 from pydantic import BaseModel
 from typing import Optional, List
 from app.schemas.base import TimestampMixin
+from app.schemas.stats import TicketCounts
 
 
 class ProjectBase(BaseModel):
@@ -37,11 +38,13 @@ class Project(ProjectBase, TimestampMixin):
 class ProjectWithTicketCount(Project):
     """Project schema with ticket count."""
     ticket_count: int = 0
+    ticket_counts: TicketCounts = TicketCounts()
 
 
 class ProjectList(BaseModel):
     """Schema for project list responses."""
-    projects: List[Project]
+    projects: List[ProjectWithTicketCount]
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None
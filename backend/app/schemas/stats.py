@@ -0,0 +1,30 @@
+"""
+Ticket statistics schemas for dashboards.
+"""
+
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from app.schemas.base import Priority, Status
+
+
+class TicketCounts(BaseModel):
+    """Ticket counts broken down by status and by priority."""
+    total: int = 0
+    by_status: Dict[Status, int] = {}
+    by_priority: Dict[Priority, int] = {}
+
+
+class ProjectTicketCounts(TicketCounts):
+    """Ticket counts for one project."""
+    project_id: str
+
+
+class AssigneeTicketCounts(TicketCounts):
+    """Ticket counts for one assignee; None collects unassigned tickets."""
+    assigned_to_id: Optional[str] = None
+
+
+class TicketStats(TicketCounts):
+    """Ticket counts overall, per project and per assignee."""
+    projects: List[ProjectTicketCounts]
+    assignees: List[AssigneeTicketCounts]
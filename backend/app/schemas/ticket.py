@@ -2,6 +2,7 @@
 Ticket schemas for API requests and responses.
 """
 
+from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional, List
 from app.schemas.base import TimestampMixin, Priority, Status
@@ -34,6 +35,18 @@ class TicketUpdate(BaseModel):
     assigned_to_name: Optional[str] = None
 
 
+class TicketBatchUpdate(TicketUpdate):
+    """Schema for one update in a batch request."""
+    id: str
+
+
+class TicketBatchRequest(BaseModel):
+    """Schema for batch ticket writes."""
+    create: List[TicketCreate] = []
+    update: List[TicketBatchUpdate] = []
+    delete: List[str] = []
+
+
 class Ticket(TicketBase, TimestampMixin):
     """Ticket schema for responses."""
     id: str
@@ -52,11 +65,61 @@ class TicketWithProject(Ticket):
 class TicketList(BaseModel):
     """Schema for ticket list responses."""
     tickets: List[TicketWithProject]
-    total: int
+    total: Optional[int] = None
+    page: int
+    size: int
+    next_cursor: Optional[str] = None
+
+
+class TicketSearchResult(TicketWithProject):
+    """Ticket search hit with relevance and highlighted snippets."""
+    rank: float
+    title_highlight: str
+    description_highlight: str
+
+
+class TicketSearchList(BaseModel):
+    """Schema for ticket search responses."""
+    results: List[TicketSearchResult]
+    query: str
     page: int
     size: int
 
 
+class TicketTombstone(BaseModel):
+    """A deleted ticket, as reported by delta sync."""
+    id: str
+    project_id: str
+    deleted_at: datetime
+
+
+class TicketChanges(BaseModel):
+    """Tickets changed and deleted since a watermark."""
+    tickets: List[TicketWithProject]
+    deleted: List[TicketTombstone]
+    watermark: str
+    has_more: bool
+
+
+class TicketBatchItemResult(BaseModel):
+    """Outcome of one item in a batch request."""
+    operation: str
+    index: int
+    id: Optional[str] = None
+    success: bool
+    ticket: Optional[Ticket] = None
+    error: Optional[str] = None
+
+
+class TicketBatchResponse(BaseModel):
+    """Schema for batch ticket write responses."""
+    results: List[TicketBatchItemResult]
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+
+
 class TicketFilters(BaseModel):
     """Schema for ticket filtering."""
     project_ids: Optional[List[str]] = None
@@ -67,3 +130,4 @@ class TicketFilters(BaseModel):
     search: Optional[str] = None
     page: int = 1
     size: int = 50
+    cursor: Optional[str] = None
@@ -2,6 +2,7 @@
 User schemas for authentication and user management.
 """
 
+from datetime import datetime
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 
@@ -26,6 +27,7 @@ class UserLogin(BaseModel):
 class User(UserBase):
     """User schema for responses."""
     id: str
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
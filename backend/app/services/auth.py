@@ -3,21 +3,21 @@ Authentication service using Supabase.
 """
 
 from fastapi import HTTPException, status
-from supabase import Client
+from supabase import AsyncClient
 from app.schemas.user import UserCreate, UserLogin, Token, User
 
 
 class AuthService:
     """Authentication service."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
     
     async def register(self, user_data: UserCreate) -> Token:
         """Register a new user."""
         try:
             # Create user with Supabase Auth
-            response = self.supabase.auth.sign_up({
+            response = await self.supabase.auth.sign_up({
                 "email": user_data.email,
                 "password": user_data.password,
                 "options": {
@@ -53,7 +53,7 @@ class AuthService:
     async def login(self, user_data: UserLogin) -> Token:
         """Login user."""
         try:
-            response = self.supabase.auth.sign_in_with_password({
+            response = await self.supabase.auth.sign_in_with_password({
                 "email": user_data.email,
                 "password": user_data.password
             })
@@ -81,7 +81,7 @@ class AuthService:
     async def logout(self) -> dict:
         """Logout user."""
         try:
-            self.supabase.auth.sign_out()
+            await self.supabase.auth.sign_out()
             return {"message": "Successfully logged out"}
         except Exception:
             raise HTTPException(
@@ -92,7 +92,7 @@ class AuthService:
     async def refresh_token(self, refresh_token: str) -> Token:
         """Refresh access token."""
         try:
-            response = self.supabase.auth.refresh_session(refresh_token)
+            response = await self.supabase.auth.refresh_session(refresh_token)
             
             if response.session is None:
                 raise HTTPException(
@@ -0,0 +1,145 @@
+"""
+Batch ticket write service.
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from app.schemas.ticket import (
+    Ticket, TicketUpdate, TicketBatchRequest, TicketBatchResponse, TicketBatchItemResult
+)
+from app.services.database import DatabaseService
+
+
+OPERATION_ORDER = {"create": 0, "update": 1, "delete": 2}
+
+
+def _canonical_id(value: Optional[str]) -> Optional[str]:
+    """Canonical lowercase form of a UUID, as PostgREST returns it, or None."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+class TicketBatchService:
+    """Apply many ticket creates, updates and deletes with bulk queries.
+
+    Round trips grow with the number of distinct changes, not items: one
+    project lookup, one bulk insert, one UPDATE per distinct set of update
+    changes plus one read for updates that change nothing, and one bulk
+    delete. Items are independent, so one invalid item fails on its own
+    without affecting the rest of the batch.
+    """
+
+    def __init__(self, db_service: DatabaseService, user_id: str, user_name: str):
+        self.db_service = db_service
+        self.user_id = user_id
+        self.user_name = user_name
+        self.results: List[TicketBatchItemResult] = []
+
+    def _ok(self, operation: str, index: int, ticket_id: str, ticket: Optional[Ticket] = None) -> None:
+        self.results.append(TicketBatchItemResult(
+            operation=operation, index=index, id=ticket_id, success=True, ticket=ticket
+        ))
+
+    def _fail(self, operation: str, index: int, ticket_id: Optional[str], error: str) -> None:
+        self.results.append(TicketBatchItemResult(
+            operation=operation, index=index, id=ticket_id, success=False, error=error
+        ))
+
+    async def apply(self, request: TicketBatchRequest) -> TicketBatchResponse:
+        """Apply a batch and report the outcome of every item."""
+        referenced = [ticket.project_id for ticket in request.create]
+        referenced += [update.project_id for update in request.update if update.project_id]
+        referenced = [_canonical_id(project_id) for project_id in referenced]
+        referenced = [project_id for project_id in referenced if project_id]
+        existing_projects = (
+            await self.db_service.projects.get_existing_ids(referenced) if referenced else set()
+        )
+
+        await self._create(request, existing_projects)
+        await self._update(request, existing_projects)
+        await self._delete(request)
+
+        self.results.sort(key=lambda r: (OPERATION_ORDER[r.operation], r.index))
+        succeeded = [r for r in self.results if r.success]
+        return TicketBatchResponse(
+            results=self.results,
+            created=sum(1 for r in succeeded if r.operation == "create"),
+            updated=sum(1 for r in succeeded if r.operation == "update"),
+            deleted=sum(1 for r in succeeded if r.operation == "delete"),
+            failed=len(self.results) - len(succeeded),
+        )
+
+    async def _create(self, request: TicketBatchRequest, existing_projects: Set[str]) -> None:
+        pending = []
+        for index, ticket in enumerate(request.create):
+            if _canonical_id(ticket.project_id) not in existing_projects:
+                self._fail("create", index, None, "Project not found")
+            else:
+                pending.append((index, ticket))
+
+        if not pending:
+            return
+        try:
+            created = await self.db_service.tickets.create_many(
+                [ticket for _, ticket in pending], self.user_id, self.user_name
+            )
+        except Exception as e:
+            for index, _ in pending:
+                self._fail("create", index, None, f"Failed to create ticket: {str(e)}")
+            return
+        for (index, _), ticket in zip(pending, created):
+            self._ok("create", index, ticket.id, ticket)
+
+    async def _update(self, request: TicketBatchRequest, existing_projects: Set[str]) -> None:
+        pending: Dict[str, Any] = {}
+        for index, update in enumerate(request.update):
+            ticket_id = _canonical_id(update.id)
+            if ticket_id is None:
+                self._fail("update", index, update.id, "Ticket not found")
+            elif update.project_id and _canonical_id(update.project_id) not in existing_projects:
+                self._fail("update", index, ticket_id, "Project not found")
+            elif ticket_id in pending:
+                self._fail("update", index, ticket_id, "Ticket appears more than once in batch")
+            else:
+                pending[ticket_id] = (index, TicketUpdate(**update.model_dump(exclude={"id"}, exclude_unset=True)))
+
+        if not pending:
+            return
+        updated, errors = await self.db_service.tickets.update_many(
+            {ticket_id: changes for ticket_id, (_, changes) in pending.items()}
+        )
+        for ticket_id, (index, _) in pending.items():
+            if ticket_id in errors:
+                self._fail("update", index, ticket_id, f"Failed to update ticket: {str(errors[ticket_id])}")
+            elif ticket_id in updated:
+                self._ok("update", index, ticket_id, updated[ticket_id])
+            else:
+                self._fail("update", index, ticket_id, "Ticket not found")
+
+    async def _delete(self, request: TicketBatchRequest) -> None:
+        pending = {}
+        for index, raw_id in enumerate(request.delete):
+            ticket_id = _canonical_id(raw_id)
+            if ticket_id is None:
+                self._fail("delete", index, raw_id, "Ticket not found")
+            elif ticket_id in pending:
+                self._fail("delete", index, ticket_id, "Ticket appears more than once in batch")
+            else:
+                pending[ticket_id] = index
+
+        if not pending:
+            return
+        try:
+            deleted = set(await self.db_service.tickets.delete_many(list(pending)))
+        except Exception as e:
+            for ticket_id, index in pending.items():
+                self._fail("delete", index, ticket_id, f"Failed to delete ticket: {str(e)}")
+            return
+        for ticket_id, index in pending.items():
+            if ticket_id in deleted:
+                self._ok("delete", index, ticket_id)
+            else:
+                self._fail("delete", index, ticket_id, "Ticket not found")
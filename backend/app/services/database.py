@@ -2,8 +2,11 @@
 Database service utilities.
 """
 
-from supabase import Client
+from typing import Dict
+from supabase import AsyncClient
+from app.core.tracing import traced
 from app.models.project import ProjectModel
+from app.models.stats import TicketCountModel
 from app.models.ticket import TicketModel
 from app.models.user import UserModel
 
@@ -11,22 +14,43 @@ from app.models.user import UserModel
 class DatabaseService:
     """Service for database operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
+        # Traced even when a caller passes a client not from get_supabase
+        supabase = traced(supabase)
         self.supabase = supabase
         self.projects = ProjectModel(supabase)
         self.tickets = TicketModel(supabase)
         self.users = UserModel(supabase)
+        self.stats = TicketCountModel(supabase)
+    
+    async def table_versions(self, *tables: str) -> Dict[str, int]:
+        """Current write versions of ``tables``, for building list ETags.
+        
+        Each version is bumped by a trigger on every write statement to its
+        table. Reading them also brings the project caches up to date with
+        writes made on other workers.
+        """
+        response = await (
+            self.supabase.table("table_versions")
+            .select("table_name, version")
+            .in_("table_name", list(tables))
+            .execute()
+        )
+        versions = {item["table_name"]: item["version"] for item in response.data}
+        if "projects" in versions:
+            ProjectModel.observe_version(versions["projects"])
+        return versions
     
     async def health_check(self) -> bool:
         """Check database connectivity."""
         try:
             # Simple query to test connection
-            response = self.supabase.table("projects").select("id").limit(1).execute()
+            response = await self.supabase.table("projects").select("id").limit(1).execute()
             return True
         except Exception:
             return False
 
 
-def get_database_service(supabase: Client) -> DatabaseService:
+def get_database_service(supabase: AsyncClient) -> DatabaseService:
     """Get database service instance."""
     return DatabaseService(supabase)
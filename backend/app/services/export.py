@@ -0,0 +1,222 @@
+"""
+Ticket export writers for columnar and line-delimited formats.
+"""
+
+import asyncio
+import csv
+import io
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.config import settings
+from app.schemas.base import ExportFormat, Priority
+from app.schemas.ticket import TicketFilters
+from app.services.database import DatabaseService
+
+
+# Exported columns and their Arrow types, in file order. Timestamps and
+# priorities are typed, so columnar readers load them without parsing.
+EXPORT_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("title", pa.string()),
+    ("description", pa.string()),
+    ("project_id", pa.string()),
+    ("project_title", pa.string()),
+    ("status", pa.string()),
+    ("priority", pa.int8()),
+    ("assigned_to_id", pa.string()),
+    ("assigned_to_name", pa.string()),
+    ("created_by_id", pa.string()),
+    ("created_by_name", pa.string()),
+    ("created_at", pa.timestamp("us", tz="UTC")),
+    ("updated_at", pa.timestamp("us", tz="UTC")),
+])
+
+EXPORT_COLUMNS = tuple(EXPORT_SCHEMA.names)
+
+# Columns computed from others rather than read from the database
+DERIVED_COLUMNS = ("project_title", "priority_name")
+
+# Columns and header labels of the original /export/tickets/csv download
+LEGACY_CSV_HEADERS = {
+    "id": "ID",
+    "title": "Title",
+    "description": "Description",
+    "project_title": "Project",
+    "project_id": "Project ID",
+    "status": "Status",
+    "priority": "Priority",
+    "priority_name": "Priority Name",
+    "assigned_to_name": "Assigned To",
+    "created_by_id": "Created By ID",
+    "created_by_name": "Created By Name",
+    "created_at": "Created At",
+    "updated_at": "Updated At",
+}
+
+MEDIA_TYPES = {
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def export_row(item: Dict[str, Any], columns: Sequence[str]) -> Dict[str, Any]:
+    """Flatten a raw ticket row into ``columns``."""
+    row = dict(item, project_title=(item.get("projects") or {}).get("title"))
+    if "priority_name" in columns:
+        row["priority_name"] = Priority(item["priority"]).name
+    return {name: row.get(name) for name in columns}
+
+
+def record_batch(rows: List[Dict[str, Any]], schema: pa.Schema) -> pa.RecordBatch:
+    """Build a typed record batch from flattened rows."""
+    arrays = []
+    for field in schema:
+        values = [row[field.name] for row in rows]
+        if pa.types.is_timestamp(field.type):
+            # PostgREST sends ISO 8601 strings; Arrow parses them natively
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file that collects bytes until they are drained.
+
+    Lets Arrow's writers, which expect a file, feed a streaming response
+    one batch at a time.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ExportWriter:
+    """Encodes batches of flattened rows into one export format.
+
+    ``headers`` relabels CSV header cells by column; other formats always
+    use the column names.
+    """
+
+    def __init__(
+        self,
+        export_format: ExportFormat,
+        columns: Sequence[str],
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self.format = export_format
+        self.columns = list(columns)
+        self.headers = headers or {}
+        self.schema = None
+        if export_format in (ExportFormat.ARROW, ExportFormat.PARQUET):
+            self.schema = pa.schema([EXPORT_SCHEMA.field(name) for name in self.columns])
+        self.sink = ChunkSink()
+        self.writer = None
+        self.pending: List[pa.RecordBatch] = []
+        self.pending_rows = 0
+
+    def header(self) -> bytes:
+        """Bytes that can be sent before any row is read."""
+        if self.format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow([self.headers.get(name, name) for name in self.columns])
+            return buffer.getvalue().encode()
+        if self.format == ExportFormat.ARROW:
+            self.writer = pa.ipc.new_stream(self.sink, self.schema)
+        elif self.format == ExportFormat.PARQUET:
+            self.writer = pq.ParquetWriter(self.sink, self.schema, compression="zstd")
+        return self.sink.drain()
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        """Encode one batch of rows and return the bytes ready to send."""
+        if self.format == ExportFormat.NDJSON:
+            return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+        if self.format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows([row[name] for name in self.columns] for row in rows)
+            return buffer.getvalue().encode()
+
+        batch = record_batch(rows, self.schema)
+        if self.format == ExportFormat.ARROW:
+            self.writer.write_batch(batch)
+        else:
+            # Parquet row groups far larger than a database batch compress
+            # and scan better, so batches are held until one is full
+            self.pending.append(batch)
+            self.pending_rows += batch.num_rows
+            if self.pending_rows >= settings.EXPORT_ROW_GROUP_SIZE:
+                self._flush_row_group()
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        """Finish the file and return its remaining bytes."""
+        if self.format == ExportFormat.PARQUET:
+            self._flush_row_group()
+        if self.writer is not None:
+            self.writer.close()
+        return self.sink.drain()
+
+    def _flush_row_group(self) -> None:
+        if self.pending:
+            self.writer.write_table(pa.Table.from_batches(self.pending, self.schema), row_group_size=self.pending_rows)
+            self.pending = []
+            self.pending_rows = 0
+
+
+async def encode_tickets(
+    db_service: DatabaseService,
+    export_format: ExportFormat,
+    filters: Optional[TicketFilters] = None,
+    columns: Sequence[str] = EXPORT_COLUMNS,
+    headers: Optional[Dict[str, str]] = None
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (rows, bytes) for a ticket export, one database batch at a time.
+
+    At most one database batch, or one Parquet row group, is held in
+    memory, however many tickets are exported. Encoding runs in a thread
+    so large batches do not stall the event loop.
+    """
+    writer = ExportWriter(export_format, columns, headers)
+    yield 0, writer.header()
+
+    async for batch in db_service.tickets.iter_for_export(settings.EXPORT_BATCH_SIZE, filters, columns):
+        rows = [export_row(item, columns) for item in batch]
+        yield len(rows), await asyncio.to_thread(writer.write, rows)
+
+    yield 0, await asyncio.to_thread(writer.close)
+
+
+async def stream_tickets(
+    db_service: DatabaseService,
+    export_format: ExportFormat,
+    filters: Optional[TicketFilters] = None,
+    columns: Sequence[str] = EXPORT_COLUMNS,
+    headers: Optional[Dict[str, str]] = None
+) -> AsyncIterator[bytes]:
+    """Yield a ticket export in ``export_format`` as it is encoded."""
+    async for _, chunk in encode_tickets(db_service, export_format, filters, columns, headers):
+        if chunk:
+            yield chunk
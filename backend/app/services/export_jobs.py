@@ -0,0 +1,206 @@
+"""
+Background ticket export jobs spooled to local files.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence, Set
+
+import orjson
+
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.core.tracing import request_trace
+from app.schemas.base import ExportFormat
+from app.schemas.export import ExportJob, ExportJobStatus
+from app.schemas.ticket import TicketFilters
+from app.services.database import DatabaseService
+from app.services.export import encode_tickets
+
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress writes to a job's status file
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+class ExportJobStore:
+    """Export jobs kept as files in one directory.
+
+    Each job has a JSON status file and, once finished, a data file. Every
+    worker on the host shares the directory, so any worker can report on
+    or serve a job another worker ran. A job's ID is derived from what it
+    exports and the table versions at the time, so asking again for the
+    same export while the data is unchanged finds the existing job, and
+    its file is reused instead of exported again.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def job_id(
+        export_format: ExportFormat,
+        columns: Sequence[str],
+        filters: TicketFilters,
+        versions: Dict[str, int]
+    ) -> str:
+        """Stable ID for an export of ``filters`` at ``versions``."""
+        return make_etag(
+            export_format.value,
+            ",".join(columns),
+            filters.model_dump_json(exclude={"page", "size", "cursor"}),
+            sorted(versions.items()),
+        ).strip('"')
+
+    def status_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def data_path(self, job: ExportJob) -> str:
+        return os.path.join(self.directory, f"{job.id}.{job.format.value}")
+
+    def load(self, job_id: str) -> Optional[ExportJob]:
+        """The job with ``job_id``, or None if there is none."""
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self.status_path(job_id), "rb") as f:
+                return ExportJob(**orjson.loads(f.read()))
+        except FileNotFoundError:
+            return None
+
+    def save(self, job: ExportJob) -> None:
+        """Replace the job's status file atomically."""
+        job.updated_at = datetime.now(timezone.utc)
+        temp_path = f"{self.status_path(job.id)}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(orjson.dumps(job.model_dump(mode="json")))
+        os.replace(temp_path, self.status_path(job.id))
+
+    def claim(self, job: ExportJob) -> bool:
+        """Create the job's status file unless another request already has.
+
+        Linking a complete temporary file into place fails if the status
+        file exists, so exactly one of several concurrent callers, on any
+        worker, claims the job.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.status_path(job.id)}.{os.getpid()}.claim"
+        with open(temp_path, "wb") as f:
+            f.write(orjson.dumps(job.model_dump(mode="json")))
+        try:
+            os.link(temp_path, self.status_path(job.id))
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(temp_path)
+
+    def is_stale(self, job: ExportJob) -> bool:
+        """Whether a job should be run again: it failed or its worker went away."""
+        if job.status == ExportJobStatus.FAILED:
+            return True
+        if job.status == ExportJobStatus.DONE:
+            return not os.path.exists(self.data_path(job))
+        idle = datetime.now(timezone.utc) - job.updated_at
+        return idle.total_seconds() > settings.EXPORT_JOB_STALE_SECONDS
+
+    def start(self, job: ExportJob, db_service: DatabaseService) -> ExportJob:
+        """Run ``job`` in the background unless an equivalent job exists.
+
+        Returns the job that will produce the export: ``job`` itself, or
+        the running or finished job with the same ID.
+        """
+        self.sweep()
+        for _ in range(2):
+            if self.claim(job):
+                task = asyncio.create_task(self.run(job, db_service))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                return job
+            existing = self.load(job.id)
+            if existing is not None and not self.is_stale(existing):
+                return existing
+            # Clear the failed or abandoned job and try to claim it again
+            self.discard_stale(job.id)
+        return self.load(job.id) or job
+
+    def discard_stale(self, job_id: str) -> None:
+        """Remove a job's status file if it is still stale.
+
+        The file is first renamed to a name only this worker uses. Of several
+        workers doing this at once only one rename succeeds, and a fresh
+        claim that replaced the stale file in the meantime is put back
+        rather than discarded.
+        """
+        status_path = self.status_path(job_id)
+        moved_path = f"{status_path}.{os.getpid()}.stale"
+        try:
+            os.rename(status_path, moved_path)
+        except FileNotFoundError:
+            return
+        try:
+            with open(moved_path, "rb") as f:
+                moved = ExportJob(**orjson.loads(f.read()))
+            if not self.is_stale(moved):
+                os.link(moved_path, status_path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(moved_path)
+
+    async def run(self, job: ExportJob, db_service: DatabaseService) -> None:
+        """Export ``job`` into a temporary file and move it into place when complete."""
+        # Outlives the request that started it, so is not part of its trace
+        request_trace.set(None)
+        data_path = self.data_path(job)
+        # Private to this run, so a run that outlives its claim cannot
+        # interleave its bytes with the one that reclaimed the job
+        partial_path = f"{data_path}.{os.getpid()}.{id(job)}.part"
+        try:
+            try:
+                job.total_rows = await db_service.tickets.count_with_filters(job.filters)
+            except Exception:
+                logger.warning("Could not count rows for export job %s", job.id)
+
+            last_saved = time.monotonic()
+            with open(partial_path, "wb") as f:
+                async for rows, chunk in encode_tickets(db_service, job.format, job.filters, job.columns):
+                    await asyncio.to_thread(f.write, chunk)
+                    job.rows_written += rows
+                    job.bytes_written += len(chunk)
+                    if time.monotonic() - last_saved >= PROGRESS_INTERVAL_SECONDS:
+                        self.save(job)
+                        last_saved = time.monotonic()
+
+            os.replace(partial_path, data_path)
+            job.status = ExportJobStatus.DONE
+            job.finished_at = datetime.now(timezone.utc)
+        except Exception as e:
+            logger.exception("Export job %s failed", job.id)
+            job.status = ExportJobStatus.FAILED
+            job.error = str(e)
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        self.save(job)
+
+    def sweep(self) -> None:
+        """Delete job files older than the retention period."""
+        cutoff = time.time() - settings.EXPORT_JOB_TTL_SECONDS
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+export_jobs = ExportJobStore(settings.EXPORT_JOB_DIR)
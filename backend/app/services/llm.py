@@ -2,27 +2,75 @@
 LLM service for smart ticket and project creation.
 """
 
+import asyncio
+import hashlib
 import json
-from typing import List, Dict, Any
-from openai import OpenAI
-from supabase import Client
+import logging
+import time
+import uuid
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI
+from supabase import AsyncClient
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import instrument_http_client, record_llm_usage
 from app.schemas.project import ProjectCreate, Project
 from app.schemas.ticket import TicketCreate, Ticket
 from app.schemas.base import Status, Priority
 from app.services.database import get_database_service
 
 
+logger = logging.getLogger(__name__)
+
+# Emit a progress event at least every this many streamed chunks
+STREAM_PROGRESS_EVERY = 20
+
+_openai_client: Optional[AsyncOpenAI] = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get the worker-wide OpenAI client, sharing one HTTP connection pool."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            http_client=instrument_http_client(httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+                ),
+                timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            )),
+        )
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client's connection pool."""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
 class LLMService:
     """Service for LLM-powered ticket and project creation."""
     
-    def __init__(self, supabase: Client, user_id: str, user_name: str):
+    # Parsed tool calls by request, shared by every request on the worker
+    tool_call_cache = TTLCache(
+        maxsize=settings.SMART_CREATE_CACHE_SIZE,
+        ttl=settings.SMART_CREATE_CACHE_TTL_SECONDS
+    )
+    
+    def __init__(self, supabase: AsyncClient, user_id: str, user_name: str):
         self.supabase = supabase
         self.user_id = user_id
         self.user_name = user_name
         self.db_service = get_database_service(supabase)
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_openai_client()
     
     def get_tools(self) -> List[Dict[str, Any]]:
         """Get available tools for the LLM."""
@@ -66,7 +114,7 @@ class LLMService:
                             },
                             "project_id": {
                                 "type": "string",
-                                "description": "The project ID this ticket belongs to"
+                                "description": "The ID of an existing project, or the exact title of a project created in this same response"
                             },
                             "priority": {
                                 "type": "integer",
@@ -93,40 +141,8 @@ class LLMService:
             }
         ]
     
-    async def create_project_tool(self, title: str, description: str) -> Project:
-        """Tool function to create a project."""
-        project_data = ProjectCreate(title=title, description=description)
-        return await self.db_service.projects.create(project_data, self.user_id, self.user_name)
-    
-    async def create_ticket_tool(
-        self,
-        title: str,
-        description: str,
-        project_id: str,
-        priority: int = 2,
-        status: str = "open",
-        assigned_to_id: str = None,
-        assigned_to_name: str = None
-    ) -> Ticket:
-        """Tool function to create a ticket."""
-        ticket_data = TicketCreate(
-            title=title,
-            description=description,
-            project_id=project_id,
-            priority=Priority(priority),
-            status=Status(status),
-            assigned_to_id=assigned_to_id,
-            assigned_to_name=assigned_to_name
-        )
-        return await self.db_service.tickets.create(ticket_data, self.user_id, self.user_name)
-    
-    async def process_text(self, text: str, project_id: str = None) -> Dict[str, Any]:
-        """Process text input and create tickets/projects using LLM."""
-        created_projects = []
-        created_tickets = []
-        
-        # Get existing projects for context
-        existing_projects = await self.db_service.projects.get_all(1, 100)
+    def build_messages(self, text: str, project_id: str, existing_projects: List[Project]) -> List[Dict[str, str]]:
+        """Build the chat messages for a smart creation request."""
         project_context = "\n".join([f"- {p.title} (ID: {p.id}): {p.description}" for p in existing_projects])
         
         system_prompt = f"""You are a project management assistant. Your job is to analyze user input and create appropriate projects and tickets.
@@ -137,53 +153,301 @@ Available projects:
 Rules:
 1. If a project_id is provided, use it for tickets unless the user explicitly mentions a different project
 2. If no suitable project exists, create a new one first
-3. Break down complex requests into multiple tickets
-4. Set appropriate priorities: 1 (LOW), 2 (MEDIUM), 3 (HIGH)
-5. Use descriptive titles and detailed descriptions
-6. Default status is "open" unless specified otherwise
+3. Tickets for a project created in this response use that project's exact title as their project_id
+4. Break down complex requests into multiple tickets
+5. Set appropriate priorities: 1 (LOW), 2 (MEDIUM), 3 (HIGH)
+6. Use descriptive titles and detailed descriptions
+7. Default status is "open" unless specified otherwise
 
 Current user ID: {self.user_id}
 Provided project_id: {project_id or "None"}
 
 Analyze the following text and create the necessary projects and tickets:"""
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": text}
         ]
+    
+    async def get_context_projects(self, text: str, project_id: Optional[str]) -> List[Project]:
+        """Projects to show the LLM: those most relevant to the text.
+        
+        Sending only the top matches (plus the provided project) keeps the
+        prompt small however many projects exist.
+        """
+        return await self.db_service.projects.get_relevant(
+            text, settings.SMART_CREATE_CONTEXT_PROJECTS, project_id
+        )
+    
+    @staticmethod
+    def log_prompt(messages: List[Dict[str, str]], projects: List[Project], started: float) -> None:
+        """Log the prompt size and how long the LLM took to answer."""
+        logger.info(
+            "Smart create prompt: %d chars, %d context projects, LLM %.0f ms",
+            sum(len(message["content"]) for message in messages),
+            len(projects),
+            (time.perf_counter() - started) * 1000,
+        )
+    
+    async def get_tool_calls(self, messages: List[Dict[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Ask the LLM which projects and tickets to create."""
+        response = await self.client.chat.completions.create(
+            model=settings.OPENAI_MODEL,
+            messages=messages,
+            tools=self.get_tools(),
+            tool_choice="auto"
+        )
+        record_llm_usage(settings.OPENAI_MODEL, getattr(response, "usage", None))
+        
+        message = response.choices[0].message
+        return [
+            (tool_call.function.name, json.loads(tool_call.function.arguments))
+            for tool_call in message.tool_calls or []
+        ]
+    
+    async def stream_tool_calls(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream the LLM response, yielding progress and then the tool calls.
+        
+        Yields ``("progress", {...})`` as chunks arrive and finally
+        ``("tool_calls", [...])`` in the same shape get_tool_calls returns.
+        """
+        stream = await self.client.chat.completions.create(
+            model=settings.OPENAI_MODEL,
+            messages=messages,
+            tools=self.get_tools(),
+            tool_choice="auto",
+            stream=True,
+            # The final chunk then reports token usage
+            stream_options={"include_usage": True}
+        )
+        
+        calls: Dict[int, Dict[str, str]] = {}
+        chunks = 0
+        async for chunk in stream:
+            record_llm_usage(settings.OPENAI_MODEL, getattr(chunk, "usage", None))
+            if not chunk.choices:
+                continue
+            chunks += 1
+            delta = chunk.choices[0].delta
+            started = False
+            for tool_call in delta.tool_calls or []:
+                entry = calls.setdefault(tool_call.index, {"name": "", "arguments": ""})
+                started = started or not entry["name"]
+                if tool_call.function and tool_call.function.name:
+                    entry["name"] += tool_call.function.name
+                if tool_call.function and tool_call.function.arguments:
+                    entry["arguments"] += tool_call.function.arguments
+            if started or chunks % STREAM_PROGRESS_EVERY == 0:
+                yield "progress", {"chunks": chunks, "tool_calls": len(calls)}
+        
+        yield "tool_calls", [
+            (entry["name"], json.loads(entry["arguments"] or "{}"))
+            for _, entry in sorted(calls.items())
+        ]
+    
+    async def plan_tool_calls(
+        self,
+        tool_calls: List[Tuple[str, Dict[str, Any]]],
+        project_id: str = None
+    ) -> Tuple[List[ProjectCreate], List[TicketCreate]]:
+        """Validate tool calls into the projects and tickets they would create.
+        
+        Tickets for projects created in the same response keep that project's
+        title as their project_id; every other project reference must exist.
+        """
+        new_projects = [
+            ProjectCreate(**args) for name, args in tool_calls if name == "create_project"
+        ]
+        new_project_titles = {project.title.strip().lower() for project in new_projects}
+        
+        tickets = []
+        existing_refs = set()
+        for name, args in tool_calls:
+            if name != "create_ticket":
+                continue
+            args = dict(args)
+            # If no project_id in args and we have a provided project_id, use it
+            if not args.get("project_id") and project_id:
+                args["project_id"] = project_id
+            ticket = TicketCreate(
+                title=args["title"],
+                description=args["description"],
+                project_id=args["project_id"],
+                priority=Priority(args.get("priority", 2)),
+                status=Status(args.get("status", "open")),
+                assigned_to_id=args.get("assigned_to_id"),
+                assigned_to_name=args.get("assigned_to_name")
+            )
+            if ticket.project_id.strip().lower() not in new_project_titles:
+                try:
+                    ticket.project_id = str(uuid.UUID(ticket.project_id))
+                except ValueError:
+                    raise Exception(f"Unknown project: {ticket.project_id}")
+                existing_refs.add(ticket.project_id)
+            tickets.append(ticket)
+        
+        if existing_refs:
+            found = await self.db_service.projects.get_existing_ids(list(existing_refs))
+            unknown = existing_refs - found
+            if unknown:
+                raise Exception(f"Unknown project(s): {', '.join(sorted(unknown))}")
+        
+        return new_projects, tickets
+    
+    async def execute_tool_calls(
+        self,
+        tool_calls: List[Tuple[str, Dict[str, Any]]],
+        project_id: str = None
+    ) -> Tuple[List[Project], List[Ticket]]:
+        """Create the requested projects and tickets with two bulk inserts.
+        
+        Every call is validated before anything is written. New projects are
+        inserted first so tickets can reference them by title; if the ticket
+        insert then fails, the new projects are deleted again so the request
+        leaves nothing half-created behind.
+        """
+        new_projects, tickets = await self.plan_tool_calls(tool_calls, project_id)
+        
+        created_projects = await self.db_service.projects.create_many(
+            new_projects, self.user_id, self.user_name
+        )
+        created_ids = {project.title.strip().lower(): project.id for project in created_projects}
+        for ticket in tickets:
+            ticket.project_id = created_ids.get(ticket.project_id.strip().lower(), ticket.project_id)
         
         try:
-            response = self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=messages,
-                tools=self.get_tools(),
-                tool_choice="auto"
+            created_tickets = await self.db_service.tickets.create_many(
+                tickets, self.user_id, self.user_name
             )
+        except BaseException:
+            # Also covers cancellation, so a dropped request cannot leave
+            # orphaned projects behind
+            await self.db_service.projects.delete_many([project.id for project in created_projects])
+            raise
+        
+        return created_projects, created_tickets
+    
+    def cache_key(self, text: str, project_id: Optional[str], existing_projects: List[Project]) -> str:
+        """Cache key for a request: normalized text, project context and project_id.
+        
+        The user ID is part of the prompt, so it is part of the key as well.
+        """
+        normalized = " ".join(text.split()).casefold()
+        context = hashlib.sha256(
+            "\n".join(f"{p.id}:{p.title}:{p.description}" for p in existing_projects).encode()
+        ).hexdigest()
+        return hashlib.sha256(
+            f"{normalized}\0{context}\0{project_id or ''}\0{self.user_id}".encode()
+        ).hexdigest()
+    
+    async def process_text(self, text: str, project_id: str = None, dry_run: bool = False) -> Dict[str, Any]:
+        """Process text input and create tickets/projects using LLM.
+        
+        Parsed tool calls are cached, so resubmitting the same text against the
+        same projects skips the LLM and goes straight to the inserts. With
+        ``dry_run`` nothing is written and the planned projects and tickets are
+        returned instead; a later real submission reuses the cached plan.
+        """
+        try:
+            # Get relevant existing projects for context
+            existing_projects = await self.get_context_projects(text, project_id)
+            key = self.cache_key(text, project_id, existing_projects)
             
-            message = response.choices[0].message
+            tool_calls = self.tool_call_cache.get(key)
+            cached = tool_calls is not None
+            if not cached:
+                messages = self.build_messages(text, project_id, existing_projects)
+                started = time.perf_counter()
+                tool_calls = await self.get_tool_calls(messages)
+                self.log_prompt(messages, existing_projects, started)
             
-            if message.tool_calls:
-                for tool_call in message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    if function_name == "create_project":
-                        project = await self.create_project_tool(**function_args)
-                        created_projects.append(project)
-                    
-                    elif function_name == "create_ticket":
-                        # If no project_id in args and we have a provided project_id, use it
-                        if "project_id" not in function_args and project_id:
-                            function_args["project_id"] = project_id
-                        
-                        ticket = await self.create_ticket_tool(**function_args)
-                        created_tickets.append(ticket)
+            # Cached only once the plan is known to be valid, so a bad plan
+            # is asked for again instead of failing until it expires
+            if dry_run:
+                planned_projects, planned_tickets = await self.plan_tool_calls(tool_calls, project_id)
+                self.tool_call_cache.set(key, tool_calls)
+                return {
+                    "created_projects": [],
+                    "created_tickets": [],
+                    "planned_projects": planned_projects,
+                    "planned_tickets": planned_tickets,
+                    "cached": cached,
+                    "message": f"Would create {len(planned_projects)} projects and {len(planned_tickets)} tickets"
+                }
+            
+            created_projects, created_tickets = await self.execute_tool_calls(tool_calls, project_id)
+            self.tool_call_cache.set(key, tool_calls)
             
             return {
                 "created_projects": created_projects,
                 "created_tickets": created_tickets,
+                "cached": cached,
                 "message": f"Successfully created {len(created_projects)} projects and {len(created_tickets)} tickets"
             }
             
         except Exception as e:
             raise Exception(f"LLM processing failed: {str(e)}")
+    
+    async def stream_text(
+        self,
+        text: str,
+        project_id: str = None,
+        dry_run: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Process text like process_text, yielding events as work progresses.
+        
+        Yields ``start``, ``progress`` while the LLM streams, one ``project``
+        and one ``ticket`` event per created item, and a final ``done``. With
+        ``dry_run`` nothing is written; ``planned_project`` and
+        ``planned_ticket`` events describe what would be created instead.
+        """
+        yield "start", {"message": "Processing request"}
+        
+        existing_projects = await self.get_context_projects(text, project_id)
+        key = self.cache_key(text, project_id, existing_projects)
+        
+        tool_calls = self.tool_call_cache.get(key)
+        cached = tool_calls is not None
+        if cached:
+            yield "progress", {"cached": True}
+        else:
+            messages = self.build_messages(text, project_id, existing_projects)
+            started = time.perf_counter()
+            async for event, payload in self.stream_tool_calls(messages):
+                if event == "progress":
+                    yield event, payload
+                else:
+                    tool_calls = payload
+            self.log_prompt(messages, existing_projects, started)
+        
+        if dry_run:
+            planned_projects, planned_tickets = await self.plan_tool_calls(tool_calls, project_id)
+            self.tool_call_cache.set(key, tool_calls)
+            for project in planned_projects:
+                yield "planned_project", project
+            for ticket in planned_tickets:
+                yield "planned_ticket", ticket
+            yield "done", {
+                "cached": cached,
+                "message": f"Would create {len(planned_projects)} projects and {len(planned_tickets)} tickets"
+            }
+            return
+        
+        # Shielded so the writes finish consistently even if the client
+        # disconnects mid-stream
+        created_projects, created_tickets = await asyncio.shield(
+            self.execute_tool_calls(tool_calls, project_id)
+        )
+        self.tool_call_cache.set(key, tool_calls)
+        for project in created_projects:
+            yield "project", project
+        for ticket in created_tickets:
+            yield "ticket", ticket
+        
+        yield "done", {
+            "cached": cached,
+            "message": f"Successfully created {len(created_projects)} projects and {len(created_tickets)} tickets"
+        }
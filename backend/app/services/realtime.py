@@ -0,0 +1,225 @@
+"""
+Real-time fan-out of ticket and project changes to WebSocket subscribers.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Set
+
+from app.core.config import settings
+from app.core.database import supabase_client
+
+
+logger = logging.getLogger(__name__)
+
+# Tables whose changes are pushed to subscribers. Ticket deletes come from
+# the ticket_deletions tombstones: under row-level security Realtime sends
+# only the primary key of a deleted row, so a ticket's own delete event has
+# no project to route it by.
+WATCHED_TABLES = ("tickets", "projects", "ticket_deletions")
+
+# Columns never sent to clients
+HIDDEN_COLUMNS = {"search_vector"}
+
+# Sent in place of a backlog the client was too slow to receive; the client
+# should catch up through GET /tickets/changes
+RESYNC_EVENT = {"type": "resync"}
+
+
+def change_event(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Normalize a Supabase Realtime postgres_changes payload into a change event.
+
+    Events carry the table, the change type, the row's ID and project ID (a
+    project's own ID for project changes) and, except for deletes, the row.
+    A ticket_deletions tombstone becomes the delete event of its ticket.
+    """
+    data = payload.get("data", payload)
+    table = data.get("table")
+    if table not in WATCHED_TABLES or not data.get("type"):
+        return None
+
+    record = data.get("record") or {}
+    if table == "ticket_deletions":
+        if not record:
+            # Pruned tombstones are not changes to any ticket
+            return None
+        return {
+            "type": "delete",
+            "table": "tickets",
+            "id": record.get("ticket_id"),
+            "project_id": record.get("project_id"),
+            "record": None,
+        }
+    if table == "tickets" and data["type"].upper() == "DELETE":
+        # Published from the ticket's tombstone instead
+        return None
+
+    row = record or data.get("old_record") or {}
+    return {
+        "type": data["type"].lower(),
+        "table": table,
+        "id": row.get("id"),
+        "project_id": row.get("project_id") if table == "tickets" else row.get("id"),
+        "record": {k: v for k, v in record.items() if k not in HIDDEN_COLUMNS} or None,
+    }
+
+
+class Subscriber:
+    """One connection's bounded queue of pending events.
+
+    Publishing never waits on a subscriber. If a slow client lets its queue
+    fill up, the backlog is dropped and replaced by a single resync event,
+    so one stalled connection costs bounded memory and never delays others.
+    """
+
+    def __init__(self, project_ids: Optional[Set[str]], queue_size: int):
+        self.project_ids = project_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+
+class ChangeHub:
+    """Worker-local registry of subscribers, indexed by project.
+
+    Publishing an event touches only the subscribers for its project plus
+    those watching everything, so thousands of idle connections filtered to
+    other projects cost nothing per event.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscriber] = set()
+        self._everything: Set[Subscriber] = set()
+        self._by_project: Dict[str, Set[Subscriber]] = {}
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, project_ids: Optional[Iterable[str]] = None) -> Subscriber:
+        """Register a subscriber for ``project_ids``, or for every project if None."""
+        subscriber = Subscriber(set(project_ids) if project_ids else None, self.queue_size)
+        self._subscribers.add(subscriber)
+        if subscriber.project_ids is None:
+            self._everything.add(subscriber)
+        else:
+            for project_id in subscriber.project_ids:
+                self._by_project.setdefault(project_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber registered with subscribe."""
+        self._subscribers.discard(subscriber)
+        if subscriber.project_ids is None:
+            self._everything.discard(subscriber)
+            return
+        for project_id in subscriber.project_ids:
+            watchers = self._by_project.get(project_id)
+            if watchers is not None:
+                watchers.discard(subscriber)
+                if not watchers:
+                    del self._by_project[project_id]
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """Queue ``event`` for every matching subscriber; returns how many."""
+        targets = list(self._everything)
+        targets += self._by_project.get(event.get("project_id"), ())
+        for subscriber in targets:
+            subscriber.offer(event)
+        return len(targets)
+
+
+class SupabaseChangeFeed:
+    """Feeds a hub from Supabase Realtime.
+
+    Every worker holds one Realtime subscription to changes on the watched
+    tables, so subscribers connected to any worker see writes made through
+    every worker and directly in the database.
+    """
+
+    def __init__(self, hub: ChangeHub):
+        self.hub = hub
+        self.channel = None
+
+    def on_change(self, payload: Dict[str, Any]) -> None:
+        event = change_event(payload)
+        if event is not None:
+            self.hub.publish(event)
+
+    async def start(self) -> None:
+        """Subscribe to changes on the watched tables.
+
+        Failing to subscribe leaves the API up without push; clients still
+        catch up through GET /tickets/changes.
+        """
+        if not settings.SUPABASE_URL:
+            return
+        try:
+            client = await supabase_client.get_service_client()
+            channel = client.channel("bradboard-changes")
+            for table in WATCHED_TABLES:
+                channel.on_postgres_changes("*", callback=self.on_change, table=table, schema="public")
+            await channel.subscribe(self.on_subscribe_state)
+            self.channel = channel
+        except Exception as e:
+            logger.warning("Realtime change feed unavailable: %s", e)
+
+    @staticmethod
+    def on_subscribe_state(state: Any, error: Optional[Exception]) -> None:
+        if error is not None:
+            logger.warning("Realtime subscription %s: %s", state, error)
+
+    async def stop(self) -> None:
+        """Drop the Realtime subscription."""
+        if self.channel is not None:
+            client = await supabase_client.get_service_client()
+            await client.remove_channel(self.channel)
+            self.channel = None
+
+
+class LocalChangeFeed(SupabaseChangeFeed):
+    """In-process stand-in for SupabaseChangeFeed, for tests and the in-memory backend.
+
+    Events are published by calling ``publish``, with the same parts a
+    Realtime payload carries. With SUPABASE_BACKEND=memory, every write to
+    the in-memory database is published this way.
+    """
+
+    async def start(self) -> None:
+        if settings.SUPABASE_BACKEND == "memory":
+            supabase_client.get_memory_client().database.listeners.append(self.publish)
+
+    async def stop(self) -> None:
+        if settings.SUPABASE_BACKEND == "memory":
+            listeners = supabase_client.get_memory_client().database.listeners
+            if self.publish in listeners:
+                listeners.remove(self.publish)
+
+    def publish(
+        self,
+        table: str,
+        change_type: str,
+        record: Optional[Dict[str, Any]] = None,
+        old_record: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.on_change({"data": {
+            "table": table,
+            "type": change_type.upper(),
+            "record": record or {},
+            "old_record": old_record or {},
+        }})
+
+
+change_hub = ChangeHub(settings.REALTIME_QUEUE_SIZE)
+if settings.REALTIME_FEED == "supabase" and settings.SUPABASE_BACKEND != "memory":
+    change_feed = SupabaseChangeFeed(change_hub)
+else:
+    change_feed = LocalChangeFeed(change_hub)
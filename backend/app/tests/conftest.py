@@ -0,0 +1,112 @@
+"""
+Fixtures shared by the API and model tests.
+
+Tests run against the in-memory backend (app.core.memory), whose query
+builders behave like postgrest-py's, rather than against per-module fakes.
+"""
+
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.database import supabase_client
+from app.core.memory import MemoryClient, MemoryDatabase, MemoryRequestBuilder, MemoryRPC, QuerySpec
+from app.main import app
+from app.models.project import ProjectModel
+from app.schemas.user import User
+
+
+PROJECT_ID = str(uuid.uuid4())
+TOKEN_SECRET = "test-secret"
+
+
+def make_token(lifetime: int = 3600, secret: str = TOKEN_SECRET, **claims) -> str:
+    """An HS256 access token for user-123 that expires ``lifetime`` seconds from now."""
+    payload = {
+        "sub": "user-123",
+        "email": "test@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + lifetime,
+        "user_metadata": {"name": "Test User"},
+    }
+    payload.update(claims)
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+class RecordingClient(MemoryClient):
+    """MemoryClient that keeps every query it is asked for.
+
+    Each query is one PostgREST round trip, so ``round_trips`` counts them.
+    """
+
+    def __init__(self, database: MemoryDatabase):
+        super().__init__(database)
+        self.queries: List[QuerySpec] = []
+        self.rpcs: List[Tuple[str, Dict[str, Any]]] = []
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.queries) + len(self.rpcs)
+
+    def reset(self) -> None:
+        """Forget the queries made so far."""
+        self.queries.clear()
+        self.rpcs.clear()
+
+    def table(self, name: str) -> MemoryRequestBuilder:
+        builder = super().table(name)
+        self.queries.append(builder.spec)
+        return builder
+
+    from_ = table
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> MemoryRPC:
+        self.rpcs.append((function, params or {}))
+        return super().rpc(function, params, **kwargs)
+
+    def queries_of(self, table: str) -> List[QuerySpec]:
+        return [spec for spec in self.queries if spec.table_name == table]
+
+
+@pytest.fixture
+def project_cache():
+    """Start and end with ProjectModel's process-wide caches and index empty."""
+    ProjectModel.invalidate()
+    yield
+    ProjectModel.invalidate()
+
+
+@pytest.fixture
+def database():
+    """A MemoryDatabase holding one project, PROJECT_ID."""
+    database = MemoryDatabase()
+    database.insert("projects", [{
+        "id": PROJECT_ID,
+        "title": "Project",
+        "description": "Description",
+        "created_by_id": "user-123",
+        "created_by_name": "Test User",
+    }])
+    return database
+
+
+@pytest.fixture
+def supabase(database, project_cache):
+    """A RecordingClient over ``database``."""
+    return RecordingClient(database)
+
+
+@pytest.fixture
+def client(supabase, monkeypatch):
+    """A TestClient for the app served from ``supabase``, with a signed-in user."""
+    monkeypatch.setattr(settings, "SUPABASE_BACKEND", "memory")
+    monkeypatch.setattr(supabase_client, "_memory_client", supabase)
+    app.dependency_overrides[get_current_user] = lambda: User(id="user-123", email="test@example.com", name="Test User")
+    yield TestClient(app)
+    app.dependency_overrides.clear()
@@ -0,0 +1,97 @@
+"""
+Tests for batch ticket writes.
+"""
+
+import uuid
+
+import pytest
+from app.core.memory import Filter
+from app.models.project import ProjectModel
+from app.schemas.ticket import TicketCreate, TicketBatchRequest, TicketBatchUpdate
+from app.services.batch import TicketBatchService
+from app.services.database import get_database_service
+from app.tests.conftest import PROJECT_ID, RecordingClient
+
+
+def new_ticket(n, project_id=PROJECT_ID):
+    return TicketCreate(title=f"Ticket {n}", description="Description", project_id=project_id)
+
+
+@pytest.mark.asyncio
+async def test_batch_round_trips_do_not_grow_with_batch_size(supabase, database):
+    """100 creates cost two round trips in a batch versus 200 one by one."""
+    tickets = [new_ticket(n) for n in range(100)]
+
+    one_by_one = supabase
+    db_service = get_database_service(one_by_one)
+    for ticket in tickets:
+        ProjectModel.invalidate()
+        await db_service.projects.get_by_id(ticket.project_id)
+        await db_service.tickets.create(ticket, "user-123", "Test User")
+
+    ProjectModel.invalidate()
+    batched = RecordingClient(database)
+    service = TicketBatchService(get_database_service(batched), "user-123", "Test User")
+    response = await service.apply(TicketBatchRequest(create=tickets))
+
+    assert response.created == 100
+    assert [r.index for r in response.results] == list(range(100))
+    assert one_by_one.round_trips == 200
+    assert batched.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_mixed_operations_report_per_item_results(supabase, database):
+    """Creates, updates and deletes succeed or fail item by item."""
+    db_service = get_database_service(supabase)
+    first = await db_service.tickets.create(new_ticket(1), "user-123", "Test User")
+    second = await db_service.tickets.create(new_ticket(2), "user-123", "Test User")
+
+    missing = str(uuid.uuid4())
+    request = TicketBatchRequest(
+        create=[new_ticket(3), new_ticket(4, project_id=missing)],
+        update=[
+            TicketBatchUpdate(id=first.id, title="Renamed"),
+            TicketBatchUpdate(id=missing, title="Nope"),
+        ],
+        delete=[second.id.upper(), "not-a-uuid"],
+    )
+    response = await TicketBatchService(db_service, "user-123", "Test User").apply(request)
+
+    outcomes = [(r.operation, r.index, r.success, r.error) for r in response.results]
+    assert outcomes == [
+        ("create", 0, True, None),
+        ("create", 1, False, "Project not found"),
+        ("update", 0, True, None),
+        ("update", 1, False, "Ticket not found"),
+        ("delete", 0, True, None),
+        ("delete", 1, False, "Ticket not found"),
+    ]
+    assert response.results[2].ticket.title == "Renamed"
+    tickets = database.table("tickets")
+    assert tickets.get(first.id)["title"] == "Renamed"
+    assert tickets.get(second.id) is None
+    assert (response.created, response.updated, response.deleted, response.failed) == (1, 1, 1, 3)
+
+
+@pytest.mark.asyncio
+async def test_batch_updates_change_rows_in_place(supabase, database):
+    """Updates are UPDATEs grouped by change set, so deleted tickets stay deleted."""
+    db_service = get_database_service(supabase)
+    tickets = [await db_service.tickets.create(new_ticket(n), "user-123", "Test User") for n in range(4)]
+    # Deleted after the client read it, before the batch arrives
+    database.delete("tickets", [Filter("id", "eq", tickets[3].id)], [])
+    supabase.reset()
+
+    request = TicketBatchRequest(update=[
+        TicketBatchUpdate(id=tickets[0].id, status="done"),
+        TicketBatchUpdate(id=tickets[1].id, status="done"),
+        TicketBatchUpdate(id=tickets[2].id, title="Renamed"),
+        TicketBatchUpdate(id=tickets[3].id, status="done"),
+    ])
+    response = await TicketBatchService(db_service, "user-123", "Test User").apply(request)
+
+    assert [r.success for r in response.results] == [True, True, True, False]
+    assert supabase.round_trips == 2
+    assert database.table("tickets").get(tickets[3].id) is None
+    assert database.table("tickets").get(tickets[2].id)["status"] == "open"
@@ -0,0 +1,85 @@
+"""
+Tests for negotiated response compression.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+
+BODY = {"tickets": [{"title": f"Ticket {n}", "description": "Long description " * 20} for n in range(50)]}
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+
+@app.get("/large")
+async def large():
+    return BODY
+
+
+@app.get("/small")
+async def small():
+    return {"ok": True}
+
+
+@app.get("/csv")
+async def csv():
+    async def rows():
+        for n in range(100):
+            yield f"{n},Ticket {n},Long description text\n"
+    return StreamingResponse(rows(), media_type="text/csv", headers={"ETag": '"abc"'})
+
+
+@app.get("/events")
+async def events():
+    async def stream():
+        yield "event: done\ndata: {}\n\n" * 100
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "zstd"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(header, expected):
+    """The highest-weighted coding wins; ties go to zstd, then br, then gzip."""
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "br", "gzip"])
+def test_large_responses_are_compressed(encoding):
+    """Responses over the threshold come back encoded and decode to the same body."""
+    response = client.get("/large", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) * 4 < len(response.content)
+    assert response.json() == BODY
+
+
+def test_small_and_event_stream_responses_are_not_compressed():
+    """Small bodies and server-sent events are sent as-is."""
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in events.headers
+    assert events.text.startswith("event: done")
+
+
+def test_streaming_responses_are_compressed_per_chunk():
+    """Streamed bodies are compressed incrementally and decode to the full body."""
+    response = client.get("/csv", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.text.splitlines()[99] == "99,Ticket 99,Long description text"
@@ -0,0 +1,234 @@
+"""
+Tests for the async data layer.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from postgrest import AsyncPostgrestClient
+from app.api.deps import parse_fields
+from app.core.memory import Filter, MemoryQueryBuilder
+from app.models.project import ProjectModel
+from app.models.ticket import MAX_UUID, TicketModel
+from app.schemas.base import CountStrategy, Status
+from app.schemas.project import ProjectUpdate
+from app.schemas.ticket import TicketFilters, TicketWithProject
+from app.tests.conftest import PROJECT_ID
+
+
+LATENCY = 0.05
+
+
+@pytest.fixture
+def slow_queries(monkeypatch):
+    """Make every query to the memory backend take LATENCY, like a PostgREST round trip."""
+    execute = MemoryQueryBuilder.execute
+
+    async def slow_execute(self):
+        await asyncio.sleep(LATENCY)
+        return await execute(self)
+
+    monkeypatch.setattr(MemoryQueryBuilder, "execute", slow_execute)
+
+
+def make_ticket_row(n=1, **values):
+    return {
+        "id": f"123e4567-e89b-12d3-a456-42661417400{n}",
+        "title": "Test Ticket",
+        "description": "A test ticket description",
+        "project_id": PROJECT_ID,
+        "status": "open",
+        "priority": 2,
+        "created_by_id": "user-123",
+        "created_by_name": "Test User",
+        **values,
+    }
+
+
+@pytest.mark.asyncio
+async def test_model_calls_run_concurrently(supabase, database, slow_queries):
+    """Concurrent model calls on one event loop overlap their round trips."""
+    database.insert("tickets", [make_ticket_row()])
+    model = TicketModel(supabase)
+    requests = 50
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[model.get_by_id("123e4567-e89b-12d3-a456-426614174001") for _ in range(requests)]
+    )
+    elapsed = time.perf_counter() - start
+
+    assert all(ticket.title == "Test Ticket" for ticket in results)
+    # Serial execution would take requests * LATENCY (2.5s); overlapping
+    # round trips finish in roughly a single LATENCY.
+    assert elapsed < requests * LATENCY / 5
+
+
+@pytest.mark.asyncio
+async def test_get_page_counts_in_same_round_trip(supabase, database):
+    """A page and its total come back from a single PostgREST request."""
+    database.insert("tickets", [make_ticket_row()])
+    model = TicketModel(supabase)
+
+    tickets, total = await model.get_page(TicketFilters(), CountStrategy.PLANNED)
+
+    assert supabase.round_trips == 1
+    assert supabase.queries[0].count == "planned"
+    assert total == 1
+    assert tickets[0].project_title == "Project"
+
+
+@pytest.mark.asyncio
+async def test_get_page_without_count(supabase):
+    """count=none skips counting entirely."""
+    tickets, total = await TicketModel(supabase).get_page(TicketFilters(), CountStrategy.NONE)
+
+    assert supabase.queries[0].count is None
+    assert total is None
+
+
+@pytest.mark.asyncio
+async def test_get_page_with_sparse_fields(supabase, database):
+    """A fieldset narrows the select and the returned models, keeping cursor keys."""
+    [row] = database.insert("tickets", [make_ticket_row()])
+    filters = TicketFilters(size=1)
+
+    tickets, _ = await TicketModel(supabase).get_page(filters, CountStrategy.NONE, ("id", "title"))
+
+    assert supabase.queries[0].columns == "id, title, priority, created_at"
+    assert not hasattr(tickets[0], "description")
+    assert tickets[0].model_dump(include={"id", "title"}) == {"id": row["id"], "title": "Test Ticket"}
+    assert TicketModel.next_cursor(tickets, 1) is not None
+
+
+def test_parse_fields_rejects_unknown_fields():
+    """Fieldsets come back in declaration order; unknown names are a 400."""
+    assert parse_fields("project_title, title,id", TicketWithProject) == ("title", "id", "project_title")
+    assert parse_fields(None, TicketWithProject) is None
+    with pytest.raises(HTTPException) as error:
+        parse_fields("title,search_vector", TicketWithProject)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_count_with_user_filters(supabase, database):
+    """Counting with assignee and creator filters no longer raises."""
+    database.insert("tickets", [
+        make_ticket_row(1, assigned_to_id="user-1", created_by_id="user-2"),
+        make_ticket_row(2, assigned_to_id="user-1"),
+        make_ticket_row(3, created_by_id="user-2"),
+    ])
+    filters = TicketFilters(assigned_to_ids=["user-1"], created_by_ids=["user-2"])
+    assert await TicketModel(supabase).count_with_filters(filters) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_uses_ranked_search_function(supabase, database):
+    """Search goes through the indexed search_tickets function with the list filters."""
+    database.insert("tickets", [make_ticket_row(n) for n in range(10)] + [make_ticket_row(10, status="done")])
+    filters = TicketFilters(search="ticket", statuses=[Status.OPEN], page=2, size=5)
+
+    results = await TicketModel(supabase).search(filters)
+
+    [(fn, params)] = supabase.rpcs
+    assert fn == "search_tickets"
+    assert params["search_query"] == "ticket"
+    assert params["filter_statuses"] == ["open"]
+    assert params["result_offset"] == 5
+    assert len(results) == 5
+    assert results[0].project_title == "Project"
+    assert results[0].title_highlight == "Test <mark>Ticket</mark>"
+
+
+@pytest.mark.asyncio
+async def test_changes_resume_after_last_row_when_full(supabase, database):
+    """A full list resumes from its last row and reports more to come."""
+    changed, removed, _ = database.insert("tickets", [make_ticket_row(1), make_ticket_row(2), make_ticket_row(3)])
+    database.delete("tickets", [Filter("id", "eq", removed["id"])], [])
+    tombstone = database.table("ticket_deletions").get(removed["id"])
+    model = TicketModel(supabase)
+    until = datetime.now(timezone.utc).isoformat()
+    since = dict(model.initial_watermark(until), deleted_at="2025-01-01T00:00:00+00:00")
+
+    tickets, deleted, watermark, has_more = await model.get_changes(since, until, 1)
+
+    assert supabase.round_trips == 2
+    assert [(t.id, t.project_title) for t in tickets] == [(changed["id"], "Project")]
+    assert [d.id for d in deleted] == [removed["id"]]
+    assert has_more
+    assert watermark == {
+        "updated_at": changed["updated_at"].isoformat(),
+        "id": changed["id"],
+        "deleted_at": tombstone["deleted_at"].isoformat(),
+        "ticket_id": removed["id"],
+    }
+    [query] = supabase.queries_of("tickets")
+    assert any(f.column == "updated_at" and f.operator == "lte" for f in query.filters)
+
+
+@pytest.mark.asyncio
+async def test_changes_advance_watermark_to_horizon_when_caught_up(supabase):
+    """Once caught up, the watermark moves to the horizon so old rows are not rescanned."""
+    model = TicketModel(supabase)
+    until = datetime.now(timezone.utc).isoformat()
+    since = dict(model.initial_watermark(until), deleted_at="2025-01-01T00:00:00+00:00")
+
+    _, _, watermark, has_more = await model.get_changes(since, until, 100)
+
+    assert not has_more
+    assert watermark == {"updated_at": until, "id": MAX_UUID, "deleted_at": until, "ticket_id": MAX_UUID}
+
+
+@pytest.mark.asyncio
+async def test_project_lookups_are_cached(supabase):
+    """Repeated project lookups and lists are served from memory."""
+    model = ProjectModel(supabase)
+
+    await model.get_all(1, 100)
+    project = await model.get_by_id(PROJECT_ID)
+    await model.get_all(1, 100)
+
+    assert project.title == "Project"
+    assert supabase.round_trips == 1
+    assert ProjectModel.cache_stats()["by_id"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_project_writes_invalidate_cache(supabase):
+    """Updating a project refreshes its entry and drops cached lists."""
+    model = ProjectModel(supabase)
+
+    await model.get_all(1, 100)
+    await model.update(PROJECT_ID, ProjectUpdate(title="Renamed"))
+
+    assert (await model.get_by_id(PROJECT_ID)).title == "Renamed"
+    assert (await model.get_all(1, 100))[0].title == "Renamed"
+    assert supabase.round_trips == 3
+
+
+@pytest.mark.asyncio
+async def test_search_filter_keeps_real_queries_chainable():
+    """Search pages and exports build on postgrest-py's own builder, not just on fakes."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[], headers={"Content-Range": "*/0"})
+
+    http_client = httpx.AsyncClient(base_url="http://postgrest.test", transport=httpx.MockTransport(handler))
+    client = AsyncPostgrestClient("http://postgrest.test", http_client=http_client)
+    model = TicketModel(SimpleNamespace(table=client.from_))
+    filters = TicketFilters(search="websocket reconnect", statuses=[Status.OPEN])
+
+    assert await model.get_page(filters) == ([], 0)
+    assert [batch async for batch in model.iter_for_export(100, filters, ["id", "title"])] == []
+
+    for request in requests:
+        assert request.url.params["search_vector"] == "wfts(english).websocket reconnect"
+        assert request.url.params["status"] == "in.(open)"
+    assert "limit" in requests[0].url.params and "order" in requests[1].url.params
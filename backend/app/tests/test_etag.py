@@ -0,0 +1,98 @@
+"""
+Tests for conditional GETs with ETags.
+"""
+
+from datetime import datetime, timezone
+
+from app.core.etag import version_etag
+from app.core.memory import Filter
+from app.models.project import ProjectModel
+from app.tests.conftest import PROJECT_ID
+
+
+def test_list_returns_304_until_the_table_changes(client, supabase, database):
+    """A matching If-None-Match skips the list query; a write changes the ETag."""
+    first = client.get("/api/v1/projects/?size=10")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    supabase.reset()
+    cached = client.get("/api/v1/projects/?size=10", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert supabase.round_trips == 1
+
+    other_page = client.get("/api/v1/projects/?size=20", headers={"If-None-Match": etag})
+    assert other_page.status_code == 200
+
+    database.update("projects", [Filter("id", "eq", PROJECT_ID)], [], {"title": "Renamed"})
+    changed = client.get("/api/v1/projects/?size=10", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["projects"][0]["title"] == "Renamed"
+
+
+def test_detail_etag_follows_updated_at(client, database):
+    """Detail ETags come from the row's updated_at."""
+    etag = client.get(f"/api/v1/projects/{PROJECT_ID}").headers["etag"]
+
+    assert client.get(f"/api/v1/projects/{PROJECT_ID}", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    ProjectModel.invalidate()
+    database.update("projects", [Filter("id", "eq", PROJECT_ID)], [], {"description": "Changed"})
+    response = client.get(f"/api/v1/projects/{PROJECT_ID}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_sparse_fieldsets_keep_etags(client):
+    """A fieldset response holds only the requested fields and still revalidates."""
+    response = client.get("/api/v1/projects/?fields=title,id")
+    assert response.json()["projects"] == [{"id": PROJECT_ID, "title": "Project"}]
+    etag = response.headers["etag"]
+    assert etag != client.get("/api/v1/projects/").headers["etag"]
+    assert client.get("/api/v1/projects/?fields=title,id", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/v1/projects/?fields=nope").status_code == 400
+
+
+def test_conditional_update_needs_matching_if_match(client, supabase, database):
+    """Writes are one round trip; a stale If-Match gets 412, a missing row 404."""
+    etag = client.get(f"/api/v1/projects/{PROJECT_ID}").headers["etag"]
+
+    ProjectModel.invalidate()
+    supabase.reset()
+    updated = client.put(f"/api/v1/projects/{PROJECT_ID}", json={"title": "Renamed"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert supabase.round_trips == 1
+    assert updated.json()["description"] == "Description"
+    assert updated.headers["etag"] != etag
+
+    stale = client.put(f"/api/v1/projects/{PROJECT_ID}", json={"title": "Lost"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.delete(f"/api/v1/projects/{PROJECT_ID}", headers={"If-Match": etag}).status_code == 412
+    assert database.table("projects").get(PROJECT_ID)["title"] == "Renamed"
+
+    assert client.delete(f"/api/v1/projects/{PROJECT_ID}", headers={"If-Match": updated.headers["etag"]}).status_code == 200
+    assert client.put(f"/api/v1/projects/{PROJECT_ID}", json={"title": "Gone"}).status_code == 404
+
+
+def test_ticket_update_can_clear_assignee(client, database):
+    """Explicit nulls clear nullable columns; omitted fields stay unchanged."""
+    database.insert("tickets", [{
+        "id": "ticket-1", "project_id": PROJECT_ID, "title": "Ticket", "description": "Description",
+        "assigned_to_id": "user-1", "assigned_to_name": "Ann", "created_by_id": "user-123", "created_by_name": "Test User",
+    }])
+    response = client.put("/api/v1/tickets/ticket-1", json={"assigned_to_id": None, "assigned_to_name": None, "title": None})
+    assert response.status_code == 200
+    assert response.json()["assigned_to_id"] is None
+    assert response.json()["title"] == "Ticket"
+
+
+def test_user_etag_is_a_row_version(client, database):
+    """User ETags use the same row-version format If-Match expects."""
+    database.insert("users", [{
+        "id": "user-1", "email": "ann@example.com", "name": "Ann", "updated_at": "2024-01-01T00:00:00+00:00",
+    }])
+    response = client.get("/api/v1/users/user-1")
+    assert response.headers["etag"] == version_etag(datetime(2024, 1, 1, tzinfo=timezone.utc))
@@ -0,0 +1,185 @@
+"""
+Tests for the streaming ticket exports.
+"""
+
+import csv
+import io
+import os
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from app.core.config import settings
+from app.schemas.base import ExportFormat, Status
+from app.schemas.ticket import TicketFilters
+from app.services.database import get_database_service
+from app.services.export import LEGACY_CSV_HEADERS, stream_tickets
+from app.tests.conftest import PROJECT_ID
+
+
+def make_row(n, priority=2):
+    return {
+        "id": f"00000000-0000-0000-0000-00000000000{n}",
+        "title": f"Ticket {n}",
+        "description": "Line one\nline, two",
+        "project_id": PROJECT_ID,
+        "status": "open",
+        "priority": priority,
+        "assigned_to_name": None,
+        "created_by_id": "user-123",
+        "created_by_name": "Test User",
+        "created_at": f"2025-01-0{n}T00:00:00+00:00",
+        "updated_at": f"2025-01-0{n}T00:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def tickets(database):
+    """Three tickets; exports order them as 2, 1, 3 (priority, then newest first)."""
+    database.insert("tickets", [make_row(1), make_row(2), make_row(3, priority=3)])
+
+
+@pytest.mark.asyncio
+async def test_legacy_csv_pages_with_keyset(supabase, tickets, monkeypatch):
+    """Rows are streamed batch by batch, each batch continuing after the last row."""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    db_service = get_database_service(supabase)
+
+    chunks = [
+        chunk async for chunk in
+        stream_tickets(db_service, ExportFormat.CSV, None, tuple(LEGACY_CSV_HEADERS), LEGACY_CSV_HEADERS)
+    ]
+
+    # Header chunk is sent before any query, then one chunk per batch
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == list(LEGACY_CSV_HEADERS.values())
+    assert [row[1] for row in rows[1:]] == ["Ticket 2", "Ticket 1", "Ticket 3"]
+    assert rows[1][2] == "Line one\nline, two"
+    assert rows[3][7] == "HIGH"
+
+    first, second = supabase.queries_of("tickets")
+    assert "priority_name" not in first.columns
+    assert not first.predicates and len(second.predicates) == 1
+
+
+async def export_bytes(supabase, export_format, filters=None, **kwargs):
+    db_service = get_database_service(supabase)
+    return b"".join([chunk async for chunk in stream_tickets(db_service, export_format, filters, **kwargs)])
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_is_typed_and_grouped(supabase, tickets, monkeypatch):
+    """Parquet files carry typed columns, in row groups across database batches."""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "EXPORT_ROW_GROUP_SIZE", 2)
+
+    data = await export_bytes(supabase, ExportFormat.PARQUET)
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.num_row_groups == 2
+    table = parquet.read()
+    assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+    assert table.column("priority").to_pylist() == [2, 2, 3]
+    assert table.column("project_title").to_pylist() == ["Project"] * 3
+
+
+@pytest.mark.asyncio
+async def test_export_selects_only_requested_columns(supabase, database, tickets):
+    """Column selection narrows the query and the file; filters reach the query."""
+    database.insert("tickets", [dict(make_row(4), status="done")])
+    filters = TicketFilters(statuses=[Status.OPEN])
+
+    data = await export_bytes(supabase, ExportFormat.ARROW, filters, columns=("id", "created_at"))
+
+    table = pa.ipc.open_stream(data).read_all()
+    assert table.column_names == ["id", "created_at"]
+    assert table.num_rows == 3
+    [query] = supabase.queries_of("tickets")
+    assert "projects(title)" not in query.columns
+    assert "description" not in query.columns
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_writes_one_object_per_line(supabase, tickets):
+    """NDJSON exports hold one JSON object per ticket."""
+    data = await export_bytes(supabase, ExportFormat.NDJSON, columns=("title", "project_title"))
+
+    lines = [orjson.loads(line) for line in data.splitlines()]
+    assert lines == [
+        {"title": "Ticket 2", "project_title": "Project"},
+        {"title": "Ticket 1", "project_title": "Project"},
+        {"title": "Ticket 3", "project_title": "Project"},
+    ]
+
+
+@pytest.fixture
+def job_client(client, tickets, tmp_path, monkeypatch):
+    from app.services.export_jobs import export_jobs
+
+    monkeypatch.setattr(export_jobs, "directory", str(tmp_path))
+    # Entered, so job tasks keep running on one event loop between requests
+    with client:
+        yield client
+
+
+def wait_for_job(client, job_id):
+    import time
+    for _ in range(100):
+        job = client.get(f"/api/v1/export/jobs/{job_id}").json()
+        if job["status"] != "running":
+            return job
+        time.sleep(0.02)
+    raise AssertionError("export job did not finish")
+
+
+def test_export_job_spools_file_and_resumes_download(job_client, supabase, database):
+    """Jobs report progress, downloads honour Range, and finished files are reused."""
+    client = job_client
+    started = client.post("/api/v1/export/jobs", json={"format": "ndjson", "columns": ["id", "title"]})
+    assert started.status_code == 202
+    job = wait_for_job(client, started.json()["id"])
+    assert job["status"] == "done"
+    assert job["rows_written"] == job["total_rows"] == 3
+
+    download = client.get(f"/api/v1/export/jobs/{job['id']}/download")
+    assert download.status_code == 200
+    assert len(download.content.splitlines()) == 3
+    resumed = client.get(f"/api/v1/export/jobs/{job['id']}/download", headers={"Range": "bytes=10-"})
+    assert resumed.status_code == 206
+    assert resumed.content == download.content[10:]
+
+    supabase.reset()
+    again = client.post("/api/v1/export/jobs", json={"format": "ndjson", "columns": ["id", "title"]})
+    assert again.status_code == 200
+    assert again.json()["id"] == job["id"]
+    assert supabase.queries_of("tickets") == []
+
+    database.insert("tickets", [make_row(4)])
+    changed = client.post("/api/v1/export/jobs", json={"format": "ndjson", "columns": ["id", "title"]})
+    assert changed.json()["id"] != job["id"]
+    assert client.post("/api/v1/export/jobs", json={"columns": ["nope"]}).status_code == 400
+
+
+def test_stale_job_is_discarded_once(tmp_path):
+    """Of two workers reclaiming a stale job, the later one leaves the fresh claim alone."""
+    from datetime import datetime, timezone
+    from app.schemas.export import ExportJob, ExportJobStatus
+    from app.services.export_jobs import ExportJobStore
+
+    store = ExportJobStore(str(tmp_path))
+    now = datetime.now(timezone.utc)
+    job = ExportJob(id="abc123", status=ExportJobStatus.FAILED, format=ExportFormat.NDJSON, columns=["id"],
+                    filters=TicketFilters(), created_at=now, updated_at=now)
+    assert store.claim(job)
+
+    store.discard_stale(job.id)
+    assert store.load(job.id) is None
+    job.status = ExportJobStatus.RUNNING
+    assert store.claim(job)
+
+    # A second worker that also judged the failed job stale comes too late
+    store.discard_stale(job.id)
+    assert store.load(job.id).status == ExportJobStatus.RUNNING
+    assert sorted(os.listdir(tmp_path)) == ["abc123.json"]
@@ -0,0 +1,289 @@
+"""
+Tests for the smart creation pipeline.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from app.core.config import settings
+from app.core.tfidf import TfidfIndex
+from app.models.project import ProjectModel
+from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.database import get_database_service
+from app.services.llm import LLMService
+from app.tests.conftest import PROJECT_ID
+
+
+def row_ids(database, table):
+    return [row["id"] for row in database.table(table).rows.values()]
+
+
+TOOL_CALLS = [
+    ("create_project", {"title": "Website Redesign", "description": "New marketing site"}),
+    ("create_ticket", {"title": "Wireframes", "description": "Draw them", "project_id": "Website Redesign"}),
+    ("create_ticket", {"title": "Copy", "description": "Write it", "project_id": "website redesign", "priority": 3}),
+    ("create_ticket", {"title": "Fix login", "description": "Broken", "project_id": PROJECT_ID}),
+    ("create_ticket", {"title": "Default project", "description": "Uses the provided project"}),
+]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_written_with_bulk_inserts(supabase):
+    """New projects and all tickets are created with one insert each."""
+    service = LLMService(supabase, "user-123", "Test User")
+
+    projects, tickets = await service.execute_tool_calls(TOOL_CALLS, PROJECT_ID)
+
+    # One lookup for the existing project, one project insert, one ticket insert
+    assert supabase.round_trips == 3
+    assert [p.title for p in projects] == ["Website Redesign"]
+    new_id = projects[0].id
+    assert [t.project_id for t in tickets] == [new_id, new_id, PROJECT_ID, PROJECT_ID]
+    assert tickets[1].priority == 3
+
+
+@pytest.mark.asyncio
+async def test_unknown_project_fails_before_writing(supabase, database):
+    """A ticket for a project that does not exist aborts the whole request."""
+    service = LLMService(supabase, "user-123", "Test User")
+    calls = TOOL_CALLS + [("create_ticket", {"title": "Lost", "description": "x", "project_id": "Nowhere"})]
+
+    with pytest.raises(Exception, match="Unknown project"):
+        await service.execute_tool_calls(calls, PROJECT_ID)
+    assert row_ids(database, "projects") == [PROJECT_ID]
+    assert row_ids(database, "tickets") == []
+
+
+@pytest.mark.asyncio
+async def test_ticket_insert_failure_rolls_back_new_projects(supabase, database):
+    """If the ticket insert fails, projects created for it are deleted again."""
+    service = LLMService(supabase, "user-123", "Test User")
+
+    async def fail(*args, **kwargs):
+        raise Exception("insert failed")
+
+    service.db_service.tickets.create_many = fail
+
+    with pytest.raises(Exception, match="insert failed"):
+        await service.execute_tool_calls(TOOL_CALLS, PROJECT_ID)
+    assert row_ids(database, "projects") == [PROJECT_ID]
+
+
+@pytest.mark.asyncio
+async def test_resubmission_skips_llm(supabase, database, monkeypatch):
+    """A dry run and a resubmission of the same text reuse the parsed tool calls."""
+    LLMService.tool_call_cache.clear()
+    llm_calls = []
+
+    async def fake_get_tool_calls(self, messages):
+        llm_calls.append(messages)
+        return TOOL_CALLS
+
+    monkeypatch.setattr(LLMService, "get_tool_calls", fake_get_tool_calls)
+
+    preview = await LLMService(supabase, "user-123", "Test User").process_text(
+        "Redesign the website", PROJECT_ID, dry_run=True
+    )
+    assert preview["cached"] is False
+    assert [p.title for p in preview["planned_projects"]] == ["Website Redesign"]
+    assert preview["planned_tickets"][0].project_id == "Website Redesign"
+    assert row_ids(database, "tickets") == []
+
+    result = await LLMService(supabase, "user-123", "Test User").process_text(
+        "  redesign   the Website ", PROJECT_ID
+    )
+    assert result["cached"] is True
+    assert len(result["created_tickets"]) == 4
+    assert len(llm_calls) == 1
+    LLMService.tool_call_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_invalid_plan_is_not_cached(supabase, monkeypatch):
+    """A plan that fails validation is not reused; the next attempt asks the LLM again."""
+    LLMService.tool_call_cache.clear()
+    plans = [[("create_ticket", {"title": "Lost", "description": "x", "project_id": "Nowhere"})], TOOL_CALLS]
+
+    async def fake_get_tool_calls(self, messages):
+        return plans.pop(0)
+
+    monkeypatch.setattr(LLMService, "get_tool_calls", fake_get_tool_calls)
+    service = LLMService(supabase, "user-123", "Test User")
+
+    with pytest.raises(Exception, match="Unknown project"):
+        await service.process_text("Redesign the website", PROJECT_ID)
+    result = await service.process_text("Redesign the website", PROJECT_ID)
+    assert result["cached"] is False
+    assert len(result["created_tickets"]) == 4
+    LLMService.tool_call_cache.clear()
+
+
+def tool_chunk(index, name=None, arguments=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    delta = SimpleNamespace(tool_calls=[SimpleNamespace(index=index, function=function)])
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeCompletions:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"] is True
+        return FakeStream(self.chunks)
+
+
+@pytest.mark.asyncio
+async def test_stream_text_emits_progress_then_created_items(supabase):
+    """The stream reports LLM progress, then each created project and ticket."""
+    LLMService.tool_call_cache.clear()
+    service = LLMService(supabase, "user-123", "Test User")
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions([
+        tool_chunk(0, "create_project", '{"title": "Website Redesign", '),
+        tool_chunk(0, None, '"description": "New marketing site"}'),
+        tool_chunk(1, "create_ticket", '{"title": "Wireframes", "description": "Draw them", '),
+        tool_chunk(1, None, '"project_id": "Website Redesign"}'),
+    ])))
+
+    events = [(event, payload) async for event, payload in service.stream_text("Redesign the website")]
+
+    names = [event for event, _ in events]
+    assert names == ["start", "progress", "progress", "project", "ticket", "done"]
+    assert events[2][1] == {"chunks": 3, "tool_calls": 2}
+    project, ticket = events[3][1], events[4][1]
+    assert project.title == "Website Redesign"
+    assert ticket.project_id == project.id
+    LLMService.tool_call_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_stream_text_dry_run_writes_nothing(supabase, database, monkeypatch):
+    """A streamed dry run reports the planned items without inserting them."""
+    LLMService.tool_call_cache.clear()
+
+    async def fake_stream_tool_calls(self, messages):
+        yield "tool_calls", TOOL_CALLS
+
+    monkeypatch.setattr(LLMService, "stream_tool_calls", fake_stream_tool_calls)
+    service = LLMService(supabase, "user-123", "Test User")
+
+    events = [
+        (event, payload)
+        async for event, payload in service.stream_text("Redesign the website", PROJECT_ID, dry_run=True)
+    ]
+
+    names = [event for event, _ in events]
+    assert names == ["start", "planned_project"] + ["planned_ticket"] * 4 + ["done"]
+    assert events[1][1].title == "Website Redesign"
+    assert row_ids(database, "projects") == [PROJECT_ID]
+    assert row_ids(database, "tickets") == []
+    LLMService.tool_call_cache.clear()
+
+
+def seed_projects(database, count):
+    """Insert ``count`` projects on assorted topics, oldest first."""
+    topics = ["billing", "search", "onboarding", "analytics", "mobile", "payments", "infra", "docs"]
+    return database.insert("projects", [{
+        "title": f"{topics[n % len(topics)].title()} workstream {n}",
+        "description": f"Everything related to {topics[n % len(topics)]} for team {n}",
+        "created_by_id": "user-123",
+        "created_by_name": "Test User",
+    } for n in range(count)])
+
+
+@pytest.mark.asyncio
+async def test_prompt_only_includes_relevant_projects(supabase, database):
+    """The prompt carries the top matches and the provided project, not every project."""
+    seed_projects(database, 200)
+    service = LLMService(supabase, "user-123", "Test User")
+    text = "Add retries to the payments webhook and alert on payments failures"
+
+    projects = await service.get_context_projects(text, PROJECT_ID)
+
+    assert projects[0].id == PROJECT_ID
+    assert len(projects) == settings.SMART_CREATE_CONTEXT_PROJECTS
+    assert all("Payments" in p.title for p in projects[1:])
+
+    everything = await service.db_service.projects.get_all(1, 100)
+    relevant_size = len(service.build_messages(text, PROJECT_ID, projects)[0]["content"])
+    full_size = len(service.build_messages(text, PROJECT_ID, everything)[0]["content"])
+    assert relevant_size * 4 < full_size
+
+
+@pytest.mark.asyncio
+async def test_relevance_index_follows_project_writes(supabase):
+    """Projects created, renamed or deleted through the model are re-ranked without a reload."""
+    model = get_database_service(supabase).projects
+    await model.get_relevant("kubernetes upgrade", 5)
+    assert ProjectModel.index.search("kubernetes upgrade", 5) == []
+
+    created = await model.create(ProjectCreate(title="Kubernetes", description="Cluster upgrade"), "user-123", "Test User")
+    assert ProjectModel.index.search("kubernetes upgrade", 5) == [created.id]
+
+    await model.update(created.id, ProjectUpdate(title="Platform", description="Cluster work"))
+    assert ProjectModel.index.search("kubernetes", 5) == []
+    assert [p.title for p in await model.get_relevant("platform", 1)] == ["Platform"]
+
+    await model.delete(created.id)
+    assert ProjectModel.index.search("platform", 5) == []
+    assert supabase.round_trips == 4
+
+
+@pytest.mark.asyncio
+async def test_relevant_projects_fall_back_to_recent_ones(supabase, database):
+    """With too few matches, the newest projects fill the context, loaded only once."""
+    newest = seed_projects(database, 3)[-1]
+    model = get_database_service(supabase).projects
+    get_all = model.get_all
+
+    async def slow_get_all(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return await get_all(*args, **kwargs)
+
+    model.get_all = slow_get_all
+
+    results = await asyncio.gather(*(model.get_relevant("fix the login bug", 2) for _ in range(5)))
+
+    assert all(len(projects) == 2 for projects in results)
+    assert results[0][0].id == newest["id"]
+    assert supabase.round_trips == 1
+
+
+def test_tfidf_ranks_rare_terms_higher():
+    """Rare terms outweigh terms every document shares."""
+    index = TfidfIndex()
+    index.add("a", "team backend api")
+    index.add("b", "team frontend dashboard")
+    index.add("c", "team backend database migrations")
+
+    assert index.search("team dashboard", 3)[0] == "b"
+    assert index.search("backend migrations", 3) == ["c", "a"]
+    assert index.search("backend migrations", 1) == ["c"]
+
+    index.remove("c")
+    assert index.search("backend migrations", 3) == ["a"]
+
+
+def test_tfidf_index_grows_with_terms_not_documents_times_vocabulary():
+    """Many documents with distinct vocabularies index and search quickly."""
+    index = TfidfIndex()
+    for i in range(20000):
+        index.add(f"p{i}", f"shared alpha{i} beta{i}")
+
+    start = time.perf_counter()
+    assert index.search("beta123 shared", 2) == ["p123", "p0"]
+    assert time.perf_counter() - start < 2.0
@@ -0,0 +1,212 @@
+import orjson
+import pytest
+
+from app.core.database import get_supabase
+from app.core.memory import MemoryClient, MemoryDatabase
+from app.core.tracing import TracedSupabase
+from app.schemas.base import Priority, Status
+from app.schemas.project import ProjectCreate
+from app.schemas.ticket import TicketCreate, TicketFilters, TicketUpdate
+from app.services.database import DatabaseService
+
+
+USER_ID = "00000000-0000-4000-8000-000000000001"
+
+
+async def seed(db_service: DatabaseService, tickets: int = 30):
+    projects = await db_service.projects.create_many(
+        [ProjectCreate(title=f"Project {i}", description="Seeded") for i in range(2)], USER_ID, "Tester"
+    )
+    created = await db_service.tickets.create_many([
+        TicketCreate(
+            title=f"Ticket {i} websocket" if i % 3 == 0 else f"Ticket {i}",
+            description="Board stops refreshing after sleep",
+            project_id=projects[i % 2].id,
+            priority=Priority(i % 3 + 1),
+            status=Status.DONE if i % 5 == 0 else Status.OPEN,
+        )
+        for i in range(tickets)
+    ], USER_ID, "Tester")
+    return projects, created
+
+
+@pytest.mark.asyncio
+async def test_get_supabase_selects_the_memory_backend(client, supabase):
+    """SUPABASE_BACKEND=memory makes get_supabase return the in-memory client."""
+    traced_client = await get_supabase()
+    assert isinstance(traced_client, TracedSupabase)
+    assert traced_client._client is supabase
+
+
+@pytest.mark.asyncio
+async def test_ticket_pages_filter_count_and_page_by_cursor():
+    """Filtered pages match a direct count, and cursor pages visit every ticket once."""
+    db_service = DatabaseService(MemoryClient(MemoryDatabase()))
+    projects, created = await seed(db_service)
+
+    filters = TicketFilters(project_ids=[projects[0].id], statuses=[Status.OPEN], size=100)
+    tickets, total = await db_service.tickets.get_page(filters)
+    expected = [t for t in created if t.project_id == projects[0].id and t.status == Status.OPEN]
+    assert total == len(expected) == len(tickets)
+    assert {t.project_title for t in tickets} == {"Project 0"}
+    keys = [(t.priority.value, -t.created_at.timestamp()) for t in tickets]
+    assert keys == sorted(keys)
+
+    seen, cursor = [], None
+    while True:
+        page, _ = await db_service.tickets.get_page(TicketFilters(size=7, cursor=cursor))
+        seen.extend(t.id for t in page)
+        cursor = db_service.tickets.next_cursor(page, 7)
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(t.id for t in created)
+
+
+@pytest.mark.asyncio
+async def test_conditional_writes_and_delete_side_effects():
+    """Stale versions are refused; deletes leave tombstones and adjust ticket counts."""
+    database = MemoryDatabase()
+    db_service = DatabaseService(MemoryClient(database))
+    projects, created = await seed(db_service, tickets=4)
+    ticket = created[0]
+    before = await db_service.table_versions("tickets")
+
+    assert await db_service.tickets.update(ticket.id, TicketUpdate(title="Stale"), [ticket.created_at.replace(year=2000)]) is None
+    updated = await db_service.tickets.update(ticket.id, TicketUpdate(title="Renamed"), [ticket.updated_at])
+    assert updated.title == "Renamed"
+    assert updated.updated_at > ticket.updated_at
+    assert (await db_service.table_versions("tickets"))["tickets"] == before["tickets"] + 1
+
+    assert await db_service.projects.delete(projects[0].id)
+    assert await db_service.tickets.get_by_id(ticket.id) is None
+    tombstones = database.table("ticket_deletions")
+    assert {row["ticket_id"] for row in tombstones.rows.values()} == {t.id for t in created if t.project_id == projects[0].id}
+
+    stats = await db_service.stats.get_stats()
+    assert stats.total == 2
+    assert [p.project_id for p in stats.projects] == [projects[1].id]
+
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_no_trace():
+    """A bulk insert that fails on any row writes nothing, as in Postgres."""
+    database = MemoryDatabase()
+    db_service = DatabaseService(MemoryClient(database))
+    projects, created = await seed(db_service, tickets=4)
+    events = []
+    database.listeners.append(lambda *event: events.append(event))
+    versions = await db_service.table_versions("tickets")
+    counts = {key: dict(row) for key, row in database.ticket_counts.items()}
+
+    batch = [
+        TicketCreate(title="Good", description="Fine", project_id=projects[0].id),
+        TicketCreate(title="Orphan", description="No project", project_id="33333333-3333-4333-8333-333333333333"),
+    ]
+    with pytest.raises(Exception):
+        await db_service.tickets.create_many(batch, USER_ID, "Tester")
+    duplicate = {"id": created[0].id, "project_id": projects[1].id, "title": "Copy", "description": "Again"}
+    with pytest.raises(Exception, match="duplicate key"):
+        await MemoryClient(database).table("tickets").insert(duplicate).execute()
+
+    assert len(database.table("tickets")) == 4
+    assert {key: dict(row) for key, row in database.ticket_counts.items()} == counts
+    assert await db_service.table_versions("tickets") == versions
+    assert events == []
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_highlights():
+    db_service = DatabaseService(MemoryClient(MemoryDatabase()))
+    await seed(db_service, tickets=9)
+
+    results = await db_service.tickets.search(TicketFilters(search="websocket", size=10))
+    assert len(results) == 3
+    assert all("<mark>websocket</mark>" in r.title_highlight for r in results)
+
+
+@pytest.mark.asyncio
+async def test_fixtures_are_loaded(tmp_path):
+    """A fixtures file seeds the tables, with counts and versions derived as the triggers would."""
+    project_id = "11111111-1111-4111-8111-111111111111"
+    fixtures = tmp_path / "fixtures.json"
+    fixtures.write_bytes(orjson.dumps({
+        "tickets": [{
+            "id": "22222222-2222-4222-8222-222222222222", "project_id": project_id, "title": "Seeded",
+            "description": "From a file", "created_by_id": USER_ID, "created_by_name": "Tester",
+            "status": "open", "priority": 3,
+        }],
+        "projects": [{
+            "id": project_id, "title": "Seeded", "description": "From a file",
+            "created_by_id": USER_ID, "created_by_name": "Tester",
+        }],
+        "users": [{"id": USER_ID, "email": "test@example.com", "name": "Tester"}],
+    }))
+    db_service = DatabaseService(MemoryClient(MemoryDatabase.load(str(fixtures))))
+
+    assert (await db_service.users.get_by_email("test@example.com")).name == "Tester"
+    assert (await db_service.stats.get_project_counts([project_id]))[project_id].total == 1
+    assert await db_service.table_versions("projects", "tickets") == {"projects": 1, "tickets": 1}
+
+
+def test_api_runs_against_the_memory_backend(client):
+    """Create, list, update and export through the API with no Supabase project."""
+    project = client.post("/api/v1/projects/", json={"title": "Local", "description": "In memory"}).json()
+    ticket = client.post("/api/v1/tickets/", json={
+        "title": "First", "description": "In memory", "project_id": project["id"], "priority": 3,
+    })
+    assert ticket.status_code == 200
+
+    listing = client.get(f"/api/v1/tickets/?project_ids={project['id']}").json()
+    assert [t["title"] for t in listing["tickets"]] == ["First"]
+    assert listing["total"] == 1
+
+    etag = client.get(f"/api/v1/tickets/{ticket.json()['id']}").headers["etag"]
+    updated = client.put(f"/api/v1/tickets/{ticket.json()['id']}", json={"status": "done"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    stale = client.put(f"/api/v1/tickets/{ticket.json()['id']}", json={"status": "open"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+
+    export = client.get("/api/v1/export/tickets?format=ndjson")
+    assert [orjson.loads(line)["status"] for line in export.text.splitlines()] == ["done"]
+
+
+@pytest.mark.asyncio
+async def test_writes_are_published_to_the_change_feed(client, database):
+    """With the memory backend, the local change feed sees every write, as Realtime would."""
+    from app.services.realtime import ChangeHub, LocalChangeFeed
+
+    hub = ChangeHub(queue_size=8)
+    feed = LocalChangeFeed(hub)
+    await feed.start()
+    subscriber = hub.subscribe()
+    try:
+        db_service = DatabaseService(await get_supabase())
+        [project, _], [ticket] = await seed(db_service, tickets=1)
+        event = subscriber.queue.get_nowait()
+        assert (event["type"], event["table"], event["id"]) == ("insert", "projects", project.id)
+
+        # Deletes are routed by their tombstone's project, as with Realtime
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        assert await db_service.tickets.delete(ticket.id)
+        assert [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())] == [
+            {"type": "delete", "table": "tickets", "id": ticket.id, "project_id": project.id, "record": None},
+        ]
+    finally:
+        await feed.stop()
+    assert database.listeners == []
+
+
+@pytest.mark.asyncio
+async def test_query_stages_match_postgrest():
+    """Each builder stage offers only what postgrest-py's does."""
+    database = MemoryDatabase()
+    db_service = DatabaseService(MemoryClient(database))
+    await seed(db_service, tickets=6)
+    tickets = MemoryClient(database).table
+
+    search = tickets("tickets").select("id").text_search("search_vector", "websocket")
+    assert not hasattr(search, "order") and not hasattr(search, "range")
+    assert len((await search.eq("status", "open").execute()).data) == 1
+    assert not hasattr(tickets("tickets").insert({"title": "x"}), "eq")
+    assert not hasattr(tickets("tickets").update({"title": "x"}), "order")
@@ -0,0 +1,93 @@
+"""
+Tests for Prometheus metrics.
+"""
+
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import instrument_http_client, record_llm_usage, route_template, upstream_target
+from app.main import app
+from app.models.project import ProjectModel
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_labelled_by_route_template():
+    """Latency is recorded per route template, never per raw path."""
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/tickets/123", "root_path": ""}
+    assert route_template(app, scope) == "/api/v1/tickets/{ticket_id}"
+    assert route_template(app, dict(scope, path="/wp-login.php")) == "unmatched"
+
+    before = sample("bradboard_http_request_duration_seconds_count", method="GET", route="/health", status="200")
+    client = TestClient(app)
+    client.get("/health")
+    body = client.get("/metrics").text
+
+    assert sample("bradboard_http_request_duration_seconds_count", method="GET", route="/health", status="200") == before + 1
+    assert "bradboard_http_requests_in_flight" in body
+
+
+@pytest.mark.asyncio
+async def test_upstream_calls_are_timed_by_target():
+    """Supabase tables, Supabase auth and OpenAI get their own series."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    instrument_http_client(instrument_http_client(client))
+    labels = {"target": "supabase:tickets", "method": "GET", "status": "200"}
+    before = sample("bradboard_upstream_request_duration_seconds_count", **labels)
+
+    await client.get("https://example.supabase.co/rest/v1/tickets?select=*")
+
+    assert sample("bradboard_upstream_request_duration_seconds_count", **labels) == before + 1
+    assert upstream_target(httpx.URL("https://example.supabase.co/auth/v1/user")) == "supabase:auth"
+    assert upstream_target(httpx.URL("https://api.openai.com/v1/chat/completions")) == "openai"
+
+
+def test_llm_tokens_are_counted():
+    """Prompt and completion tokens are counted per model."""
+    before = sample("bradboard_llm_tokens_total", model="test-model", type="completion")
+    record_llm_usage("test-model", SimpleNamespace(prompt_tokens=100, completion_tokens=20))
+    record_llm_usage("test-model", None)
+    assert sample("bradboard_llm_tokens_total", model="test-model", type="completion") == before + 20
+
+
+def test_project_cache_lookups_are_counted(project_cache):
+    """Hits and misses in the project caches are exported per cache."""
+    hits = sample("bradboard_cache_lookups_total", cache="projects_by_id", result="hit")
+    misses = sample("bradboard_cache_lookups_total", cache="project_lists", result="miss")
+
+    ProjectModel.cache.set("p1", "project")
+    ProjectModel.cache.get("p1")
+    ProjectModel.list_cache.get(("all", 1, 100))
+
+    assert sample("bradboard_cache_lookups_total", cache="projects_by_id", result="hit") == hits + 1
+    assert sample("bradboard_cache_lookups_total", cache="project_lists", result="miss") == misses + 1
+
+
+def test_metrics_aggregate_across_worker_processes(tmp_path):
+    """With a shared multiprocess directory, /metrics sums every worker."""
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    record = (
+        "from types import SimpleNamespace\n"
+        "from app.core.metrics import record_llm_usage\n"
+        "record_llm_usage('test-model', SimpleNamespace(prompt_tokens=5, completion_tokens=1))\n"
+    )
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, cwd=BACKEND_DIR, check=True)
+
+    scrape = "from app.core.metrics import metrics_response\nprint(metrics_response().body.decode())\n"
+    output = subprocess.run(
+        [sys.executable, "-c", scrape], env=env, cwd=BACKEND_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    assert 'bradboard_llm_tokens_total{model="test-model",type="prompt"} 10.0' in output
@@ -0,0 +1,67 @@
+"""
+Tests for keyset pagination cursors.
+"""
+
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models.ticket import TicketModel
+from app.schemas.ticket import Ticket
+
+
+TICKET_KEYS = ("priority", "created_at", "id")
+
+
+def test_cursor_round_trip():
+    """A cursor decodes to the sort keys it was built from."""
+    created_at = datetime(2025, 7, 8, 12, 30, 0, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor({
+        "priority": 2,
+        "created_at": created_at,
+        "id": "123e4567-e89b-12d3-a456-426614174001",
+    })
+    assert decode_cursor(cursor, TICKET_KEYS) == {
+        "priority": 2,
+        "created_at": "2025-07-08T12:30:00.123456+00:00",
+        "id": "123e4567-e89b-12d3-a456-426614174001",
+    }
+
+
+@pytest.mark.parametrize("payload", [
+    {"priority": 1, "created_at": "2025-07-08T12:30:00+00:00", "id": "1,id.gt.0"},
+    {"priority": "1)", "created_at": "2025-07-08T12:30:00+00:00", "id": "123e4567-e89b-12d3-a456-426614174001"},
+    {"created_at": "2025-07-08T12:30:00+00:00", "id": "123e4567-e89b-12d3-a456-426614174001"},
+])
+def test_tampered_cursor_rejected(payload):
+    """Cursors with injected filter syntax or the wrong keys are rejected."""
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, TICKET_KEYS)
+
+
+def test_garbage_cursor_rejected():
+    """A cursor that is not base64 JSON is rejected."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not a cursor!", TICKET_KEYS)
+
+
+def test_ticket_next_cursor():
+    """A full page yields a cursor for its last ticket; a short page ends paging."""
+    ticket = Ticket(
+        id="123e4567-e89b-12d3-a456-426614174001",
+        title="Test Ticket",
+        description="A test ticket description",
+        project_id="123e4567-e89b-12d3-a456-426614174000",
+        priority=3,
+        created_by_id="user-123",
+        created_by_name="Test User",
+        created_at=datetime(2025, 7, 8, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 7, 8, tzinfo=timezone.utc),
+    )
+    assert TicketModel.next_cursor([ticket], size=2) is None
+
+    cursor = TicketModel.next_cursor([ticket, ticket], size=2)
+    assert decode_cursor(cursor, TICKET_KEYS)["priority"] == 3
@@ -0,0 +1,158 @@
+"""
+Tests for real-time change fan-out.
+"""
+
+import time
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.deps import user_cache
+from app.api.v1.endpoints import realtime as realtime_endpoint
+from app.core.config import settings
+from app.services.realtime import RESYNC_EVENT, ChangeHub, LocalChangeFeed, change_hub
+from app.tests.conftest import TOKEN_SECRET, make_token
+
+
+TICKET = {"id": "ticket-1", "project_id": "project-1", "title": "Ticket", "search_vector": "'ticket':1"}
+
+
+def test_local_feed_normalizes_changes():
+    """Events carry the project, strip internal columns and omit deleted rows.
+
+    Ticket deletes come from tombstones, as Realtime's own delete events
+    carry only the primary key.
+    """
+    hub = ChangeHub(queue_size=8)
+    feed = LocalChangeFeed(hub)
+    subscriber = hub.subscribe()
+
+    feed.publish("tickets", "insert", TICKET)
+    feed.publish("tickets", "delete", old_record={"id": "ticket-1"})
+    feed.publish("ticket_deletions", "insert", {"ticket_id": "ticket-1", "project_id": "project-1"})
+    feed.publish("projects", "update", {"id": "project-1", "title": "Project"})
+    feed.publish("users", "update", {"id": "user-1"})
+
+    events = [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+    assert events == [
+        {"type": "insert", "table": "tickets", "id": "ticket-1", "project_id": "project-1",
+         "record": {"id": "ticket-1", "project_id": "project-1", "title": "Ticket"}},
+        {"type": "delete", "table": "tickets", "id": "ticket-1", "project_id": "project-1", "record": None},
+        {"type": "update", "table": "projects", "id": "project-1", "project_id": "project-1",
+         "record": {"id": "project-1", "title": "Project"}},
+    ]
+
+
+def test_hub_filters_by_project():
+    """Subscribers only see their projects' changes; unfiltered ones see all."""
+    hub = ChangeHub(queue_size=8)
+    everything = hub.subscribe()
+    watching = hub.subscribe(["project-1"])
+    other = hub.subscribe(["project-2"])
+
+    assert hub.publish({"type": "update", "project_id": "project-1"}) == 2
+    assert everything.queue.qsize() == 1
+    assert watching.queue.qsize() == 1
+    assert other.queue.qsize() == 0
+
+    hub.unsubscribe(watching)
+    hub.unsubscribe(other)
+    assert len(hub) == 1
+    assert hub._by_project == {}
+
+
+def test_slow_subscriber_gets_resync():
+    """A full queue is replaced by one resync event instead of growing."""
+    hub = ChangeHub(queue_size=3)
+    subscriber = hub.subscribe()
+    for i in range(10):
+        hub.publish({"type": "update", "project_id": "project-1", "id": i})
+
+    assert subscriber.queue.qsize() <= 3
+    assert RESYNC_EVENT in [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+    assert subscriber.dropped > 0
+
+
+def test_idle_subscribers_cost_nothing_per_event():
+    """Fan-out time depends on a project's watchers, not on idle connections."""
+    hub = ChangeHub(queue_size=8)
+    for i in range(5000):
+        hub.subscribe([f"project-{i}"])
+    watchers = [hub.subscribe(["hot"]) for _ in range(10)]
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        assert hub.publish({"type": "update", "project_id": "hot"}) == 10
+        for watcher in watchers:
+            watcher.queue.get_nowait()
+    assert time.perf_counter() - start < 1.0
+
+
+@pytest.fixture
+def local_feed(client, monkeypatch):
+    """A local feed into the app's hub; tokens are verified with TOKEN_SECRET."""
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", TOKEN_SECRET)
+    user_cache.clear()
+    yield LocalChangeFeed(change_hub)
+    user_cache.clear()
+
+
+def test_websocket_pushes_project_changes(client, local_feed):
+    """Connected clients receive changes for the projects they watch."""
+    with client.websocket_connect("/api/v1/ws?project_ids=project-1") as websocket:
+        websocket.send_json({"token": make_token()})
+        assert websocket.receive_json() == {"type": "subscribed"}
+        # Publish on the app's event loop, as the Realtime callback would
+        websocket.portal.call(local_feed.publish, "tickets", "update", {**TICKET, "project_id": "project-2"})
+        websocket.portal.call(local_feed.publish, "tickets", "update", TICKET)
+        event = websocket.receive_json()
+    assert event["id"] == "ticket-1"
+    assert event["project_id"] == "project-1"
+    assert len(change_hub) == 0
+
+
+def test_websocket_rejects_invalid_token(client, local_feed):
+    """Connections whose first message has no valid token are closed."""
+    for message in ({"token": "bad"}, {"access_token": make_token()}):
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/api/v1/ws") as websocket:
+                websocket.send_json(message)
+                websocket.receive_json()
+        assert exc_info.value.code == 1008
+    assert len(change_hub) == 0
+
+
+def test_websocket_closes_without_a_token(client, local_feed, monkeypatch):
+    """A client that never authenticates is closed once the auth timeout passes."""
+    monkeypatch.setattr(settings, "REALTIME_AUTH_TIMEOUT_SECONDS", 0.1)
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/api/v1/ws") as websocket:
+            websocket.receive_json()
+    assert exc_info.value.code == 1008
+
+
+def test_websocket_closes_when_token_expires(client, local_feed):
+    """The socket does not outlive its token; the client must reconnect with a fresh one."""
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/api/v1/ws") as websocket:
+            websocket.send_json({"token": make_token(lifetime=1)})
+            assert websocket.receive_json() == {"type": "subscribed"}
+            websocket.receive_json()
+    assert exc_info.value.code == 1008
+    assert exc_info.value.reason == "Token expired"
+    assert len(change_hub) == 0
+
+
+def test_websocket_closes_when_sending_fails(client, local_feed, monkeypatch):
+    """A failed send closes the socket with 1011 instead of leaving it half open."""
+    async def fail(websocket, subscriber):
+        raise RuntimeError("send failed")
+
+    monkeypatch.setattr(realtime_endpoint, "forward_changes", fail)
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/api/v1/ws") as websocket:
+            websocket.send_json({"token": make_token()})
+            assert websocket.receive_json() == {"type": "subscribed"}
+            websocket.receive_json()
+    assert exc_info.value.code == 1011
+    assert len(change_hub) == 0
@@ -0,0 +1,83 @@
+"""
+Tests for access token verification and the verified-user cache.
+"""
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api import deps
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.memory import MemoryClient, MemoryDatabase
+from app.core.security import verify_supabase_token
+from app.tests.conftest import TOKEN_SECRET, make_token
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", TOKEN_SECRET)
+    deps.user_cache.clear()
+    yield TOKEN_SECRET
+    deps.user_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_verify_supabase_token_locally(jwt_secret):
+    """A token signed with the project secret is verified without GoTrue."""
+    payload = await verify_supabase_token(make_token())
+    assert payload["sub"] == "user-123"
+
+
+@pytest.mark.asyncio
+async def test_verify_supabase_token_rejects_bad_signature(jwt_secret):
+    """A token signed with another secret is rejected."""
+    with pytest.raises(HTTPException) as exc:
+        await verify_supabase_token(make_token(secret="other-secret"))
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_verify_supabase_token_rejects_expired(jwt_secret):
+    """An expired token is rejected."""
+    with pytest.raises(HTTPException) as exc:
+        await verify_supabase_token(make_token(lifetime=-60))
+    assert exc.value.detail == "Token has expired"
+
+
+@pytest.mark.asyncio
+async def test_verify_supabase_token_without_secret(monkeypatch):
+    """Without key material the caller is told to fall back to GoTrue."""
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", "")
+    assert await verify_supabase_token(make_token()) is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_caches_verified_user(jwt_secret):
+    """The verified user is cached under the token hash."""
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token())
+    # The memory backend has no GoTrue, so a fallback to it would fail
+    supabase = MemoryClient(MemoryDatabase())
+
+    user = await deps.get_current_user(credentials, supabase)
+    assert user.id == "user-123"
+    assert user.name == "Test User"
+
+    cached = await deps.get_current_user(credentials, supabase)
+    assert cached is user
+    assert deps.user_cache.hits == 1
+
+
+def test_ttl_cache_expiry_and_eviction():
+    """Entries expire after their TTL and the oldest entry is evicted."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("expired", 3, ttl=-1)
+    assert cache.get("expired") is None
+
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
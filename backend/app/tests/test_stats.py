@@ -0,0 +1,88 @@
+"""
+Tests for ticket statistics served from the ticket_counts summary table.
+"""
+
+import uuid
+
+import pytest
+
+from app.models.stats import TicketCountModel
+from app.tests.conftest import PROJECT_ID
+
+
+OTHER_PROJECT_ID = str(uuid.uuid4())
+
+
+def ticket(project_id, status, priority, assigned_to_id):
+    return {
+        "project_id": project_id,
+        "title": "Ticket",
+        "description": "Description",
+        "status": status,
+        "priority": priority,
+        "assigned_to_id": assigned_to_id,
+        "created_by_id": "user-123",
+        "created_by_name": "Test User",
+    }
+
+
+def add_tickets(database):
+    """Tickets whose counts the ticket_counts triggers keep, as in Postgres."""
+    database.insert("projects", [{
+        "id": OTHER_PROJECT_ID, "title": "Other", "description": "Other",
+        "created_by_id": "user-123", "created_by_name": "Test User",
+    }])
+    database.insert("tickets", (
+        [ticket(PROJECT_ID, "open", 3, "user-1")] * 4
+        + [ticket(PROJECT_ID, "open", 1, None)] * 2
+        + [ticket(PROJECT_ID, "done", 3, "user-1")] * 5
+        + [ticket(OTHER_PROJECT_ID, "in progress", 2, "user-2")]
+    ))
+
+
+@pytest.mark.asyncio
+async def test_stats_group_counters(supabase, database):
+    """Counters are summed overall, per project and per assignee."""
+    add_tickets(database)
+    stats = await TicketCountModel(supabase).get_stats()
+
+    assert stats.total == 12
+    assert stats.by_status == {"open": 6, "done": 5, "in progress": 1}
+    projects = {counts.project_id: counts for counts in stats.projects}
+    assert projects[PROJECT_ID].total == 11
+    assert projects[PROJECT_ID].by_priority == {3: 9, 1: 2}
+    assignees = {counts.assigned_to_id: counts for counts in stats.assignees}
+    assert assignees["user-1"].by_status == {"open": 4, "done": 5}
+    assert assignees[None].total == 2
+    assert supabase.round_trips == 1
+
+    only_other = await TicketCountModel(supabase).get_stats([OTHER_PROJECT_ID])
+    assert only_other.total == 1
+
+
+def test_stats_endpoint_revalidates_on_ticket_writes(client, database):
+    """GET /stats is 304 until the tickets version changes."""
+    add_tickets(database)
+    response = client.get("/api/v1/stats/")
+    assert response.json()["by_status"] == {"open": 6, "done": 5, "in progress": 1}
+    etag = response.headers["etag"]
+
+    assert client.get("/api/v1/stats/", headers={"If-None-Match": etag}).status_code == 304
+    database.insert("tickets", [ticket(PROJECT_ID, "open", 2, None)])
+    assert client.get("/api/v1/stats/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_project_list_includes_ticket_counts(client, database):
+    """Projects carry their counts; fieldsets fetch counts only when asked."""
+    add_tickets(database)
+    projects = {p["id"]: p for p in client.get("/api/v1/projects/").json()["projects"]}
+    assert projects[PROJECT_ID]["ticket_count"] == 11
+    assert projects[PROJECT_ID]["ticket_counts"]["by_status"] == {"open": 6, "done": 5}
+
+    assert sorted(
+        client.get("/api/v1/projects/?fields=title,ticket_count").json()["projects"], key=lambda p: p["title"]
+    ) == [{"title": "Other", "ticket_count": 1}, {"title": "Project", "ticket_count": 11}]
+
+    etag = client.get("/api/v1/projects/?fields=title").headers["etag"]
+    database.insert("tickets", [ticket(PROJECT_ID, "open", 2, None)])
+    assert client.get("/api/v1/projects/?fields=title", headers={"If-None-Match": etag}).status_code == 304
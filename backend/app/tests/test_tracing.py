@@ -0,0 +1,45 @@
+import logging
+
+from app.core.config import settings
+from app.core.tracing import round_trips
+from app.tests.conftest import PROJECT_ID
+
+
+def test_routes_stay_within_their_round_trips(client):
+    """Each route makes a fixed number of round trips, however many rows it returns."""
+    listing = client.get("/api/v1/projects/?size=10")
+    assert listing.status_code == 200
+    # Table versions, projects, total count and ticket counts
+    assert round_trips(listing) == 4
+
+    update = client.put(f"/api/v1/projects/{PROJECT_ID}", json={"title": "Renamed"})
+    assert update.status_code == 200
+    assert round_trips(update) == 1
+
+    stats = client.get("/api/v1/stats/")
+    assert stats.status_code == 200
+    assert round_trips(stats) == 2
+
+
+def test_server_timing_breaks_down_round_trips(client):
+    """Server-Timing reports database time and round trips, and the total."""
+    response = client.get("/api/v1/stats/")
+    timing = response.headers["server-timing"]
+    assert timing.startswith('db;dur=')
+    assert 'desc="2 round trips"' in timing
+    assert "total;dur=" in timing
+
+
+def test_requests_over_budget_are_logged(client, monkeypatch, caplog):
+    """A request with more round trips than its route allows logs the calls it made."""
+    monkeypatch.setattr(settings, "ROUND_TRIP_BUDGET", 1)
+    monkeypatch.setattr(settings, "ROUND_TRIP_BUDGETS", {"/api/v1/projects/{project_id}": 5})
+
+    with caplog.at_level(logging.WARNING, logger="app.core.tracing"):
+        client.put(f"/api/v1/projects/{PROJECT_ID}", json={"title": "Renamed"})
+        assert not caplog.records
+        client.get("/api/v1/stats/")
+
+    [record] = caplog.records
+    assert "/api/v1/stats/ made 2 round trips, over its budget of 1" in record.getMessage()
+    assert "db.table_versions" in record.getMessage()
@@ -0,0 +1,376 @@
+"""
+Benchmark the hot API endpoints end to end.
+
+Drives the FastAPI app either in-process through ASGI or through uvicorn
+over HTTP, against one of three backends:
+
+- standin: benchmarks/standin.py, the in-memory backend served over HTTP
+- memory: the in-memory backend inside the API process (SUPABASE_BACKEND=memory),
+  leaving out the Supabase client and network; each uvicorn worker holds
+  its own copy of the data
+- postgrest: a local PostgREST + Postgres (``supabase start``)
+
+OpenAI is always stubbed by the stand-in, so smart create measures our
+side of the call. Each scenario runs a fixed number of requests at a
+fixed concurrency after a warmup and reports p50/p95/p99 latency and
+throughput. batch_create and create_each write the same tickets, in one
+POST /tickets/batch and in one POST /tickets/ per ticket, so their rows
+compare the two ways of creating many tickets.
+
+Results are saved as JSON under benchmarks/results, named by time and
+commit, so runs can be compared across commits:
+
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --server uvicorn --workers 2
+    python -m benchmarks.bench_api --compare benchmarks/results/<earlier run>.json
+
+Against a local Supabase stack, export SUPABASE_URL, SUPABASE_ANON_KEY and
+SUPABASE_JWT_SECRET from ``supabase status`` and pass ``--backend
+postgrest``; BENCH_USER_ID names the user tokens are issued for, and the
+database must already hold projects and tickets.
+
+Run from the backend directory.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from statistics import mean, quantiles
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Union
+
+import httpx
+import jwt
+import orjson
+
+from benchmarks.standin import BENCH_USER_ID, seed_rows
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Shared with the stand-in when it is the backend
+STANDIN_JWT_SECRET = "bench-jwt-secret-at-least-32-characters-long"
+
+
+# Tickets written per operation by the batch_create and create_each
+# scenarios, which write the same items in one request and in one each
+BATCH_SIZE = 20
+
+
+class Scenario(NamedTuple):
+    name: str
+    # Builds (method, path, json body) for the n-th request, or a list of
+    # them sent one after another and timed as one operation
+    request: Callable[[int], Union[tuple, List[tuple]]]
+
+
+class Fixtures(NamedTuple):
+    project_ids: List[str]
+    ticket_ids: List[str]
+
+
+def scenarios(fixtures: Fixtures) -> List[Scenario]:
+    projects, tickets = fixtures.project_ids, fixtures.ticket_ids
+    statuses = ["open", "in progress", "done"]
+
+    def new_tickets(n: int) -> List[Dict[str, Any]]:
+        return [{
+            "title": f"Benchmark ticket {n}.{i}", "description": "Created by the API benchmark",
+            "project_id": projects[(n + i) % len(projects)], "priority": 2,
+        } for i in range(BATCH_SIZE)]
+
+    return [
+        Scenario("list_tickets", lambda n: ("GET", "/api/v1/tickets/?size=50", None)),
+        Scenario("filter_tickets", lambda n: (
+            "GET", f"/api/v1/tickets/?size=50&statuses=open,in%20progress&priorities=3"
+                   f"&project_ids={projects[n % len(projects)]}", None)),
+        Scenario("search_tickets", lambda n: ("GET", "/api/v1/tickets/search?search=websocket%20reconnect", None)),
+        Scenario("list_projects", lambda n: ("GET", "/api/v1/projects/?size=50", None)),
+        Scenario("create_ticket", lambda n: ("POST", "/api/v1/tickets/", {
+            "title": f"Benchmark ticket {n}", "description": "Created by the API benchmark",
+            "project_id": projects[n % len(projects)], "priority": 2})),
+        Scenario("batch_create", lambda n: ("POST", "/api/v1/tickets/batch", {"create": new_tickets(n)})),
+        Scenario("create_each", lambda n: [("POST", "/api/v1/tickets/", item) for item in new_tickets(n)]),
+        Scenario("update_ticket", lambda n: ("PUT", f"/api/v1/tickets/{tickets[n % len(tickets)]}", {
+            "status": statuses[n % len(statuses)]})),
+        Scenario("export_ndjson", lambda n: (
+            "GET", f"/api/v1/export/tickets?format=ndjson&project_ids={projects[n % len(projects)]}", None)),
+        Scenario("smart_create", lambda n: ("POST", "/api/v1/create/", {
+            # Distinct text every time, so the tool call cache never answers
+            "text": f"Benchmark request {n}: the board stops refreshing after sleep",
+            "project_id": projects[n % len(projects)]})),
+    ]
+
+
+def access_token(secret: str, user_id: str) -> str:
+    """A Supabase-style access token the API verifies locally."""
+    return jwt.encode({
+        "sub": user_id,
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": "bench@example.com",
+        "user_metadata": {"name": "Bench User"},
+        "exp": int(time.time()) + 24 * 60 * 60,
+    }, secret, algorithm="HS256")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited with status {process.returncode}")
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def uvicorn(module: str, port: int, env: Dict[str, str], workers: int = 1) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", module, "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--no-access-log"],
+        env={**os.environ, **env},
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+
+@asynccontextmanager
+async def api_client(args: argparse.Namespace, env: Dict[str, str]) -> AsyncIterator[httpx.AsyncClient]:
+    """A client for the API, served in-process or by uvicorn."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.server == "asgi":
+        # Settings are read at import, so the app is imported only now
+        os.environ.update(env)
+        from app.main import app
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api", limits=limits) as client:
+                yield client
+        return
+
+    port = free_port()
+    process = uvicorn("app.main:app", port, env, args.workers)
+    try:
+        await wait_until_up(f"http://127.0.0.1:{port}/health", process)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+            yield client
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def load_fixtures(client: httpx.AsyncClient) -> Fixtures:
+    """IDs of existing projects and tickets for requests to refer to."""
+    projects = (await client.get("/api/v1/projects/?size=50&fields=id")).raise_for_status().json()
+    tickets = (await client.get("/api/v1/tickets/?size=100&fields=id")).raise_for_status().json()
+    project_ids = [project["id"] for project in projects["projects"]]
+    ticket_ids = [ticket["id"] for ticket in tickets["tickets"]]
+    if not project_ids or not ticket_ids:
+        raise RuntimeError("The backend has no projects or tickets to benchmark against")
+    return Fixtures(project_ids, ticket_ids)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int
+) -> Dict[str, Any]:
+    """Send ``requests`` requests, ``concurrency`` at a time, and summarize their latency."""
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def send(n: int) -> Optional[float]:
+        calls = scenario.request(n)
+        started = time.perf_counter()
+        for method, path, body in calls if isinstance(calls, list) else [calls]:
+            response = await client.request(method, path, json=body)
+            if response.status_code >= 400:
+                return None
+        return time.perf_counter() - started
+
+    async def worker(total: int, record: bool) -> None:
+        nonlocal errors
+        while (n := next(counter)) < total:
+            elapsed = await send(n)
+            if not record:
+                continue
+            if elapsed is None:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+
+    await asyncio.gather(*(worker(warmup, False) for _ in range(concurrency)))
+    counter = itertools.count(warmup)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(warmup + requests, True) for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    result: Dict[str, Any] = {"requests": requests, "errors": errors, "rps": requests / wall}
+    if len(latencies) >= 2:
+        cuts = quantiles(latencies, n=100, method="inclusive")
+        result.update(
+            mean_ms=mean(latencies) * 1000,
+            p50_ms=cuts[49] * 1000,
+            p95_ms=cuts[94] * 1000,
+            p99_ms=cuts[98] * 1000,
+        )
+    return result
+
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": False}
+    return {"commit": commit, "dirty": dirty}
+
+
+def print_results(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    header = f"{'scenario':<16} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}"
+    print(header + ("  vs baseline (p50, p95, req/s)" if baseline else ""))
+    for name, result in results.items():
+        line = (
+            f"{name:<16} {result['errors']:>6} {result.get('p50_ms', 0):8.2f} {result.get('p95_ms', 0):8.2f} "
+            f"{result.get('p99_ms', 0):8.2f} {result['rps']:8.1f}"
+        )
+        before = (baseline or {}).get(name)
+        if before:
+            deltas = [
+                f"{(result.get(key, 0) / before[key] - 1) * 100:+6.1f}%"
+                for key in ("p50_ms", "p95_ms", "rps") if before.get(key)
+            ]
+            line += "  " + " ".join(deltas)
+        print(line)
+
+
+def save_results(run: Dict[str, Any]) -> str:
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    config = run["config"]
+    name = f"{stamp}-{run['git']['commit'][:12]}-{config['server']}-{config['backend']}.json"
+    path = os.path.join(RESULTS_DIR, name)
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2)
+    return path
+
+
+async def main(args: argparse.Namespace) -> None:
+    standin_port = free_port()
+    standin = uvicorn("benchmarks.standin:app", standin_port, {
+        "BENCH_TICKETS": str(args.tickets),
+        "BENCH_PROJECTS": str(args.projects),
+        "BENCH_LLM_LATENCY_MS": str(args.llm_latency_ms),
+    })
+    standin_url = f"http://127.0.0.1:{standin_port}"
+
+    env = {
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{standin_url}/openai/v1",
+        # Changes are not pushed to WebSocket clients during a benchmark
+        "REALTIME_FEED": "local",
+        "EXPORT_JOB_DIR": os.path.join(RESULTS_DIR, ".exports"),
+    }
+    if args.backend == "memory":
+        fixtures_path = os.path.join(RESULTS_DIR, ".fixtures.json")
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(fixtures_path, "wb") as f:
+            f.write(orjson.dumps(seed_rows(args.projects, args.tickets, users=20)))
+        env.update(
+            SUPABASE_BACKEND="memory",
+            SUPABASE_MEMORY_FIXTURES=fixtures_path,
+            SUPABASE_JWT_SECRET=STANDIN_JWT_SECRET,
+        )
+        user_id = BENCH_USER_ID
+    elif args.backend == "standin":
+        anon_key = access_token(STANDIN_JWT_SECRET, BENCH_USER_ID)
+        env.update(
+            SUPABASE_URL=standin_url,
+            SUPABASE_ANON_KEY=anon_key,
+            SUPABASE_SERVICE_ROLE_KEY=anon_key,
+            SUPABASE_JWT_SECRET=STANDIN_JWT_SECRET,
+        )
+        user_id = BENCH_USER_ID
+    else:
+        missing = [name for name in ("SUPABASE_URL", "SUPABASE_ANON_KEY", "SUPABASE_JWT_SECRET") if not os.environ.get(name)]
+        if missing:
+            raise SystemExit(f"--backend postgrest needs {', '.join(missing)} in the environment")
+        user_id = os.environ.get("BENCH_USER_ID", BENCH_USER_ID)
+    token = access_token(os.environ.get("SUPABASE_JWT_SECRET") or env["SUPABASE_JWT_SECRET"], user_id)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    try:
+        await wait_until_up(f"{standin_url}/health", standin)
+        async with api_client(args, env) as client:
+            client.headers["Authorization"] = f"Bearer {token}"
+            fixtures = await load_fixtures(client)
+            selected = [s for s in scenarios(fixtures) if not args.scenarios or s.name in args.scenarios]
+            results = {}
+            for scenario in selected:
+                results[scenario.name] = await run_scenario(
+                    client, scenario, args.requests, args.concurrency, args.warmup
+                )
+    finally:
+        standin.terminate()
+        standin.wait()
+
+    print_results(results, baseline)
+    run = {
+        "git": git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "server": args.server, "backend": args.backend, "workers": args.workers,
+            "requests": args.requests, "concurrency": args.concurrency, "warmup": args.warmup,
+            "tickets": args.tickets, "projects": args.projects, "llm_latency_ms": args.llm_latency_ms,
+        },
+        "results": results,
+    }
+    if not args.no_save:
+        print(f"\nSaved {save_results(run)}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--server", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--backend", choices=["standin", "memory", "postgrest"], default="standin")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--tickets", type=int, default=5000, help="tickets the stand-in or memory backend holds")
+    parser.add_argument("--projects", type=int, default=50, help="projects the stand-in or memory backend holds")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="stubbed LLM response time")
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), help="comma-separated scenario names")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--no-save", action="store_true", help="do not save the results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
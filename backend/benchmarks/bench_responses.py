@@ -0,0 +1,149 @@
+"""
+Benchmark response encoding and compression for the hot list endpoints.
+
+Measures JSON encode time with stdlib json (FastAPI's default JSONResponse)
+versus orjson (ORJSONResponse), and bytes on the wire with each content
+coding the compression middleware can negotiate, for:
+
+- GET /tickets: a 100-ticket TicketList with long descriptions
+- GET /projects: a 100-project ProjectList
+- GET /export/tickets/csv: 5,000 tickets streamed in export-sized batches
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_responses
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from statistics import median
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.core.compression import ENCODERS
+from app.core.config import settings
+from app.schemas.base import ExportFormat
+from app.schemas.project import Project, ProjectList
+from app.schemas.ticket import TicketList, TicketWithProject
+from app.services.export import LEGACY_CSV_HEADERS, ExportWriter, export_row
+
+
+REPEAT = 50
+WORDS = (
+    "users report board stops refreshing after laptop wakes sleep reproduce chrome "
+    "safari capture network log check whether websocket reconnect path subscribes "
+    "every project channel billing invoice retry webhook timeout queue deploy "
+    "migration rollback dashboard latency filter search export onboarding email"
+).split()
+
+
+def description(n: int) -> str:
+    """Roughly 1 KB of seeded pseudo-prose, different for every ticket."""
+    rng = random.Random(n)
+    return " ".join(rng.choice(WORDS) for _ in range(150))
+
+
+def timed(fn: Callable[[], object], repeat: int = REPEAT) -> float:
+    """Median wall time of ``fn`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return median(samples)
+
+
+def ticket_row(n: int, project_id: str, now: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "project_id": project_id,
+        "title": f"Investigate board refresh issue #{n}",
+        "description": description(n),
+        "created_by_id": str(uuid.uuid4()),
+        "created_by_name": "Test User",
+        "status": "open",
+        "priority": n % 3 + 1,
+        "assigned_to_id": None,
+        "assigned_to_name": None,
+        "created_at": now,
+        "updated_at": now,
+        "projects": {"title": "Website Redesign"},
+    }
+
+
+def ticket_list(now: str) -> dict:
+    project_id = str(uuid.uuid4())
+    tickets = []
+    for n in range(100):
+        row = ticket_row(n, project_id, now)
+        row["project_title"] = row.pop("projects")["title"]
+        tickets.append(TicketWithProject(**row))
+    # FastAPI dumps the response model to JSON-compatible data before rendering
+    return TicketList(tickets=tickets, total=100, page=1, size=100).model_dump(mode="json")
+
+
+def project_list(now: str) -> dict:
+    projects = [
+        Project(
+            id=str(uuid.uuid4()),
+            title=f"Project {n}",
+            description="Marketing site, onboarding flow and billing migration work",
+            created_by_id=str(uuid.uuid4()),
+            created_by_name="Test User",
+            created_at=now,
+            updated_at=now,
+        )
+        for n in range(100)
+    ]
+    return ProjectList(projects=projects, total=100, page=1, size=100).model_dump(mode="json")
+
+
+def export_chunks(now: str, total: int = 5000) -> List[bytes]:
+    project_id = str(uuid.uuid4())
+    columns = tuple(LEGACY_CSV_HEADERS)
+    writer = ExportWriter(ExportFormat.CSV, columns, LEGACY_CSV_HEADERS)
+    chunks = [writer.header()]
+    for start in range(0, total, settings.EXPORT_BATCH_SIZE):
+        batch = [ticket_row(n, project_id, now) for n in range(start, start + settings.EXPORT_BATCH_SIZE)]
+        chunks.append(writer.write([export_row(item, columns) for item in batch]))
+    return chunks
+
+
+def compress(encoding: str, chunks: List[bytes]) -> bytes:
+    """Compress ``chunks`` the way the middleware does, flushing after each."""
+    encoder = ENCODERS[encoding]()
+    return b"".join(
+        encoder.compress(chunk, final=i == len(chunks) - 1) for i, chunk in enumerate(chunks)
+    )
+
+
+def report_compression(chunks: List[bytes]) -> None:
+    identity = sum(len(chunk) for chunk in chunks)
+    print(f"  {'identity':<9} {identity:>10,} bytes")
+    for encoding in ENCODERS:
+        size = len(compress(encoding, chunks))
+        elapsed = timed(lambda: compress(encoding, chunks), repeat=10)
+        print(f"  {encoding:<9} {size:>10,} bytes  {identity / size:5.1f}x  {elapsed:7.2f} ms")
+
+
+def main() -> None:
+    now = datetime.now(timezone.utc).isoformat()
+
+    for name, payload in (("GET /tickets", ticket_list(now)), ("GET /projects", project_list(now))):
+        stdlib_ms = timed(lambda: JSONResponse(payload))
+        orjson_ms = timed(lambda: ORJSONResponse(payload))
+        body = ORJSONResponse(payload).body
+        print(f"{name}")
+        print(f"  encode    json {stdlib_ms:6.2f} ms   orjson {orjson_ms:6.2f} ms   "
+              f"({stdlib_ms / orjson_ms:.1f}x faster)")
+        report_compression([body])
+
+    print("GET /export/tickets/csv (5,000 tickets)")
+    report_compression(export_chunks(now))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Local stand-in for Supabase and OpenAI, for benchmarking the API.
+
+Serves PostgREST requests from the app's in-memory backend
+(app/core/memory.py), seeded with generated projects and tickets, and
+answers chat completions with canned tool calls after a configurable
+delay. The API reaches it over real HTTP, exactly as it reaches Supabase,
+so client overhead is measured too; run the API with SUPABASE_BACKEND=memory
+to leave HTTP out instead. Run it with uvicorn; the seed size comes from
+the environment:
+
+    BENCH_TICKETS=5000 BENCH_PROJECTS=50 python -m uvicorn benchmarks.standin:app --port 54329
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import orjson
+from postgrest.exceptions import APIError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.memory import MemoryClient, MemoryDatabase, MemoryFilterBuilder, MemorySelectBuilder, logic
+
+
+# The user benchmark tokens are issued for
+BENCH_USER_ID = "00000000-0000-4000-8000-00000000b0b0"
+BENCH_USER_NAME = "Bench User"
+
+SEED_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+WORDS = (
+    "users report board stops refreshing after laptop wakes sleep reproduce chrome "
+    "safari capture network log check whether websocket reconnect path subscribes "
+    "every project channel billing invoice retry webhook timeout queue deploy "
+    "migration rollback dashboard latency filter search export onboarding email"
+).split()
+
+# Query parameters that are not filters
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def seed_rows(projects: int, tickets: int, users: int, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """Generated rows per table, the same for the same arguments."""
+    rng = random.Random(seed)
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    user_rows = [{"id": BENCH_USER_ID, "email": "bench@example.com", "name": BENCH_USER_NAME}] + [
+        {"id": new_id(), "email": f"user{i}@example.com", "name": f"User {i}"} for i in range(users - 1)
+    ]
+    project_rows = [
+        {"id": new_id(), "title": f"Project {i} {rng.choice(WORDS)}",
+         "description": " ".join(rng.choice(WORDS) for _ in range(20)),
+         "created_by_id": BENCH_USER_ID, "created_by_name": BENCH_USER_NAME,
+         "created_at": (SEED_START + timedelta(minutes=i)).isoformat()}
+        for i in range(projects)
+    ]
+    ticket_rows = []
+    for i in range(tickets):
+        assignee = rng.choice(user_rows + [None])
+        ticket_rows.append({
+            "id": new_id(),
+            "project_id": rng.choice(project_rows)["id"],
+            "title": " ".join(rng.choice(WORDS) for _ in range(6)),
+            "description": " ".join(rng.choice(WORDS) for _ in range(60)),
+            "created_by_id": BENCH_USER_ID, "created_by_name": BENCH_USER_NAME,
+            "status": rng.choice(["open", "in progress", "done"]),
+            "priority": rng.choice([1, 2, 3]),
+            "assigned_to_id": assignee and assignee["id"],
+            "assigned_to_name": assignee and assignee["name"],
+            "created_at": (SEED_START + timedelta(seconds=i * 7)).isoformat(),
+        })
+    return {"users": user_rows, "projects": project_rows, "tickets": ticket_rows}
+
+
+def seeded_database(rows: Dict[str, List[Dict[str, Any]]]) -> MemoryDatabase:
+    database = MemoryDatabase()
+    for table in ("users", "projects", "tickets"):
+        database.insert(table, rows[table])
+    return database
+
+
+def apply_params(query: MemoryFilterBuilder, request: Request) -> MemoryFilterBuilder:
+    """Apply PostgREST filter, order and paging parameters to ``query``."""
+    for key, value in request.query_params.multi_items():
+        if key == "or":
+            query.or_(value.strip("()"))
+        elif key == "and":
+            query.spec.predicates.append(logic("and", value.strip("()")))
+        elif key not in RESERVED_PARAMS:
+            negation = "not." if value.startswith("not.") else ""
+            operator, _, criteria = value[len(negation):].partition(".")
+            query.filter(key, negation + operator, criteria)
+    if not isinstance(query, MemorySelectBuilder):
+        # inserts take no parameters and writes are never ordered or paged
+        return query
+    for term in filter(None, request.query_params.get("order", "").split(",")):
+        column, _, direction = term.partition(".")
+        query.order(column, desc=direction.startswith("desc"))
+    if "offset" in request.query_params:
+        query.offset(int(request.query_params["offset"]))
+    if "limit" in request.query_params:
+        query.limit(int(request.query_params["limit"]))
+    return query
+
+
+def json_response(data: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(orjson.dumps(data), status_code, headers, media_type="application/json")
+
+
+client = MemoryClient(seeded_database(seed_rows(
+    projects=int(os.environ.get("BENCH_PROJECTS", 50)),
+    tickets=int(os.environ.get("BENCH_TICKETS", 5000)),
+    users=int(os.environ.get("BENCH_USERS", 20)),
+)))
+LLM_LATENCY_SECONDS = float(os.environ.get("BENCH_LLM_LATENCY_MS", 0)) / 1000
+
+
+async def table_endpoint(request: Request) -> Response:
+    table = client.table(request.path_params["table"])
+    prefer = request.headers.get("prefer", "")
+    if request.method in ("GET", "HEAD"):
+        query = apply_params(table.select(
+            request.query_params.get("select", "*"),
+            count="exact" if "count=" in prefer else None,
+            head=request.method == "HEAD",
+        ), request)
+    elif request.method == "POST":
+        body = orjson.loads(await request.body())
+        if "resolution=merge-duplicates" in prefer:
+            query = table.upsert(body, on_conflict=request.query_params.get("on_conflict", ""))
+        else:
+            query = table.insert(body)
+    elif request.method == "PATCH":
+        query = apply_params(table.update(orjson.loads(await request.body())), request)
+    else:
+        query = apply_params(table.delete(), request)
+
+    try:
+        response = await query.execute()
+    except APIError as e:
+        return json_response({"code": e.code, "message": e.message}, 409)
+
+    headers = {}
+    if response.count is not None:
+        offset = query.spec.offset_rows
+        span = f"{offset}-{offset + len(response.data) - 1}" if response.data else "*"
+        headers["Content-Range"] = f"{span}/{response.count}"
+    if request.method == "HEAD":
+        return Response(status_code=200, headers=headers)
+    if request.method != "GET" and "return=representation" not in prefer:
+        return Response(status_code=201 if request.method == "POST" else 204)
+    return json_response(response.data, 201 if request.method == "POST" else 200, headers)
+
+
+async def rpc_endpoint(request: Request) -> Response:
+    params = orjson.loads(await request.body())
+    try:
+        response = await client.rpc(request.path_params["function"], params).execute()
+    except APIError as e:
+        return json_response({"code": e.code, "message": e.message}, 404)
+    return json_response(response.data)
+
+
+async def jwks_endpoint(request: Request) -> Response:
+    # Benchmark tokens are HS256, so there are no signing keys to publish
+    return json_response({"keys": []})
+
+
+def tool_calls(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Two tickets for the provided project, named after the request text."""
+    text = messages[-1]["content"]
+    return [
+        {"id": f"call_{i}", "type": "function", "function": {
+            "name": "create_ticket",
+            "arguments": orjson.dumps({
+                "title": f"{text[:40]} ({i + 1})", "description": text, "priority": 2, "status": "open",
+            }).decode(),
+        }}
+        for i in range(2)
+    ]
+
+
+async def chat_completions(request: Request) -> Response:
+    body = orjson.loads(await request.body())
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    calls = tool_calls(body["messages"])
+    usage = {"prompt_tokens": sum(len(m["content"]) for m in body["messages"]) // 4,
+             "completion_tokens": 60, "total_tokens": 0}
+    base = {"id": "chatcmpl-bench", "created": 0, "model": body["model"]}
+
+    if not body.get("stream"):
+        return json_response(dict(base, object="chat.completion", usage=usage, choices=[{
+            "index": 0, "finish_reason": "tool_calls",
+            "message": {"role": "assistant", "content": None, "tool_calls": calls},
+        }]))
+
+    async def chunks():
+        for index, call in enumerate(calls):
+            delta = {"tool_calls": [dict(call, index=index)]}
+            yield b"data: " + orjson.dumps(dict(base, object="chat.completion.chunk", choices=[
+                {"index": 0, "delta": delta, "finish_reason": None},
+            ])) + b"\n\n"
+        yield b"data: " + orjson.dumps(dict(base, object="chat.completion.chunk", choices=[], usage=usage)) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+async def health(request: Request) -> Response:
+    return json_response({"status": "ok", "tickets": len(client.database.table("tickets"))})
+
+
+app = Starlette(routes=[
+    Route("/health", health),
+    Route("/rest/v1/rpc/{function}", rpc_endpoint, methods=["POST"]),
+    Route("/rest/v1/{table}", table_endpoint, methods=["GET", "HEAD", "POST", "PATCH", "DELETE"]),
+    Route("/auth/v1/.well-known/jwks.json", jwks_endpoint),
+    Route("/openai/v1/chat/completions", chat_completions, methods=["POST"]),
+])
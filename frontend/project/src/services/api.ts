@@ -15,6 +15,7 @@ interface ProjectListResponse {
   total: number;
   page: number;
   size: number;
+  next_cursor: string | null;
 }
 
 interface TicketListResponse {
@@ -22,6 +23,7 @@ interface TicketListResponse {
   total: number;
   page: number;
   size: number;
+  next_cursor: string | null;
 }
 
 // HTTP Client with authentication
@@ -0,0 +1,10 @@
+-- BradBoard keyset pagination indexes
+-- Support paging through tickets in board order (priority ASC, created_at DESC)
+-- and projects newest-first, with id as a tiebreaker, so each page is an index
+-- range scan instead of an OFFSET scan over every earlier row.
+
+CREATE INDEX IF NOT EXISTS idx_tickets_keyset
+    ON tickets(priority ASC, created_at DESC, id ASC);
+
+CREATE INDEX IF NOT EXISTS idx_projects_keyset
+    ON projects(created_at DESC, id DESC);
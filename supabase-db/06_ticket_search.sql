@@ -0,0 +1,92 @@
+-- BradBoard ticket full-text search
+-- Maintains a weighted tsvector over ticket titles (A) and descriptions (B),
+-- indexes it with GIN, and exposes a ranked search function with highlighted
+-- snippets for GET /api/v1/tickets/search.
+
+-- Weighted search document, kept up to date by Postgres on every write
+ALTER TABLE tickets
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_tickets_search_vector
+    ON tickets USING gin(search_vector);
+
+-- Ranked search with the same filters as the ticket list.
+-- Snippets are only generated for the rows on the requested page, since
+-- ts_headline re-parses the original text and is the expensive part.
+CREATE OR REPLACE FUNCTION search_tickets(
+    search_query TEXT,
+    filter_project_ids UUID[] DEFAULT NULL,
+    filter_statuses TEXT[] DEFAULT NULL,
+    filter_priorities INTEGER[] DEFAULT NULL,
+    filter_assigned_to_ids UUID[] DEFAULT NULL,
+    filter_created_by_ids UUID[] DEFAULT NULL,
+    result_limit INTEGER DEFAULT 20,
+    result_offset INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+    id UUID,
+    project_id UUID,
+    project_title VARCHAR,
+    title VARCHAR,
+    description TEXT,
+    created_by_id UUID,
+    created_by_name VARCHAR,
+    status VARCHAR,
+    priority INTEGER,
+    assigned_to_id UUID,
+    assigned_to_name VARCHAR,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    rank REAL,
+    title_highlight TEXT,
+    description_highlight TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH q AS (
+        SELECT websearch_to_tsquery('english', search_query) AS query
+    ),
+    matches AS (
+        SELECT t.*, ts_rank_cd(t.search_vector, q.query) AS rank
+        FROM tickets t, q
+        WHERE t.search_vector @@ q.query
+          AND (filter_project_ids IS NULL OR t.project_id = ANY(filter_project_ids))
+          AND (filter_statuses IS NULL OR t.status = ANY(filter_statuses))
+          AND (filter_priorities IS NULL OR t.priority = ANY(filter_priorities))
+          AND (filter_assigned_to_ids IS NULL OR t.assigned_to_id = ANY(filter_assigned_to_ids))
+          AND (filter_created_by_ids IS NULL OR t.created_by_id = ANY(filter_created_by_ids))
+        ORDER BY rank DESC, t.created_at DESC, t.id
+        LIMIT result_limit
+        OFFSET result_offset
+    )
+    SELECT
+        m.id,
+        m.project_id,
+        p.title,
+        m.title,
+        m.description,
+        m.created_by_id,
+        m.created_by_name,
+        m.status,
+        m.priority,
+        m.assigned_to_id,
+        m.assigned_to_name,
+        m.created_at,
+        m.updated_at,
+        m.rank,
+        ts_headline('english', m.title, q.query,
+            'StartSel=<mark>, StopSel=</mark>, HighlightAll=true'),
+        ts_headline('english', m.description, q.query,
+            'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5')
+    FROM matches m
+    CROSS JOIN q
+    LEFT JOIN projects p ON p.id = m.project_id
+    ORDER BY m.rank DESC, m.created_at DESC, m.id;
+$$;
+
+GRANT EXECUTE ON FUNCTION search_tickets TO authenticated;
@@ -0,0 +1,62 @@
+-- BradBoard table versions for conditional GETs
+-- Keeps one counter per table that every write statement bumps, so the API
+-- can build list ETags from a single primary-key read instead of scanning
+-- the rows it would return. Counters only advance when the writing
+-- transaction commits, so a version is never seen before its data.
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+INSERT INTO table_versions (table_name)
+VALUES ('projects'), ('tickets'), ('users')
+ON CONFLICT (table_name) DO NOTHING;
+
+-- Runs as the owner so writers need no privileges on table_versions
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    UPDATE table_versions
+    SET version = version + 1, updated_at = NOW()
+    WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$;
+
+-- Statement-level, so a bulk insert of 500 tickets bumps the version once
+DROP TRIGGER IF EXISTS bump_projects_version ON projects;
+CREATE TRIGGER bump_projects_version
+    AFTER INSERT OR UPDATE OR DELETE ON projects
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS bump_tickets_version ON tickets;
+CREATE TRIGGER bump_tickets_version
+    AFTER INSERT OR UPDATE OR DELETE ON tickets
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS bump_users_version ON public.users;
+CREATE TRIGGER bump_users_version
+    AFTER INSERT OR UPDATE OR DELETE ON public.users
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_table_version();
+
+-- User detail ETags come from updated_at, so keep it current on direct updates
+DROP TRIGGER IF EXISTS update_users_updated_at ON public.users;
+CREATE TRIGGER update_users_updated_at
+    BEFORE UPDATE ON public.users
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+ALTER TABLE table_versions ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view table versions" ON table_versions;
+CREATE POLICY "Users can view table versions" ON table_versions
+    FOR SELECT USING (auth.role() = 'authenticated');
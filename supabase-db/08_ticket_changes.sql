@@ -0,0 +1,61 @@
+-- BradBoard ticket delta sync
+-- Supports GET /api/v1/tickets/changes: tickets changed since a watermark
+-- are found through an index on (updated_at, id), which the existing
+-- update_updated_at_column trigger keeps current, and deleted tickets are
+-- recorded as tombstones in a deletion log.
+
+CREATE INDEX IF NOT EXISTS idx_tickets_updated_at
+    ON tickets(updated_at ASC, id ASC);
+
+-- One tombstone per deleted ticket
+CREATE TABLE IF NOT EXISTS ticket_deletions (
+    ticket_id UUID PRIMARY KEY,
+    project_id UUID NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ticket_deletions_deleted_at
+    ON ticket_deletions(deleted_at ASC, ticket_id ASC);
+
+-- Runs as the owner so deleting users need no privileges on the log
+CREATE OR REPLACE FUNCTION log_ticket_deletion()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    INSERT INTO ticket_deletions (ticket_id, project_id)
+    VALUES (OLD.id, OLD.project_id)
+    ON CONFLICT (ticket_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN OLD;
+END;
+$$;
+
+-- Row-level, so tickets removed by a project's ON DELETE CASCADE are logged too
+DROP TRIGGER IF EXISTS log_tickets_deletion ON tickets;
+CREATE TRIGGER log_tickets_deletion
+    AFTER DELETE ON tickets
+    FOR EACH ROW
+    EXECUTE FUNCTION log_ticket_deletion();
+
+-- Tombstones older than the API's retention window can no longer be asked
+-- for (older watermarks get 410 Gone), so they can be pruned, e.g. daily
+-- with pg_cron: SELECT cron.schedule('0 3 * * *', 'SELECT prune_ticket_deletions()');
+CREATE OR REPLACE FUNCTION prune_ticket_deletions(retention INTERVAL DEFAULT '30 days')
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH pruned AS (
+        DELETE FROM ticket_deletions
+        WHERE deleted_at < NOW() - retention
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM pruned;
+$$;
+
+ALTER TABLE ticket_deletions ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view ticket deletions" ON ticket_deletions;
+CREATE POLICY "Users can view ticket deletions" ON ticket_deletions
+    FOR SELECT USING (auth.role() = 'authenticated');
@@ -0,0 +1,9 @@
+-- BradBoard real-time change feed
+-- Every API worker subscribes to Supabase Realtime changes on tickets and
+-- projects and fans them out to its WebSocket clients (/api/v1/ws).
+
+-- With row-level security enabled, Realtime sends only the primary key of
+-- a deleted row, whatever the replica identity, so a ticket's delete event
+-- cannot say which project it belonged to. Ticket deletes are published
+-- from the ticket_deletions tombstones instead, which carry project_id.
+ALTER PUBLICATION supabase_realtime ADD TABLE tickets, projects, ticket_deletions;
@@ -0,0 +1,118 @@
+-- BradBoard ticket counters for dashboards
+-- Keeps the number of tickets per (project, status, priority, assignee) in
+-- a summary table that statement-level triggers update with the net change
+-- of every write, so GET /api/v1/stats and the per-project counts on
+-- GET /api/v1/projects read a few rows per project instead of counting
+-- every ticket.
+
+CREATE TABLE IF NOT EXISTS ticket_counts (
+    project_id UUID NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    priority INTEGER NOT NULL,
+    assigned_to_id UUID,
+    count BIGINT NOT NULL
+);
+
+-- One row per combination; unassigned tickets share the NULL assignee row
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ticket_counts_key
+    ON ticket_counts(project_id, status, priority, assigned_to_id) NULLS NOT DISTINCT;
+
+-- Finds counters that dropped to zero without scanning the table
+CREATE INDEX IF NOT EXISTS idx_ticket_counts_empty
+    ON ticket_counts(project_id) WHERE count = 0;
+
+-- Applies the net change of one statement, grouped, so a bulk insert of 500
+-- tickets into one project touches a single counter. Counters are upserted
+-- in key order so concurrent writers cannot deadlock. Runs as the owner so
+-- writers need no privileges on ticket_counts.
+CREATE OR REPLACE FUNCTION apply_ticket_count_changes()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO ticket_counts AS counts (project_id, status, priority, assigned_to_id, count)
+        SELECT project_id, status, priority, assigned_to_id, count(*)
+        FROM new_rows
+        GROUP BY project_id, status, priority, assigned_to_id
+        ORDER BY project_id, status, priority, assigned_to_id
+        ON CONFLICT (project_id, status, priority, assigned_to_id)
+        DO UPDATE SET count = counts.count + EXCLUDED.count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO ticket_counts AS counts (project_id, status, priority, assigned_to_id, count)
+        SELECT project_id, status, priority, assigned_to_id, sum(delta)
+        FROM (
+            SELECT project_id, status, priority, assigned_to_id, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT project_id, status, priority, assigned_to_id, -1 AS delta FROM old_rows
+        ) changes
+        GROUP BY project_id, status, priority, assigned_to_id
+        HAVING sum(delta) <> 0
+        ORDER BY project_id, status, priority, assigned_to_id
+        ON CONFLICT (project_id, status, priority, assigned_to_id)
+        DO UPDATE SET count = counts.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO ticket_counts AS counts (project_id, status, priority, assigned_to_id, count)
+        SELECT project_id, status, priority, assigned_to_id, -count(*)
+        FROM old_rows
+        GROUP BY project_id, status, priority, assigned_to_id
+        ORDER BY project_id, status, priority, assigned_to_id
+        ON CONFLICT (project_id, status, priority, assigned_to_id)
+        DO UPDATE SET count = counts.count + EXCLUDED.count;
+    END IF;
+
+    DELETE FROM ticket_counts WHERE count = 0;
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables need one trigger per event. Deletes cascading from a
+-- project delete fire the delete trigger too, which empties its counters.
+DROP TRIGGER IF EXISTS count_tickets_insert ON tickets;
+CREATE TRIGGER count_tickets_insert
+    AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_ticket_count_changes();
+
+DROP TRIGGER IF EXISTS count_tickets_update ON tickets;
+CREATE TRIGGER count_tickets_update
+    AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_ticket_count_changes();
+
+DROP TRIGGER IF EXISTS count_tickets_delete ON tickets;
+CREATE TRIGGER count_tickets_delete
+    AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_ticket_count_changes();
+
+-- Recomputes every counter from the tickets table; run once below to fill
+-- the table, and again if the counters are ever suspected to have drifted
+CREATE OR REPLACE FUNCTION refresh_ticket_counts()
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    LOCK TABLE tickets IN SHARE MODE;
+    DELETE FROM ticket_counts;
+    INSERT INTO ticket_counts (project_id, status, priority, assigned_to_id, count)
+    SELECT project_id, status, priority, assigned_to_id, count(*)
+    FROM tickets
+    GROUP BY project_id, status, priority, assigned_to_id;
+END;
+$$;
+
+SELECT refresh_ticket_counts();
+
+ALTER TABLE ticket_counts ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view ticket counts" ON ticket_counts;
+CREATE POLICY "Users can view ticket counts" ON ticket_counts
+    FOR SELECT USING (auth.role() = 'authenticated');